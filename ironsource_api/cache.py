@@ -0,0 +1,101 @@
+"""
+Caches of API results and payloads
+"""
+import abc
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """Read-through cache of values that expire ttl seconds after they were loaded.
+    Concurrent get calls for a key that is being loaded wait for the same load instead of loading it again.
+
+    :param ttl: seconds to keep a loaded value, defaults to 60
+    :type ttl: float, optional
+    """
+    _ttl: float
+    _entries: Dict[Hashable, Tuple[float, Any]]
+    _pending: Dict[Hashable, asyncio.Future]
+
+    def __init__(self, ttl: float = 60):
+        self._ttl = ttl
+        self._entries = {}
+        self._pending = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_ttl(self) -> float:  # pylint: disable=missing-function-docstring
+        return self._ttl
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        returns the cached value of key, loading it with loader when it is missing or expired
+        :param key: cache key
+        :param loader: coroutine function that loads the value
+        :return: the cached value, shared between callers
+        """
+        entry = self._entries.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(loader())
+            self._pending[key] = pending
+            try:
+                value = await asyncio.shield(pending)
+            finally:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+                    if not pending.cancelled() and pending.done() and pending.exception() is None:
+                        self._entries[key] = (time.monotonic() + self._ttl, pending.result())
+            return value
+        return await asyncio.shield(pending)
+
+    def invalidate(self, key: Hashable = None):
+        """
+        drops a cached value, a load of the key that is in progress is not cached
+        :param key: cache key, defaults to None (drop all the values)
+        """
+        if key is None:
+            self._entries.clear()
+            self._pending.clear()
+            return
+        self._entries.pop(key, None)
+        self._pending.pop(key, None)
+
+
+class PayloadCache(abc.ABC):
+    """Mixin that memoizes the API payload of a model object.
+    get_payload builds the payload from get_object once and reuses it until any attribute of the object is set again.
+    Values that are mutated in place (e.g. a list returned by a getter) are not detected.
+    The cached payload is shared and must not be modified by the caller.
+    """
+    __slots__ = ('_payload_cache',)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != '_payload_cache':
+            object.__setattr__(self, '_payload_cache', None)
+
+    def _get_cached(self, key: str, factory: Callable[[], Any]) -> Any:
+        """returns the cached value of key, creating it with factory when it is missing"""
+        cache = getattr(self, '_payload_cache', None)
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, '_payload_cache', cache)
+        if key not in cache:
+            cache[key] = factory()
+        return cache[key]
+
+    @abc.abstractmethod
+    def get_object(self) -> dict:
+        """returns formatted dictionary for api request"""
+
+    def get_payload(self) -> dict:
+        """
+        :return: the cached result of get_object, must not be modified
+        """
+        return self._get_cached('object', self.get_object)
@@ -1,7 +1,11 @@
 """IronSource API"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
 from ironsource_api.monetize_api.monetize_api import MonetizeAPI
 
 from ironsource_api.promote_api.promote_api import PromoteAPI
+from ironsource_api.utils import RateLimiter, execute_with_concurrency, rate_limit, request_limit, shared_client
 
 
 class IronSourceAPI:
@@ -45,3 +49,154 @@ class IronSourceAPI:
             self.monetize_api_instance.set_credentials(user=user, token=token, secret=secret)
         if self.promote_api_instance:
             self.promote_api_instance.set_credentials(user=user, token=token, secret=secret)
+
+
+class IronSourceAccountPool:
+    """Pool of IronSource accounts keyed by (user, token).
+    Every account has its own IronSourceAPI, so bearer tokens are kept per account, its own limit of
+    requests in flight and its own RateLimiter, since the API quotas are per account.
+    Calls made with fan_out share a single connection pool between all the accounts and use the rate limiter
+    of their account instead of the default rate limiter of the process (see utils.get_rate_limiter).
+
+    :param max_concurrency_per_account: default maximum number of requests in flight per account, defaults to 5
+    :type max_concurrency_per_account: int, optional
+    :param rate_limiter_factory: creates the rate limiter of an account that is added without one,
+        defaults to None (RateLimiter without limits)
+    :type rate_limiter_factory: Callable[[], RateLimiter], optional
+
+    example:
+    pool = IronSourceAccountPool(rate_limiter_factory=lambda: RateLimiter(default_rate=10))
+    """
+    _max_concurrency_per_account: int
+    _rate_limiter_factory: Callable[[], RateLimiter]
+    _accounts: Dict[Tuple[str, str], IronSourceAPI]
+    _max_concurrency: Dict[Tuple[str, str], int]
+    _rate_limiters: Dict[Tuple[str, str], RateLimiter]
+    # (event loop, semaphore) per account, semaphores are bound to the loop they are used in
+    _limiters: Dict[Tuple[str, str], Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]]
+
+    def __init__(self, max_concurrency_per_account: int = 5, rate_limiter_factory: Callable[[], RateLimiter] = None):
+        if max_concurrency_per_account < 1:
+            raise ValueError('max_concurrency_per_account must be greater than 0, not {}.'.format(max_concurrency_per_account))
+        self._max_concurrency_per_account = max_concurrency_per_account
+        self._rate_limiter_factory = rate_limiter_factory or RateLimiter
+        self._accounts = {}
+        self._max_concurrency = {}
+        self._rate_limiters = {}
+        self._limiters = {}
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def add_account(self, user: str, token: str, secret: str, max_concurrency: int = None,  # pylint: disable=too-many-arguments
+                    rate_limiter: RateLimiter = None) -> IronSourceAPI:
+        """
+        Adds an account to the pool, an account that already exists gets the new secret and limits
+        :param user: user name from the platform
+        :type user: str
+        :param token: token from the platform
+        :type token: str
+        :param secret: secret from the platform
+        :type secret: str
+        :param max_concurrency: maximum number of requests in flight for the account,
+            defaults to None (max_concurrency_per_account)
+        :type max_concurrency: int, optional
+        :param rate_limiter: rate limiter of the account's requests, defaults to None
+            (the current limiter of an existing account or a new one from rate_limiter_factory)
+        :type rate_limiter: RateLimiter, optional
+        :return: the IronSourceAPI of the account
+        """
+        max_concurrency = max_concurrency or self._max_concurrency_per_account
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be greater than 0, not {}.'.format(max_concurrency))
+        key = (user, token)
+        account = self._accounts.get(key)
+        if account is None:
+            account = IronSourceAPI()
+            self._accounts[key] = account
+        account.set_credentials(user, token, secret)
+        if rate_limiter is not None or key not in self._rate_limiters:
+            self._rate_limiters[key] = rate_limiter or self._rate_limiter_factory()
+        if self._max_concurrency.get(key) != max_concurrency:
+            self._max_concurrency[key] = max_concurrency
+            self._limiters.pop(key, None)
+        return account
+
+    def get_account(self, user: str, token: str) -> IronSourceAPI:
+        """
+        :param user: user name of the account
+        :param token: token of the account
+        :raises KeyError: when the account is not in the pool
+        :return: the IronSourceAPI of the account
+        """
+        return self._accounts[(user, token)]
+
+    def get_rate_limiter(self, user: str, token: str) -> RateLimiter:
+        """
+        :param user: user name of the account
+        :param token: token of the account
+        :raises KeyError: when the account is not in the pool
+        :return: the rate limiter of the account
+        """
+        return self._rate_limiters[(user, token)]
+
+    def remove_account(self, user: str, token: str):
+        """
+        Removes an account from the pool
+        :param user: user name of the account
+        :param token: token of the account
+        """
+        key = (user, token)
+        self._accounts.pop(key, None)
+        self._max_concurrency.pop(key, None)
+        self._rate_limiters.pop(key, None)
+        self._limiters.pop(key, None)
+
+    def get_accounts(self) -> List[Tuple[str, str]]:
+        """
+        :return: (user, token) of the accounts in the pool
+        """
+        return list(self._accounts)
+
+    def _get_limiter(self, key: Tuple[str, str]) -> asyncio.Semaphore:
+        """returns the semaphore of the account for the running event loop"""
+        loop = asyncio.get_event_loop()
+        limiter = self._limiters.get(key)
+        if limiter is None or limiter[0] is not loop:
+            limiter = (loop, asyncio.Semaphore(self._max_concurrency[key]))
+            self._limiters[key] = limiter
+        return limiter[1]
+
+    async def fan_out(self, call: Callable[[IronSourceAPI], Awaitable[Any]], accounts: Iterable[Tuple[str, str]] = None,
+                      concurrency: int = 10) -> Dict[Tuple[str, str], dict]:
+        """
+        Runs call for many accounts concurrently with a shared connection pool.
+        The requests of every account are limited to its max_concurrency and rate limited by its rate limiter.
+        Sync paginated methods (e.g. PromoteAPI.get_bids_for_campaign) must be run with utils.run_in_thread,
+        their pages are rate limited by the rate limiter of the account as well.
+        :param call: coroutine function that receives the IronSourceAPI of an account
+        :type call: Callable[[IronSourceAPI], Awaitable[Any]]
+        :param accounts: (user, token) of the accounts to run on, defaults to None (all the accounts)
+        :type accounts: Iterable[Tuple[str, str]], optional
+        :param concurrency: maximum number of accounts running at the same time, defaults to 10
+        :type concurrency: int, optional
+        :return: dict of (user, token) -> {"result": ..., "error": None} or {"result": None, "error": "..."}
+
+        example:
+        apps = await pool.fan_out(lambda api: api.monetize_api().get_apps())
+        bids = await pool.fan_out(lambda api: run_in_thread(api.promote_api().get_bids_for_campaign, 1234))
+        """
+        keys = list(accounts) if accounts is not None else self.get_accounts()
+        for key in keys:
+            if key not in self._accounts:
+                raise KeyError('account {} is not in the pool.'.format(key[0]))
+
+        async def _run(key):
+            with request_limit(self._get_limiter(key)), rate_limit(self._rate_limiters[key]):
+                try:
+                    return key, {'result': await call(self._accounts[key]), 'error': None}
+                except Exception as exception:
+                    return key, {'result': None, 'error': str(exception)}
+
+        async with shared_client():
+            return dict(await execute_with_concurrency(keys, _run, concurrency))
@@ -0,0 +1,92 @@
+"""Catalog cache of the Monetize API"""
+from typing import Awaitable, Callable, Iterable
+
+from ..cache import TTLCache
+from ..utils import execute_with_concurrency
+
+CATALOGS = ('instances', 'placements', 'mediationGroups')
+
+
+class CatalogCacheMixin:
+    """Per app cache of the instances, placements and mediation groups catalogs of MonetizeAPI"""
+    _catalog_cache: TTLCache = None
+    get_instances: Callable[..., Awaitable[dict]]
+    get_placements: Callable[..., Awaitable[dict]]
+    get_mediation_groups: Callable[..., Awaitable[dict]]
+
+    def enable_catalog_cache(self, ttl: float = 60):
+        """
+        Caches the results of get_instances, get_placements and get_mediation_groups per app for ttl seconds.
+        The cached catalogs of an app are invalidated by the methods that change them.
+        Cached results are shared between callers and must not be modified.
+        :param ttl: seconds to keep a catalog, defaults to 60
+        :type ttl: float, optional
+        """
+        self._catalog_cache = TTLCache(ttl)
+
+    def disable_catalog_cache(self):
+        """
+        Drops all the cached catalogs and stops caching
+        """
+        self._catalog_cache = None
+
+    def invalidate_catalog(self, application_key: str = None, catalog: str = None):
+        """
+        drops cached catalogs, the next get call will fetch them again
+        :param application_key: app to drop the catalogs of, defaults to None (all apps)
+        :type application_key: str, optional
+        :param catalog: one of CATALOGS, defaults to None (all catalogs)
+        :type catalog: str, optional
+        """
+        if self._catalog_cache is None:
+            return
+        if application_key is None:
+            self._catalog_cache.invalidate()
+            return
+        for catalog_name in [catalog] if catalog else CATALOGS:
+            self._catalog_cache.invalidate((catalog_name, application_key))
+
+    async def warm_catalog_cache(self, application_keys: Iterable[str], catalogs: Iterable[str] = CATALOGS,
+                                 concurrency: int = 5) -> dict:
+        """
+        Loads the catalogs of many apps into the cache concurrently
+        :param application_keys: apps to load the catalogs of
+        :type application_keys: Iterable[str]
+        :param catalogs: catalogs to load, defaults to CATALOGS
+        :type catalogs: Iterable[str], optional
+        :param concurrency: maximum number of requests in flight, defaults to 5
+        :type concurrency: int, optional
+        :return: number of loaded catalogs and the catalogs that failed
+
+            Example ::
+            `{
+                "loaded": 5,
+                "errors": [{"appKey": "1a2b3c", "catalog": "placements", "error": "..."}]
+            }`
+        """
+        if self._catalog_cache is None:
+            raise ValueError('catalog cache must be enabled with enable_catalog_cache before warming it.')
+        catalogs = list(catalogs)
+        for catalog in catalogs:
+            if catalog not in CATALOGS:
+                raise ValueError('catalog must be one of {}, not {}.'.format(list(CATALOGS), catalog))
+        loaders = {'instances': self.get_instances, 'placements': self.get_placements,
+                   'mediationGroups': self.get_mediation_groups}
+
+        async def _load(job):
+            application_key, catalog = job
+            try:
+                await loaders[catalog](application_key)
+                return None
+            except Exception as exception:
+                return {'appKey': application_key, 'catalog': catalog, 'error': str(exception)}
+
+        jobs = [(application_key, catalog) for application_key in application_keys for catalog in catalogs]
+        errors = [error for error in await execute_with_concurrency(jobs, _load, concurrency) if error]
+        return {'loaded': len(jobs) - len(errors), 'errors': errors}
+
+    async def _read_catalog(self, catalog: str, application_key: str, loader) -> dict:
+        """returns the catalog from the cache when it is enabled, otherwise loads it"""
+        if self._catalog_cache is None:
+            return await loader()
+        return await self._catalog_cache.get((catalog, application_key), loader)
@@ -2,13 +2,20 @@
 """
 Module for creating instances object
 """
-from typing import Dict, List
+import copy
+from typing import Dict, Iterable, List, Tuple
 
 from ironsource_api.monetize_api import Networks, AdUnits
+from ..cache import PayloadCache
 
 
-class InstanceConfig:  # pylint: disable=missing-class-docstring
-    """base class for Instance"""
+class InstanceConfig(PayloadCache):  # pylint: disable=missing-class-docstring
+    """base class for Instance, get_payload and get_app_payload return cached payloads that are rebuilt only after
+    the instance was changed"""
+    __slots__ = ('_instance_ad_source_name', '_instance_name', '_instance_ad_unit', '_status', '_instance_id', '_rate')
+    # (api field name, attribute name) pairs of the instance fields and the app config fields, used by from_api
+    _api_fields = ()
+    _api_app_fields = ()
     _instance_ad_source_name: Networks
     _instance_name: str
     _instance_ad_unit: AdUnits
@@ -48,6 +55,39 @@ class InstanceConfig:  # pylint: disable=missing-class-docstring
     def get_app_data_obj(self):  # pylint: disable=missing-function-docstring #pylint: disable=missing-function-docstring
         pass
 
+    def get_app_payload(self):
+        """
+        :return: the cached result of get_app_data_obj, must not be modified
+        """
+        return self._get_cached('app', self.get_app_data_obj)
+
+    @classmethod
+    def from_api(cls, ad_source: Networks, ad_unit: AdUnits, instance_obj: dict, app_config: dict = None) -> 'InstanceConfig':
+        """
+        Creates an instance from a get_instances response entry
+        :param ad_source: Network of the instance
+        :type ad_source: Networks
+        :param ad_unit: Ad Unit of the instance
+        :type ad_unit: AdUnits
+        :param instance_obj: instance entry of the response, e.g. {'id': 5, 'name': 'TEST', 'status': 'active', ...}
+        :type instance_obj: dict
+        :param app_config: app configuration of the network, defaults to None.
+            App fields that are not in app_config are read from instance_obj
+        :type app_config: dict, optional
+        :raises KeyError: if a field of the instance is missing in instance_obj
+        :return: instance of cls
+        """
+        instance = cls.__new__(cls)
+        InstanceConfig.__init__(instance, ad_source, instance_obj.get('name'), ad_unit,
+                                instance_obj.get('status') == 'active', instance_obj.get('id', -1),
+                                instance_obj.get('rate'))
+        for field, attribute in cls._api_fields:
+            setattr(instance, attribute, instance_obj[field])
+        app_config = app_config or {}
+        for field, attribute in cls._api_app_fields:
+            setattr(instance, attribute, app_config.get(field, instance_obj.get(field, '')))
+        return instance
+
     def get_object(self) -> dict:
         """
         returns formatted dictionary for api request
@@ -64,8 +104,9 @@ class InstanceConfig:  # pylint: disable=missing-class-docstring
 
 class IronSourceBase(InstanceConfig):
     """IronSource Base Instance"""
+    __slots__ = ('_application_key', '_instance_pricing')
     _application_key: str
-    _instance_pricing: list = []
+    _instance_pricing: list
 
     def __init__(self, ad_source: Networks, instance_name: str, ad_unit: AdUnits, application_key: str,  # pylint: disable=too-many-arguments
                  status: bool = True,
@@ -78,6 +119,19 @@ class IronSourceBase(InstanceConfig):
                 self._instance_pricing.append(
                     {'eCPM': price, 'country': countries})
 
+    @classmethod
+    def from_api(cls, ad_source: Networks, ad_unit: AdUnits, instance_obj: dict, app_config: dict = None) -> 'IronSourceBase':
+        """
+        Creates an instance from a get_instances response entry, the application key is not part of the response
+        and is set to None, see InstanceConfig.from_api
+        """
+        instance = super().from_api(ad_source, ad_unit, instance_obj, app_config)
+        instance._application_key = None  # pylint: disable=protected-access
+        # the response lists the countries of a price under 'Countries', the request payload under 'country'
+        instance._instance_pricing = [{'eCPM': price.get('eCPM'), 'country': price.get('Countries', price.get('country'))}  # pylint: disable=protected-access
+                                      for price in instance_obj.get('pricing', [])]
+        return instance
+
     def get_pricing_obj(self):  # pylint: disable=missing-function-docstring #pylint: disable=missing-function-docstring
         return self._instance_pricing
 
@@ -105,6 +159,7 @@ class IronSourceInstance(IronSourceBase):
         :param instance_id: instance id of the instance for update request, defaults to -1
         :type instance_id: int, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, application_key: str,  # pylint: disable=too-many-arguments
                  status: bool = True,
@@ -127,6 +182,7 @@ class IronSourceBidding(IronSourceBase):
         :param instance_id: instance id of the instance for update request, defaults to -1
         :type instance_id: int, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, application_key: str,  # pylint: disable=too-many-arguments
                  status: bool = True,
@@ -138,6 +194,9 @@ class IronSourceBidding(IronSourceBase):
 
 class AdColonyBase(InstanceConfig):
     """AdColony Instance"""
+    __slots__ = ('_app_id', '_zone_id')
+    _api_fields = (('zoneId', '_zone_id'),)
+    _api_app_fields = (('appID', '_app_id'),)
     _app_id: str
     _zone_id: str
 
@@ -181,6 +240,7 @@ class AdColonyInstance(AdColonyBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, app_id: str, zone_id: str,  # pylint: disable=too-many-arguments
                  status: bool = True,
@@ -207,6 +267,7 @@ class AdColonyBidding(AdColonyBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, app_id: str, zone_id: str,  # pylint: disable=too-many-arguments
                  status: bool = True,
@@ -233,6 +294,9 @@ class AdMobInstance(InstanceConfig):
     :param rate: instance rate, defaults to None
     :type rate: float, optional
     """
+    __slots__ = ('_app_id', '_ad_unit_id')
+    _api_fields = (('adUnitId', '_ad_unit_id'),)
+    _api_app_fields = (('appId', '_app_id'),)
 
     _app_id: str
     _ad_unit_id: str
@@ -277,6 +341,9 @@ class AdManager(InstanceConfig):
     :param rate: instance rate, defaults to None
     :type rate: float, optional
     """
+    __slots__ = ('_app_id', '_ad_unit_id')
+    _api_fields = (('adUnitId', '_ad_unit_id'),)
+    _api_app_fields = (('appId', '_app_id'),)
     _app_id: str
     _ad_unit_id: str
 
@@ -322,6 +389,9 @@ class AmazonInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_key', '_ec')
+    _api_fields = (('ec', '_ec'),)
+    _api_app_fields = (('appKey', '_app_key'),)
     _app_key: str
     _ec: str
 
@@ -366,6 +436,9 @@ class ApplovinInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_sdk_key', '_zone_id')
+    _api_fields = (('zone_id', '_zone_id'),)
+    _api_app_fields = (('sdkKey', '_sdk_key'),)
     _sdk_key: str
     _zone_id: str
 
@@ -412,6 +485,9 @@ class ChartboostInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_app_signature', '_ad_location')
+    _api_fields = (('adLocation', '_ad_location'),)
+    _api_app_fields = (('appId', '_app_id'), ('appSignature', '_app_signature'))
     _app_id: str
     _app_signature: str
     _ad_location: str
@@ -463,6 +539,8 @@ class CrossPromotionBidding(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_traffic_id',)
+    _api_fields = (('traffic_id', '_traffic_id'),)
     _traffic_id: str
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, traffic_id: str,  # pylint: disable=too-many-arguments
@@ -500,6 +578,9 @@ class CSJInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_slot_id')
+    _api_fields = (('slot_id', '_slot_id'),)
+    _api_app_fields = (('appID', '_app_id'),)
     _app_id: str
     _slot_id: str
 
@@ -542,6 +623,8 @@ class DirectDeals(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_traffic_id',)
+    _api_fields = (('traffic_id', '_traffic_id'),)
     _traffic_id: str
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, traffic_id: str,  # pylint: disable=too-many-arguments
@@ -563,6 +646,9 @@ class DirectDeals(InstanceConfig):
 
 class FacebookBase(InstanceConfig):
     """Facebook Base"""
+    __slots__ = ('_app_id', '_user_access_token', '_placement_id')
+    _api_fields = (('placement_id', '_placement_id'),)
+    _api_app_fields = (('appId', '_app_id'), ('userAccessToken', '_user_access_token'))
     _app_id: str
     _user_access_token: str
     _placement_id: str
@@ -616,6 +702,7 @@ class FacebookInstance(FacebookBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, app_id: str, user_access_token: str,  # pylint: disable=too-many-arguments
                  placement_id: str,
@@ -643,6 +730,7 @@ class FacebookBidding(FacebookBase):
     :param rate: instance rate, defaults to None
     :type rate: float, optional
     """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, app_id: str, user_access_token: str,  # pylint: disable=too-many-arguments
                  placement_id: str,
@@ -672,6 +760,9 @@ class FyberInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_ad_spot_id', '_content_id')
+    _api_fields = (('adSoptId', '_ad_spot_id'), ('contentId', '_content_id'))
+    _api_app_fields = (('appId', '_app_id'),)
     _app_id: str
     _ad_spot_id: str
     _content_id: str
@@ -723,6 +814,9 @@ class HyperMXInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_distributor_id', '_placement_id')
+    _api_fields = (('placementId', '_placement_id'),)
+    _api_app_fields = (('distributorId', '_distributor_id'),)
     _distributor_id: str
     _placement_id: str
 
@@ -753,6 +847,8 @@ class HyperMXInstance(InstanceConfig):
 
 class InMobiBase(InstanceConfig):
     """InMobi Base"""
+    __slots__ = ('_placement_id',)
+    _api_fields = (('placementId', '_placement_id'),)
     _placement_id: str
 
     def __init__(self, ad_source: Networks, instance_name: str, ad_unit: AdUnits, placement_id: str,  # pylint: disable=too-many-arguments
@@ -786,6 +882,7 @@ class InMobiInstance(InMobiBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, placement_id: str,  # pylint: disable=too-many-arguments
                  status: bool = True, instance_id: int = -1, rate: float = None):
@@ -810,6 +907,7 @@ class InMobiBidding(InMobiBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, placement_id: str,  # pylint: disable=too-many-arguments
                  status: bool = True, instance_id: int = -1, rate: float = None):
@@ -836,6 +934,9 @@ class LiftoffInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_ad_unit_id')
+    _api_fields = (('adUnitId', '_ad_unit_id'),)
+    _api_app_fields = (('appId', '_app_id'),)
     _app_id: str
     _ad_unit_id: str
 
@@ -883,6 +984,9 @@ class MaioInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_media_id', '_zone_id')
+    _api_fields = (('zoneId', '_zone_id'), ('mediaId', '_media_id'))
+    _api_app_fields = (('appId', '_app_id'),)
     _app_id: str
     _media_id: str
     _zone_id: str
@@ -937,6 +1041,9 @@ class MediaBrixInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_reporting_property', '_zone')
+    _api_fields = (('zone', '_zone'),)
+    _api_app_fields = (('appId', '_app_id'), ('reportingProperty', '_reporting_property'))
 
     _app_id: str
     _reporting_property: str
@@ -990,6 +1097,8 @@ class MyTarget(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_slot_id', '_placement_id')
+    _api_fields = (('slotId', '_slot_id'), ('PlacementID', '_placement_id'))
     _slot_id: str
     _placement_id: str
 
@@ -1016,6 +1125,9 @@ class MyTarget(InstanceConfig):
 
 class TapJoyBase(InstanceConfig):
     """TapJoy Instance"""
+    __slots__ = ('_sdk_key', '_api_key', '_placement_name')
+    _api_fields = (('placementName', '_placement_name'),)
+    _api_app_fields = (('sdkKey', '_sdk_key'), ('apiKey', '_api_key'))
     _sdk_key: str
     _api_key: str
     _placement_name: str
@@ -1069,6 +1181,7 @@ class TapJoyInstance(TapJoyBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, sdk_key: str, api_key: str,  # pylint: disable=too-many-arguments
                  placement_name: str,
@@ -1098,6 +1211,7 @@ class TapJoyBidding(TapJoyBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, sdk_key: str, api_key: str,  # pylint: disable=too-many-arguments
                  placement_name: str,
@@ -1109,6 +1223,9 @@ class TapJoyBidding(TapJoyBase):
 
 class PangleBase(InstanceConfig):
     """Pangle Base Instance"""
+    __slots__ = ('_app_id', '_slot_id')
+    _api_fields = (('slotID', '_slot_id'),)
+    _api_app_fields = (('appID', '_app_id'),)
     _app_id: str
     _slot_id: str
 
@@ -1152,6 +1269,7 @@ class PangleInstance(PangleBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, app_id: str, slot_id: str,  # pylint: disable=too-many-arguments
                  status: bool = True, instance_id: int = -1, rate: float = None):
@@ -1178,6 +1296,7 @@ class PangleBidding(PangleBase):
     :param rate: instance rate, defaults to None
     :type rate: float, optional
     """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, app_id: str, slot_id: str,  # pylint: disable=too-many-arguments
                  status: bool = True, instance_id: int = -1, rate: float = None):
@@ -1204,6 +1323,9 @@ class UnityAdsInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_source_id', '_zone_id')
+    _api_fields = (('zoneId', '_zone_id'),)
+    _api_app_fields = (('sourceId', '_source_id'),)
     _source_id: str
     _zone_id: str
 
@@ -1249,6 +1371,9 @@ class SmaatoInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_application_name', '_ad_space_id')
+    _api_fields = (('adspaceID', '_ad_space_id'),)
+    _api_app_fields = (('applicationName', '_application_name'),)
     _application_name: str
     _ad_space_id: str
 
@@ -1294,6 +1419,9 @@ class SnapInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_slot_id')
+    _api_fields = (('SlotID', '_slot_id'),)
+    _api_app_fields = (('AppId', '_app_id'),)
     _app_id: str
     _slot_id: str
 
@@ -1339,6 +1467,9 @@ class SuperAwesomeInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_placement_id')
+    _api_fields = (('placementId', '_placement_id'),)
+    _api_app_fields = (('appId', '_app_id'),)
     _app_id: str
     _placement_id: str
 
@@ -1384,6 +1515,9 @@ class TencentInstance(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_placement_id')
+    _api_fields = (('placementId', '_placement_id'),)
+    _api_app_fields = (('appId', '_app_id'),)
     _app_id: str
     _placement_id: str
 
@@ -1429,6 +1563,9 @@ class YahooBidding(InstanceConfig):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ('_app_id', '_site_id')
+    _api_fields = (('placementId', '_site_id'),)
+    _api_app_fields = (('siteId', '_app_id'),)
     _app_id: str
     _site_id: str
 
@@ -1459,6 +1596,9 @@ class YahooBidding(InstanceConfig):
 
 class VungleBase(InstanceConfig):
     """Vungle Base"""
+    __slots__ = ('_app_id', '_reporting_api_id', '_placement_id')
+    _api_fields = (('PlacementId', '_placement_id'),)
+    _api_app_fields = (('AppID', '_app_id'), ('reportingAPIId', '_reporting_api_id'))
     _app_id: str
     _reporting_api_id: str
     _placement_id: str
@@ -1512,6 +1652,7 @@ class VungleInstance(VungleBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, app_id: str, reporting_api_id: str,  # pylint: disable=too-many-arguments
                  placement_id: str,
@@ -1540,6 +1681,7 @@ class VungleBidding(VungleBase):
         :param rate: instance rate, defaults to None
         :type rate: float, optional
         """
+    __slots__ = ()
 
     def __init__(self, instance_name: str, ad_unit: AdUnits, app_id: str, reporting_api_id: str,  # pylint: disable=too-many-arguments
                  placement_id: str,
@@ -1547,3 +1689,230 @@ class VungleBidding(VungleBase):
 
         super().__init__(Networks.VungleBidding, instance_name, ad_unit,
                          app_id, reporting_api_id, placement_id, status, instance_id, rate)
+
+
+class GenericInstance(InstanceConfig):
+    """Instance parsed from a get_instances response, the network specific fields are kept as returned by the API
+
+        :param ad_source: Network of the instance
+        :type ad_source: Networks
+        :param instance_name: Name of the instance
+        :type instance_name: str
+        :param ad_unit:  Ad Unit of the instance
+        :type ad_unit: AdUnits
+        :param status: Instance is turned on or off
+        :type status: bool
+        :param instance_id: instance id
+        :type instance_id: int
+        :param rate: instance rate, defaults to None
+        :type rate: float, optional
+        :param fields: network specific instance fields, defaults to None
+        :type fields: dict, optional
+        :param app_config: network app configuration, defaults to None
+        :type app_config: dict, optional
+        """
+    __slots__ = ('_fields', '_app_config')
+    _fields: dict
+    _app_config: dict
+
+    def __init__(self, ad_source: Networks, instance_name: str, ad_unit: AdUnits, status: bool,  # pylint: disable=too-many-arguments
+                 instance_id: int, rate: float = None, fields: dict = None, app_config: dict = None):
+        super().__init__(ad_source, instance_name, ad_unit, status, instance_id, rate)
+        self._fields = dict(fields) if fields else {}
+        self._app_config = dict(app_config) if app_config else {}
+
+    @classmethod
+    def from_api(cls, ad_source: Networks, ad_unit: AdUnits, instance_obj: dict, app_config: dict = None) -> 'GenericInstance':
+        """
+        Creates an instance from a get_instances response entry keeping all of its fields, see InstanceConfig.from_api
+        """
+        fields = {key: value for key, value in instance_obj.items()
+                  if key not in ('id', 'name', 'status', 'rate')}
+        return cls(ad_source, instance_obj.get('name'), ad_unit, instance_obj.get('status') == 'active',
+                   instance_obj.get('id', -1), instance_obj.get('rate'), fields, app_config)
+
+    def get_fields(self) -> dict:  # pylint: disable=missing-function-docstring
+        return self._fields
+
+    def get_app_data_obj(self):  # pylint: disable=missing-function-docstring
+        return self._app_config or None
+
+    def get_object(self) -> dict:  # pylint: disable=missing-function-docstring
+        obj = super().get_object()
+        obj.update(self._fields)
+        return obj
+
+
+_INSTANCE_CLASSES = {
+    Networks.IronSource: IronSourceInstance,
+    Networks.IronSourceBidding: IronSourceBidding,
+    Networks.AppLovin: ApplovinInstance,
+    Networks.AdColony: AdColonyInstance,
+    Networks.AdColonyBidding: AdColonyBidding,
+    Networks.AdMob: AdMobInstance,
+    Networks.AdManager: AdManager,
+    Networks.Amazon: AmazonInstance,
+    Networks.Chartboost: ChartboostInstance,
+    Networks.CrossPromotionBidding: CrossPromotionBidding,
+    Networks.CSJ: CSJInstance,
+    Networks.DirectDeals: DirectDeals,
+    Networks.Facebook: FacebookInstance,
+    Networks.FacebookBidding: FacebookBidding,
+    Networks.Fyber: FyberInstance,
+    Networks.HyperMX: HyperMXInstance,
+    Networks.InMobi: InMobiInstance,
+    Networks.InMobiBidding: InMobiBidding,
+    Networks.LiftOff: LiftoffInstance,
+    Networks.Maio: MaioInstance,
+    Networks.MediaBrix: MediaBrixInstance,
+    Networks.MyTarget: MyTarget,
+    Networks.Pangle: PangleInstance,
+    Networks.PangleBidding: PangleBidding,
+    Networks.Smaato: SmaatoInstance,
+    Networks.Snap: SnapInstance,
+    Networks.SuperAwesome: SuperAwesomeInstance,
+    Networks.TapJoy: TapJoyInstance,
+    Networks.TapJoyBidding: TapJoyBidding,
+    Networks.Tencent: TencentInstance,
+    Networks.UnityAds: UnityAdsInstance,
+    Networks.Vungle: VungleInstance,
+    Networks.VungleBidding: VungleBidding,
+    Networks.YahooBidding: YahooBidding,
+}
+
+
+def get_instance_key(instance: InstanceConfig) -> Tuple[str, str, str]:
+    """
+    :param instance: instance to get the key for
+    :return: (network, ad unit, instance name) that identifies the instance in an app
+    """
+    return instance.get_ad_source(), instance.get_instance_ad_unit(), instance.get_instance_name()
+
+
+def register_instance_class(network: Networks, instance_class: type):
+    """
+    Registers the InstanceConfig class that parse_instances creates for the instances of a network
+    :param network: Network of the instances
+    :type network: Networks
+    :param instance_class: InstanceConfig subclass that implements from_api
+    :type instance_class: type
+    """
+    if not issubclass(instance_class, InstanceConfig):
+        raise TypeError('instance_class must be a subclass of InstanceConfig, not {}.'.format(instance_class))
+    _INSTANCE_CLASSES[network] = instance_class
+
+
+def get_instance_class(network: Networks) -> type:
+    """
+    :param network: Network of the instances
+    :return: the InstanceConfig class registered for the network, GenericInstance if none is registered
+    """
+    return _INSTANCE_CLASSES.get(network, GenericInstance)
+
+
+def parse_instances(response: dict, typed: bool = True) -> List[InstanceConfig]:
+    """
+    Parses a get_instances response into instance objects.
+    Networks and ad units that are not in Networks and AdUnits are skipped.
+    :param response: get_instances response, ad unit -> network -> [{'id': 5, 'name': 'TEST', 'status': 'active', ...}]
+    :type response: dict
+    :param typed: create the class registered for each network (e.g. VungleInstance), defaults to True.
+        Instances that are missing a field of their class and all instances when typed is False are created as GenericInstance
+    :type typed: bool, optional
+    :return: list of InstanceConfig
+    """
+    instances = []
+    for ad_unit_name, ad_unit_networks in response.items():
+        try:
+            ad_unit = AdUnits(ad_unit_name)
+        except ValueError:
+            continue
+        if not isinstance(ad_unit_networks, dict):
+            continue
+        for network_name, network_instances in ad_unit_networks.items():
+            try:
+                network = Networks(network_name)
+            except ValueError:
+                continue
+            instance_class = get_instance_class(network) if typed else GenericInstance
+            for instance_obj in network_instances:
+                try:
+                    instances.append(instance_class.from_api(network, ad_unit, instance_obj))
+                except KeyError:
+                    instances.append(GenericInstance.from_api(network, ad_unit, instance_obj))
+    return instances
+
+
+def _normalize_value(value):
+    """sorts lists of strings (e.g. pricing countries) so they compare regardless of their order"""
+    if isinstance(value, dict):
+        return {key: _normalize_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_normalize_value(item) for item in value]
+        return sorted(items) if all(isinstance(item, str) for item in items) else items
+    return value
+
+
+def _is_same_value(current, desired) -> bool:
+    """compares two field values, lists (e.g. pricing) are compared regardless of their order"""
+    current, desired = _normalize_value(current), _normalize_value(desired)
+    if isinstance(current, list) and isinstance(desired, list):
+        return len(current) == len(desired) and all(item in current for item in desired)
+    return current == desired
+
+
+def _is_instance_changed(current: InstanceConfig, desired: InstanceConfig) -> bool:
+    """returns True if any field that is set on desired differs from current"""
+    current_obj = current.get_object()
+    if any(not _is_same_value(current_obj.get(key), value) for key, value in desired.get_object().items()):
+        return True
+    current_app_data = current.get_app_data_obj() or {}
+    return any(value != '' and current_app_data.get(key) != value
+               for key, value in (desired.get_app_data_obj() or {}).items())
+
+
+def plan_instance_sync(current: Iterable[InstanceConfig], desired: Iterable[InstanceConfig],
+                       prune: bool = False) -> Dict[str, List[InstanceConfig]]:
+    """
+    Computes the changes needed to turn the current instances of an app into the desired instances.
+    Instances are matched by (network, ad unit, instance name), only the fields that are set on the
+    desired instance are compared.
+    :param current: instances that exist in the app, see parse_instances
+    :type current: Iterable[InstanceConfig]
+    :param desired: instances that should exist in the app
+    :type desired: Iterable[InstanceConfig]
+    :param prune: delete current instances that are not desired, defaults to False
+    :type prune: bool, optional
+    :return: dict of 'add', 'update', 'delete' and 'unchanged' instance lists,
+        'update' instances are copies of the desired instances with the current instance id
+    """
+    current_index = {}
+    duplicates = []
+    for instance in current:
+        key = get_instance_key(instance)
+        if key in current_index:
+            duplicates.append(instance)
+        else:
+            current_index[key] = instance
+
+    plan = {'add': [], 'update': [], 'delete': [], 'unchanged': []}
+    desired_keys = set()
+    for instance in desired:
+        key = get_instance_key(instance)
+        if key in desired_keys:
+            raise ValueError('instance {} is defined more than once.'.format(key))
+        desired_keys.add(key)
+
+        current_instance = current_index.get(key)
+        if current_instance is None:
+            plan['add'].append(instance)
+        elif _is_instance_changed(current_instance, instance):
+            update = copy.copy(instance)
+            update._instance_id = current_instance.get_instance_id()  # pylint: disable=protected-access
+            plan['update'].append(update)
+        else:
+            plan['unchanged'].append(current_instance)
+
+    if prune:
+        plan['delete'] = [instance for key, instance in current_index.items() if key not in desired_keys] + duplicates
+    return plan
@@ -1,10 +1,9 @@
 """Module for Mediation Group Tier Priority"""
 import enum
 from logging import warning, error
-from typing import Iterable
-from pydash import arrays
+from typing import Dict, Iterable, KeysView, List, Optional, Tuple, Union
 
-from ironsource_api.monetize_api import Networks
+from ironsource_api.monetize_api import AdUnits, Networks
 
 
 class TierType(enum.Enum):
@@ -21,12 +20,17 @@ class MediationGroupTier():
     :param tier_type: Tier type for mediation group
     :type tier_type: TierType
     """
-    _instances = []
-    _tier_type: TierType = None
+    __slots__ = ('_tier_type', '_instances', '_version')
+    _tier_type: TierType
+    # ordered instances of the tier by (providerName, instanceId)
+    _instances: Dict[Tuple[str, int], dict]
+    # incremented on every change of the instances, see MediationGroupPriority.get_object
+    _version: int
 
     def __init__(self, tier_type: TierType):
         self._tier_type = tier_type
-        self._instances = []
+        self._instances = {}
+        self._version = 0
 
     def add_instances(self, network: Networks, instance_id: int, rate: int = None,
                       position: int = None, capping: int = None):
@@ -35,17 +39,19 @@ class MediationGroupTier():
         :param network: a network from Networks
         :param instance_id: ID of the instance for the network (see MonetizeAPI().get_instances())
         :param rate: Optional: overrides the cpm of the instance with rate
-        :param position: Optional: The position of the instance in the waterfall, only for Manual tier type
+        :param position: Optional: The position of the instance in the waterfall starting from 1, only for Manual tier type.
+            An instance that already exists in a Manual tier is moved to the new position, defaults to the end of the tier
         :param capping: Optional: Set capping for the instance per session
         """
-        current_pos = self._check_if_exists(instance_id, network)
-        if self._tier_type != TierType.MANUAL:
-            if current_pos > -1:
+        key = (network.value, instance_id)
+        if key in self._instances:
+            if self._tier_type != TierType.MANUAL or position is None:
                 warning('Instance already exists in the group')
                 return
-        elif current_pos == position:
-            warning('The instance already exists with the same position')
-            return
+            if self.get_position(network, instance_id) == position:
+                warning('The instance already exists with the same position')
+                return
+            del self._instances[key]
 
         if rate:
             instance_obj = {'providerName': network.value, 'instanceId': instance_id, 'rate': rate}
@@ -55,16 +61,47 @@ class MediationGroupTier():
         if capping:
             instance_obj['capping'] = capping
 
-        if self._tier_type != TierType.MANUAL:
-            self._instances.append(instance_obj)
+        if self._tier_type != TierType.MANUAL or position is None or position > len(self._instances):
+            self._instances[key] = instance_obj
         else:
-            arrays.splice(self._instances, 0, position, instance_obj)
+            items = list(self._instances.items())
+            items.insert(max(position - 1, 0), (key, instance_obj))
+            self._instances = dict(items)
+        self._version += 1
 
     def get_instance_list(self) -> list:
         """
         Returns list of instances in the tier
         """
-        return self._instances
+        return list(self._instances.values())
+
+    def get_instance_keys(self) -> KeysView:
+        """
+        Returns (providerName, instanceId) of the instances in the tier
+        """
+        return self._instances.keys()
+
+    def has_instance(self, network: Networks, instance_id: int) -> bool:
+        """
+        :param network: The network of the instance.
+        :param instance_id: Instance ID.
+        :return: True if the instance is in the tier
+        """
+        return (network.value, instance_id) in self._instances
+
+    def get_position(self, network: Networks, instance_id: int) -> int:
+        """
+        :param network: The network of the instance.
+        :param instance_id: Instance ID.
+        :return: position of the instance in the tier starting from 1, -1 if the instance is not in the tier
+        """
+        key = (network.value, instance_id)
+        if key not in self._instances:
+            return -1
+        for position, instance_key in enumerate(self._instances, 1):
+            if instance_key == key:
+                return position
+        return -1
 
     def remove_instance(self, network: Networks, instance_id: int):
         """
@@ -72,11 +109,10 @@ class MediationGroupTier():
         :param network: The network of the instance to remove.
         :param instance_id: Instance ID to remove.
         """
-        arrays.pop(self._instances, self._check_if_exists(instance_id, network))
-
-    def _check_if_exists(self, instance_id: int, network: Networks):
-        return arrays.find_index(self._instances,
-                                 lambda obj: (obj['instanceId'] == instance_id and obj['providerName'] == network))
+        if self._instances.pop((network.value, instance_id), None) is None:
+            warning('Instance does not exist in the group')
+            return
+        self._version += 1
 
     def get_tier_type(self) -> TierType:
         """
@@ -84,12 +120,18 @@ class MediationGroupTier():
         """
         return self._tier_type
 
+    def get_version(self) -> int:
+        """
+        :return: number of changes made to the instances of the tier
+        """
+        return self._version
+
     def get_object(self):
         """
         building tier object for sending to the API.
         """
         group_tier = {
-            'instances': self._instances,
+            'instances': self.get_instance_list(),
             'tierType': self._tier_type.value
         }
         return group_tier
@@ -101,36 +143,46 @@ class MediationGroupPriority():
     """
     _tier_array = [None, None, None]
     _bidders: MediationGroupTier = None
+    # incremented when a tier is set or removed, see get_object
+    _version: int = 0
+    # (versions of the group and its tiers, object) of the last get_object call
+    _object_cache: Optional[Tuple[tuple, dict]] = None
 
     def __init__(self):
         self._tier_array = [None, None, None]
         self._bidders = None
+        self._version = 0
+        self._object_cache = None
 
     def set_mediation_group_tier(self, group_tier: MediationGroupTier, position: int) -> bool:
         """
         sets group tier in specific place in the group (tier1, tier2, tier3)
         :param group_tier: MediationGroupTier to be added to the group tier list
         :param position: The Position of the tier (0-2), Ignored in case of bidding tier.
+        :raises Exception: when instances of the tier already exist in another tier or in the bidders of the group
         :return: true upon successful addition of the tier to the group list.
         """
-        if group_tier.get_tier_type() == TierType.BIDDERS:
+        is_bidders = group_tier.get_tier_type() == TierType.BIDDERS
+        if not is_bidders and position > 2:
+            error('Max number of tiers are 3, position must be between 0-2')
+            raise Exception('Max number of tiers are 3, position must be between 0-2')
+
+        overlaps = self._validate_tier(group_tier, None if is_bidders else position)
+        if overlaps:
+            message = 'Some instances overlap between tiers: {}'.format(
+                ', '.join('{} with instances {}'.format(overlap['tier'], overlap['instances']) for overlap in overlaps))
+            error(message)
+            raise Exception(message)
+
+        if is_bidders:
             if self._bidders:
                 warning('Replacing bidders list')
             self._bidders = group_tier
+            self._version += 1
             return True
 
-        if position > 2:
-            error('Max number of tiers are 3, position must be between 0-2')
-            raise Exception('Max number of tiers are 3, position must be between 0-2')
-
-        val_obj = self._validate_tier(group_tier, position)
-        if val_obj['position'] != -1:
-            error('Some instances overlap between tiers: tier {} with instances {}'
-                  .format(val_obj['position'] + 1, val_obj['list']))
-            raise Exception('Some instances overlap between tiers: tier {} with instances {}'
-                            .format(val_obj['position'] + 1, val_obj['list']))
-
         self._tier_array[position] = group_tier
+        self._version += 1
         return True
 
     def remove_tier(self, position: int):
@@ -141,6 +193,7 @@ class MediationGroupPriority():
         if not self._tier_array[position]:
             warning('Tier{} is empty'.format(position + 1))
         self._tier_array[position] = None
+        self._version += 1
 
     def remove_bidders(self):
         """
@@ -150,6 +203,7 @@ class MediationGroupPriority():
             warning('Bidders list is empty')
             return
         self._bidders = None
+        self._version += 1
 
     def get_bidders(self):
         """
@@ -166,37 +220,160 @@ class MediationGroupPriority():
     def get_object(self):
         """
         Creates and returns an object to send to the API call.
+        Empty positions are skipped, so the set tiers are numbered from tier1 in their order.
+        The object is cached until a tier of the group changes, it is shared between calls and must not be modified.
         :return: dict
         """
+        tiers = [tier for tier in self._tier_array if tier]
+        versions = (self._version,) + tuple(tier.get_version() for tier in tiers + [self._bidders] if tier)
+        if self._object_cache and self._object_cache[0] == versions:
+            return self._object_cache[1]
+
         med_group_priority = {
         }
         if self._bidders:
             med_group_priority['bidding'] = self._bidders.get_object()
-        arrays.remove(self._tier_array, lambda obj: obj is None)
 
-        for i in range(len(self._tier_array)):
-            tier_obj = self._tier_array[i].get_object()
-            med_group_priority['tier{}'.format(i + 1)] = tier_obj
+        for i, tier in enumerate(tiers):
+            med_group_priority['tier{}'.format(i + 1)] = tier.get_object()
 
+        self._object_cache = (versions, med_group_priority)
         return med_group_priority
 
-    def _validate_tier(self, group_tier: MediationGroupTier, position: int) -> dict:
+    def _validate_tier(self, group_tier: MediationGroupTier, position: int = None) -> List[dict]:
         """
-        Validates that the instances in the given tier do not exist already on another tier in the group
+        Validates that the instances in the given tier do not exist already on another tier or in the bidders of the group
         :param group_tier: The tier to be check against
-        :param position: The new position of the tier - We ignore comparison in that position
-        :return: In case of duplicates instances returns an object with list of duplicates and tier position,
-                 otherwise returns object with position of -1 and empty list.
-        """
-        for i in range(len(self._tier_array)):
-            if i == position or not self._tier_array[i]:
-                continue
-            intersection_list = arrays.intersection_with(self._tier_array[i].get_instance_list(),
-                                                         group_tier.get_instance_list(),
-                                                         comparator=lambda a, b: a['instanceId'] == b['instanceId']
-                                                                                 and a['providerName'] == b[
-                                                                                     'providerName'])
-            if len(intersection_list) > 0:
-                return {position: i, list: intersection_list}
-
-        return {'position': -1, 'list': []}
+        :param position: The new position of the tier - We ignore comparison in that position,
+                         None when group_tier replaces the bidders
+        :return: list of overlaps with the other tiers, empty when there are none. Example ::
+            [{"tier": "tier2", "position": 1, "instances": [{"providerName": "Vungle", "instanceId": 1234}]},
+             {"tier": "bidding", "position": None, "instances": [{"providerName": "ironSource", "instanceId": 0}]}]
+        """
+        others = [('tier{}'.format(i + 1), i, tier) for i, tier in enumerate(self._tier_array) if tier and i != position]
+        if position is not None and self._bidders:
+            others.append(('bidding', None, self._bidders))
+
+        overlaps = []
+        instance_keys = group_tier.get_instance_keys()
+        for tier_name, tier_position, tier in others:
+            common = instance_keys & tier.get_instance_keys()
+            if common:
+                overlaps.append({'tier': tier_name, 'position': tier_position,
+                                 'instances': [{'providerName': provider_name, 'instanceId': instance_id}
+                                               for provider_name, instance_id in instance_keys if (provider_name, instance_id) in common]})
+        return overlaps
+
+
+class MediationGroup():
+    """Desired mediation group of an app, see MonetizeAPI.sync_mediation_groups
+
+    :param ad_unit: Ad unit of the group (see AdUnits)
+    :type ad_unit: AdUnits
+    :param group_name: Group's name, groups are matched by ad unit and name
+    :type group_name: str
+    :param group_countries: List of group countries in [ISO 3166-1 Alpha-2](https://en.wikipedia.org/wiki/List_of_ISO_3166_country_codes)
+    :type group_countries: Iterable[str]
+    :param group_position: Position of the group in the groups list, only used when the group is created, defaults to None
+    :type group_position: int, optional
+    :param group_segment: Segment ID attached to the group, defaults to None
+    :type group_segment: int, optional
+    :param ad_source_priority: AdSource and their priority in the group, defaults to None
+    :type ad_source_priority: MediationGroupPriority, optional
+    """
+    __slots__ = ('_ad_unit', '_group_name', '_group_countries', '_group_position', '_group_segment', '_ad_source_priority')
+    _ad_unit: AdUnits
+    _group_name: str
+    _group_countries: List[str]
+    _group_position: int
+    _group_segment: int
+    _ad_source_priority: MediationGroupPriority
+
+    def __init__(self, ad_unit: AdUnits, group_name: str, group_countries: Iterable[str], group_position: int = None,  # pylint: disable=too-many-arguments
+                 group_segment: int = None, ad_source_priority: MediationGroupPriority = None):
+        self._ad_unit = ad_unit
+        self._group_name = group_name
+        self._group_countries = list(group_countries)
+        self._group_position = group_position
+        self._group_segment = group_segment
+        self._ad_source_priority = ad_source_priority
+
+    def get_ad_unit(self) -> AdUnits:  # pylint: disable=missing-function-docstring
+        return self._ad_unit
+
+    def get_group_name(self) -> str:  # pylint: disable=missing-function-docstring
+        return self._group_name
+
+    def get_group_countries(self) -> List[str]:  # pylint: disable=missing-function-docstring
+        return self._group_countries
+
+    def get_group_position(self) -> int:  # pylint: disable=missing-function-docstring
+        return self._group_position
+
+    def get_group_segment(self) -> int:  # pylint: disable=missing-function-docstring
+        return self._group_segment
+
+    def get_ad_source_priority(self) -> MediationGroupPriority:  # pylint: disable=missing-function-docstring
+        return self._ad_source_priority
+
+    def get_key(self) -> Tuple[str, str]:
+        """
+        :return: (ad unit, group name) that identifies the group in an app
+        """
+        return self._ad_unit.value, self._group_name
+
+    def is_changed(self, current_group: dict) -> bool:
+        """
+        Compares the group with a group returned by MonetizeAPI.get_mediation_groups
+        :param current_group: group as returned by the API
+        :type current_group: dict
+        :return: True if the countries, the segment or the ad source priority that are set on this group differ
+        """
+        if set(self._group_countries) != set(current_group.get('groupCountries') or []):
+            return True
+        if self._group_segment and self._group_segment != current_group.get('groupSegments'):
+            return True
+        return bool(self._ad_source_priority) and \
+            _normalize_priority(self._ad_source_priority.get_object()) != _normalize_priority(current_group.get('adSourcePriority') or {})
+
+
+def index_mediation_groups(response: Union[dict, list]) -> Dict[Tuple[str, str], dict]:
+    """
+    Indexes a get_mediation_groups response by (ad unit, group name)
+    :param response: get_mediation_groups response {'adUnits': {ad unit: [group, ...]}}, ad unit -> list of groups
+        or a list of groups with 'adUnit'
+    :type response: Union[dict, list]
+    :return: dict of (ad unit, group name) -> group
+    """
+    if isinstance(response, dict):
+        response = response.get('adUnits', response)
+        groups = ((ad_unit, group) for ad_unit, ad_unit_groups in response.items()
+                  if isinstance(ad_unit_groups, list) for group in ad_unit_groups)
+    else:
+        groups = ((group.get('adUnit'), group) for group in response)
+    return {(ad_unit, group.get('groupName')): group for ad_unit, group in groups}
+
+
+def _normalize_capping(capping: Union[int, dict, None]) -> Union[Tuple[int, str], None]:
+    """returns (value, interval) of a capping, the request sets it as a number of impressions per session
+    and the response returns it as {'value': 2, 'interval': 'session'}"""
+    if not capping:
+        return None
+    if isinstance(capping, dict):
+        return capping.get('value'), capping.get('interval', 'session')
+    return capping, 'session'
+
+
+def _normalize_priority(priority: dict) -> dict:
+    """returns comparable tiers of an adSourcePriority object, the order of instances matters only in manual tiers
+    and tiers without instances are skipped"""
+    normalized = {}
+    for tier_name, tier in priority.items():
+        if not tier.get('instances'):
+            continue
+        instances = [(instance.get('providerName'), instance.get('instanceId'), instance.get('rate'),
+                      _normalize_capping(instance.get('capping')))
+                     for instance in tier.get('instances', [])]
+        normalized[tier_name] = (tier.get('tierType'),
+                                 instances if tier.get('tierType') == TierType.MANUAL.value else frozenset(instances))
+    return normalized
@@ -6,10 +6,12 @@ import json
 from ironsource_api.base_api import BaseAPI
 
 from . import AdUnits, Networks, Metrics, Breakdowns, Platform, AdUnitStatusMap
+from .catalog_cache import CatalogCacheMixin
 from .instance_config import InstanceConfig
 from .mediation_group_priority import MediationGroupPriority, TierType
 from .placement_config import Placement
-from ..utils import execute_request_as_stream, execute_request
+from .sync import MonetizeSyncMixin
+from ..utils import ResponseInterface, execute_request_as_stream, execute_request
 
 APP_API_URL = "https://platform.ironsrc.com/partners/publisher/applications/v6"
 
@@ -26,7 +28,7 @@ INSTANCES_API_URL = 'https://platform.ironsrc.com/partners/publisher/instances/v
 PLACEMENTS_URL = "https://platform.ironsrc.com/partners/publisher/placements/v1"
 
 
-class MonetizeAPI(BaseAPI):
+class MonetizeAPI(CatalogCacheMixin, MonetizeSyncMixin, BaseAPI):
     """IronSource Monetize API"""
 
     ###########
@@ -296,17 +298,24 @@ class MonetizeAPI(BaseAPI):
         :return: return JSON format list of the instances
         :rtype: dict
         """
-        bearer_token = await self.get_bearer_auth()
-        options = {
-            'headers': {
-                'Authorization': 'Bearer ' + bearer_token
-            },
-            'params': {
-                'appKey': application_key
+        async def _fetch():
+            bearer_token = await self.get_bearer_auth()
+            options = {
+                'headers': {
+                    'Authorization': 'Bearer ' + bearer_token
+                },
+                'params': {
+                    'appKey': application_key
+                }
             }
-        }
-        response = await execute_request('get', url=INSTANCES_API_URL, **options)
-        return json.loads(response.msg)
+            response = await execute_request('get', url=INSTANCES_API_URL, **options)
+            if response.error_code != -1:
+                raise Exception('Error getting instances {} Error Code: {}'.format(
+                    response.msg, response.error_code))
+
+            return json.loads(response.msg)
+
+        return await self._read_catalog('instances', application_key, _fetch)
 
     async def add_instances(self, application_key: str, instances: Iterable[InstanceConfig]):
         """
@@ -317,6 +326,15 @@ class MonetizeAPI(BaseAPI):
         :type instances: Iterable[InstanceConfig]
         :return: dict with all the instances of the app
         """
+        res = await self._post_instances(application_key, instances)
+        if res.error_code != -1:
+            raise Exception('Error creating adding instances {} Error Code: {}'.format(
+                res.msg, res.error_code))
+
+        return json.loads(res.msg)
+
+    async def _post_instances(self, application_key: str, instances: Iterable[InstanceConfig]) -> ResponseInterface:
+        """sends the add instances request of add_instances and returns its response"""
         bearer_token = await self.get_bearer_auth()
         body = {
             'appKey': application_key,
@@ -327,21 +345,22 @@ class MonetizeAPI(BaseAPI):
 
         instance: InstanceConfig
         for instance in instances:
-            if not instance.get_ad_source() in body['configurations']:
-                body['configurations'][instance.get_ad_source()] = {
-                    'appConfig': instance.get_app_data_obj()
-                } if instance.get_app_data_obj() else {}
-
-            if not instance.get_instance_ad_unit() in body['configurations'][instance.get_ad_source()]:
-                body['configurations'][instance.get_ad_source(
-                )][instance.get_instance_ad_unit()] = []
-            ad_source = body['configurations'][instance.get_ad_source()]
+            ad_source_name = instance.get_ad_source()
+            ad_unit = instance.get_instance_ad_unit()
+            if not ad_source_name in body['configurations']:
+                app_data = instance.get_app_payload()
+                body['configurations'][ad_source_name] = {
+                    'appConfig': app_data
+                } if app_data else {}
+
+            ad_source = body['configurations'][ad_source_name]
+            if not ad_unit in ad_source:
+                ad_source[ad_unit] = []
 
             if 'appConfig' in ad_source and ad_source['appConfig'] and all(v == '' for v in list(ad_source['appConfig'].values())):
                 del ad_source['appConfig']
 
-            ad_source[instance.get_instance_ad_unit()].append(
-                instance.get_object())
+            ad_source[ad_unit].append(instance.get_payload())
 
         options = {
             'headers': {
@@ -351,12 +370,8 @@ class MonetizeAPI(BaseAPI):
         }
 
         res = await execute_request(method='post', url=INSTANCES_API_URL, **options)
-
-        if res.error_code != -1:
-            raise Exception('Error creating adding instances {} Error Code: {}'.format(
-                res.msg, res.error_code))
-
-        return json.loads(res.msg)
+        self.invalidate_catalog(application_key, 'instances')
+        return res
 
     async def delete_instance(self, application_key: str, instance_id: int):
         """
@@ -379,6 +394,8 @@ class MonetizeAPI(BaseAPI):
         }
 
         res = await execute_request(method='delete', url=INSTANCES_API_URL, **options)
+        self.invalidate_catalog(application_key, 'instances')
+        self.invalidate_catalog(application_key, 'mediationGroups')
 
         if res.error_code != -1:
             raise Exception('Error creating deleting instance {} error:{} Error Code: {}'.format(instance_id, res.msg,
@@ -405,22 +422,23 @@ class MonetizeAPI(BaseAPI):
         }
         instance: InstanceConfig
         for instance in instances:
-            if not instance.get_ad_source() in body['configurations']:
-                body['configurations'][instance.get_ad_source()] = {
-                    'appConfig': instance.get_app_data_obj()
-                } if instance.get_app_data_obj() else {}
-
-            if not instance.get_instance_ad_unit() in body['configurations'][instance.get_ad_source()]:
-                body['configurations'][instance.get_ad_source(
-                )][instance.get_instance_ad_unit()] = []
-
-            instance_config = instance.get_object()
+            ad_source_name = instance.get_ad_source()
+            ad_unit = instance.get_instance_ad_unit()
+            if not ad_source_name in body['configurations']:
+                app_data = instance.get_app_payload()
+                body['configurations'][ad_source_name] = {
+                    'appConfig': app_data
+                } if app_data else {}
+
+            ad_source = body['configurations'][ad_source_name]
+            if not ad_unit in ad_source:
+                ad_source[ad_unit] = []
+
+            instance_config = instance.get_payload()
             if instance.get_instance_id() != -1:
-                instance_config.update(
-                    {'instanceId': instance.get_instance_id()})
+                instance_config = dict(instance_config, instanceId=instance.get_instance_id())
 
-            body['configurations'][instance.get_ad_source(
-            )][instance.get_instance_ad_unit()].append(instance_config)
+            ad_source[ad_unit].append(instance_config)
 
         options = {
             'headers': {
@@ -430,6 +448,7 @@ class MonetizeAPI(BaseAPI):
         }
 
         res = await execute_request(method='put', url=INSTANCES_API_URL, **options)
+        self.invalidate_catalog(application_key, 'instances')
 
         if res.error_code != -1:
             raise Exception('Error creating updating instances {} Error Code: {}'.format(
@@ -448,22 +467,25 @@ class MonetizeAPI(BaseAPI):
         :type application_key: str
         :return: list of mediation groups
         """
-        bearer_token = await self.get_bearer_auth()
-        options = {
-            'headers': {
-                'Authorization': 'Bearer ' + bearer_token
-            },
-            'params': {
-                'appKey': application_key
+        async def _fetch():
+            bearer_token = await self.get_bearer_auth()
+            options = {
+                'headers': {
+                    'Authorization': 'Bearer ' + bearer_token
+                },
+                'params': {
+                    'appKey': application_key
+                }
             }
-        }
 
-        res = await execute_request(method='get', url=MEDIATION_GROUP_MGMT_URL, **options)
-        if res.error_code != -1:
-            raise Exception('Error getting mediation groups {} Error Code: {}'.format(
-                res.msg, res.error_code))
+            res = await execute_request(method='get', url=MEDIATION_GROUP_MGMT_URL, **options)
+            if res.error_code != -1:
+                raise Exception('Error getting mediation groups {} Error Code: {}'.format(
+                    res.msg, res.error_code))
 
-        return json.loads(res.msg)
+            return json.loads(res.msg)
+
+        return await self._read_catalog('mediationGroups', application_key, _fetch)
 
     async def create_mediation_group(
         self, application_key: str, ad_unit: AdUnits, group_name: str,
@@ -503,13 +525,14 @@ class MonetizeAPI(BaseAPI):
             body['groupPosition'] = group_position
         if group_segment:
             body['groupSegments'] = group_segment
-        if ad_source_priority and ad_source_priority.get_bidders():
-            group_tiers = ad_source_priority.get_tiers()
-            for group_tier in group_tiers:
-                if group_tier.get_tier_type() == TierType.OPTIMIZED:
-                    raise Exception(
-                        'Optimized Tier Type is not allowed with bidding.')
-        body['adSourcePriority'] = ad_source_priority.get_object()
+        if ad_source_priority:
+            if ad_source_priority.get_bidders():
+                group_tiers = ad_source_priority.get_tiers()
+                for group_tier in group_tiers:
+                    if group_tier and group_tier.get_tier_type() == TierType.OPTIMIZED:
+                        raise Exception(
+                            'Optimized Tier Type is not allowed with bidding.')
+            body['adSourcePriority'] = ad_source_priority.get_object()
 
         bearer_token = await self.get_bearer_auth()
 
@@ -521,6 +544,7 @@ class MonetizeAPI(BaseAPI):
         }
 
         res = await execute_request(method='post', url=MEDIATION_GROUP_MGMT_URL, **options)
+        self.invalidate_catalog(application_key, 'mediationGroups')
         if res.error_code != -1:
             raise Exception('Error creating Mediation Group {} Error Code: {}'.format(
                 res.msg, res.error_code))
@@ -558,13 +582,14 @@ class MonetizeAPI(BaseAPI):
         if group_segments:
             body['groupSegments'] = group_segments
 
-        if ad_source_priority and ad_source_priority.get_bidders():
-            group_tiers = ad_source_priority.get_tiers()
-            for group_tier in group_tiers:
-                if group_tier.get_tier_type() == TierType.OPTIMIZED:
-                    raise Exception(
-                        'Optimized Tier Type is not allowed with bidding.')
-        body['adSourcePriority'] = ad_source_priority.get_object()
+        if ad_source_priority:
+            if ad_source_priority.get_bidders():
+                group_tiers = ad_source_priority.get_tiers()
+                for group_tier in group_tiers:
+                    if group_tier and group_tier.get_tier_type() == TierType.OPTIMIZED:
+                        raise Exception(
+                            'Optimized Tier Type is not allowed with bidding.')
+            body['adSourcePriority'] = ad_source_priority.get_object()
 
         bearer_token = await self.get_bearer_auth()
 
@@ -576,6 +601,7 @@ class MonetizeAPI(BaseAPI):
         }
 
         res = await execute_request(method='put', url=MEDIATION_GROUP_MGMT_URL, **options)
+        self.invalidate_catalog(application_key, 'mediationGroups')
         if res.error_code != -1:
             raise Exception(
                 'Error updating Mediation Group id: {}, error: {} Error Code: {}'.format(group_id, res.msg,
@@ -606,6 +632,7 @@ class MonetizeAPI(BaseAPI):
         }
 
         res = await execute_request(method='delete', url=MEDIATION_GROUP_MGMT_URL, **options)
+        self.invalidate_catalog(application_key, 'mediationGroups')
         if res.error_code != -1:
             raise Exception('Error deleting Mediation Group id: {}, error: {} Error code: {}'.format(group_id, res.msg,
                                                                                                      res.error_code))
@@ -623,20 +650,23 @@ class MonetizeAPI(BaseAPI):
         :return: json list of placements from the application
         :rtype: dict
         """
-        bearer_token = await self.get_bearer_auth()
-        options = {
-            'headers': {
-                'Authorization': 'Bearer ' + bearer_token
-            },
-            'params': {
-                'appKey': application_key
+        async def _fetch():
+            bearer_token = await self.get_bearer_auth()
+            options = {
+                'headers': {
+                    'Authorization': 'Bearer ' + bearer_token
+                },
+                'params': {
+                    'appKey': application_key
+                }
             }
-        }
-        response = await execute_request('get', url=PLACEMENTS_URL, **options)
-        if response.error_code != -1:
-            raise Exception('Error getting placements Error: {}, Error code:{}'.format(
-                response.msg, response.error_code))
-        return json.loads(response.msg)
+            response = await execute_request('get', url=PLACEMENTS_URL, **options)
+            if response.error_code != -1:
+                raise Exception('Error getting placements Error: {}, Error code:{}'.format(
+                    response.msg, response.error_code))
+            return json.loads(response.msg)
+
+        return await self._read_catalog('placements', application_key, _fetch)
 
     async def add_placements(self, application_key: str, placements: Iterable[Placement]) -> dict:
         """
@@ -664,7 +694,7 @@ class MonetizeAPI(BaseAPI):
         if len(placements) > 0:
             for placement in placements:
                 if placement.get_name():
-                    body['placements'].append(placement.get_object())
+                    body['placements'].append(placement.get_payload())
                 else:
                     raise ValueError('New placements must have a name.')
         else:
@@ -674,6 +704,7 @@ class MonetizeAPI(BaseAPI):
         options['json'] = body
 
         res = await execute_request(method='post', url=PLACEMENTS_URL, **options)
+        self.invalidate_catalog(application_key, 'placements')
 
         if res.error_code != -1:
             raise Exception('Error creating placement {} Error Code: {}'.format(
@@ -705,6 +736,7 @@ class MonetizeAPI(BaseAPI):
         }
 
         res = await execute_request(method='delete', url=PLACEMENTS_URL, **options)
+        self.invalidate_catalog(application_key, 'placements')
 
         if res.error_code != -1:
             raise Exception('Error deleting placement {} error:{} Error Code: {}'.format(placement_id, res.msg,
@@ -733,7 +765,7 @@ class MonetizeAPI(BaseAPI):
         if len(placements) > 0:
             for placement in placements:
                 if placement.get_placement_id():
-                    body['placements'].append(placement.get_object())
+                    body['placements'].append(placement.get_payload())
                 else:
                     raise ValueError(
                         'Updated placements must have a placement_id.')
@@ -748,6 +780,7 @@ class MonetizeAPI(BaseAPI):
         }
 
         res = await execute_request(method='put', url=PLACEMENTS_URL, **options)
+        self.invalidate_catalog(application_key, 'placements')
 
         if res.error_code != -1:
             raise Exception('Error creating updating placements {} Error Code: {}'.format(
@@ -1,15 +1,19 @@
 """
 Module for creating placements object
 """
+import copy
 import logging
+from typing import Dict, Iterable, Tuple, Union
 
 from . import AdUnits
+from ..cache import PayloadCache
 
 
 class Capping():
     """
     Capping Class
     """
+    __slots__ = ('_enabled', '_limit', '_interval')
     _enabled: bool
     _limit: int
     _interval: str
@@ -60,6 +64,7 @@ class Capping():
 class Pacing():
     """Pacing Class
     """
+    __slots__ = ('_enabled', '_minutes')
     _enabled: bool
     _minutes: float
 
@@ -94,10 +99,12 @@ class Pacing():
                 'pacingMinutes': self._minutes}
 
 
-class Placement():  # pylint: disable=too-many-instance-attributes
+class Placement(PayloadCache):  # pylint: disable=too-many-instance-attributes
     """
-    Placement Object
+    Placement Object, get_payload returns a cached payload that is rebuilt only after the placement was changed.
+    Capping and Pacing objects are treated as immutable, set a new one instead of changing it.
     """
+    __slots__ = ('_ad_unit', '_name', '_placement_id', '_ad_delivery', '_item_name', '_reward_amount', '_capping', '_pacing')
 
     _ad_unit: AdUnits
     _name: str
@@ -264,3 +271,84 @@ class Placement():  # pylint: disable=too-many-instance-attributes
             obj['pacing'] = self._pacing.get_object()
 
         return obj
+
+
+def get_placement_key(placement: Placement) -> Tuple[str, str]:
+    """
+    :param placement: a placement
+    :return: (ad unit, name) that identifies the placement in an app
+    """
+    return placement.get_ad_unit(), placement.get_name()
+
+
+def index_placements(response: Union[dict, list]) -> Dict[Tuple[str, str], dict]:
+    """
+    Indexes a get_placements response by (ad unit, name)
+    :param response: get_placements response, either a list of placements with 'adUnit',
+        a dict with a 'placements' list or ad unit -> list of placements
+    :type response: Union[dict, list]
+    :return: dict of (ad unit, name) -> placement
+    """
+    if isinstance(response, dict):
+        response = response.get('placements', response)
+    if isinstance(response, dict):
+        placements = ((ad_unit, placement) for ad_unit, ad_unit_placements in response.items()
+                      if isinstance(ad_unit_placements, list) for placement in ad_unit_placements)
+    else:
+        placements = ((placement.get('adUnit'), placement) for placement in response)
+    return {(ad_unit, placement.get('name')): placement for ad_unit, placement in placements}
+
+
+def _is_placement_changed(current: dict, desired: Placement) -> bool:
+    """returns True if any field that is set on desired, including the capping and pacing fields, differs from current"""
+    for key, value in desired.get_payload().items():
+        if key == 'id':
+            continue
+        current_value = current.get(key)
+        if isinstance(value, dict):
+            if not isinstance(current_value, dict) or any(current_value.get(field) != field_value
+                                                          for field, field_value in value.items()):
+                return True
+        elif current_value != value:
+            return True
+    return False
+
+
+def plan_placement_sync(current: Dict[Tuple[str, str], dict], desired: Iterable[Placement],
+                        prune: bool = False) -> Dict[str, list]:
+    """
+    Computes the changes needed to turn the current placements of an app into the desired placements.
+    Placements are matched by (ad unit, name), only the fields that are set on the desired placement are compared.
+    :param current: placements that exist in the app, see index_placements
+    :type current: Dict[Tuple[str, str], dict]
+    :param desired: placements that should exist in the app
+    :type desired: Iterable[Placement]
+    :param prune: delete current placements that are not desired, defaults to False
+    :type prune: bool, optional
+    :raises ValueError: when a desired placement has no name or is defined more than once
+    :return: dict of 'add' and 'update' placement lists and 'delete' and 'unchanged' lists of current placements,
+        'update' placements are copies of the desired placements with the current placement id
+    """
+    plan = {'add': [], 'update': [], 'delete': [], 'unchanged': []}
+    desired_keys = set()
+    for placement in desired:
+        key = get_placement_key(placement)
+        if not placement.get_name():
+            raise ValueError('Synced placements must have a name.')
+        if key in desired_keys:
+            raise ValueError('placement {} is defined more than once.'.format(key))
+        desired_keys.add(key)
+
+        current_placement = current.get(key)
+        if current_placement is None:
+            plan['add'].append(placement)
+        elif _is_placement_changed(current_placement, placement):
+            update = copy.copy(placement)
+            update._placement_id = current_placement.get('id')  # pylint: disable=protected-access
+            plan['update'].append(update)
+        else:
+            plan['unchanged'].append(current_placement)
+
+    if prune:
+        plan['delete'] = [placement for key, placement in current.items() if key not in desired_keys]
+    return plan
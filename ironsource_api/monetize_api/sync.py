@@ -0,0 +1,302 @@
+"""Bulk provisioning and sync operations of the Monetize API"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Union
+import json
+
+import pydash
+
+from . import AdUnits
+from .instance_config import InstanceConfig, get_instance_key, parse_instances, plan_instance_sync
+from .mediation_group_priority import MediationGroup, index_mediation_groups
+from .placement_config import Placement, index_placements, plan_placement_sync
+from ..utils import UNPROCESSED_STATUS_CODES, ResponseInterface, execute_with_concurrency
+
+
+class MonetizeSyncMixin:
+    """Bulk provisioning and reconciliation of MonetizeAPI apps, built on its single request methods"""
+    _post_instances: Callable[..., Awaitable[ResponseInterface]]
+    get_instances: Callable[..., Awaitable[dict]]
+    add_instances: Callable[..., Awaitable[dict]]
+    update_instances: Callable[..., Awaitable[dict]]
+    delete_instance: Callable[..., Awaitable[dict]]
+    get_mediation_groups: Callable[..., Awaitable[dict]]
+    create_mediation_group: Callable[..., Awaitable[dict]]
+    update_mediation_group: Callable[..., Awaitable[dict]]
+    delete_mediation_group: Callable[..., Awaitable[dict]]
+    get_placements: Callable[..., Awaitable[dict]]
+    add_placements: Callable[..., Awaitable[dict]]
+    update_placements: Callable[..., Awaitable[dict]]
+    delete_placements: Callable[..., Awaitable[str]]
+
+    async def add_instances_bulk(self, instances_by_app: Dict[str, Iterable[InstanceConfig]], batch_size: int = 100,
+                                 concurrency: int = 5, retries: int = 2, retry_delay: float = 1.0) -> dict:
+        """
+        Adds instances to many apps.
+        The instances of every app are sent through add_instances in batches of at most batch_size instances,
+        batches of the same app are sent one after the other and up to concurrency apps are provisioned at the same time.
+        A batch that was rejected with 429 or 503 (UNPROCESSED_STATUS_CODES) is retried up to retries times with
+        exponential backoff. Other failures, including timeouts and connection errors, are not retried since the API
+        may have already added the instances.
+        :param instances_by_app: dict of application key and list of InstanceConfigs to add to it
+        :type instances_by_app: Dict[str, Iterable[InstanceConfig]]
+        :param batch_size: maximum number of instances in a single request - default 100
+        :type batch_size: int
+        :param concurrency: maximum number of apps provisioned at the same time - default 5
+        :type concurrency: int
+        :param retries: number of retries of a rejected batch - default 2
+        :type retries: int
+        :param retry_delay: seconds to wait before the first retry, doubled on every retry - default 1.0
+        :type retry_delay: float
+        :return: report per application key
+        {"appKey": {"status": "success", "added": 4, "failed": 0, "batches": 1, "attempts": 2, "errors": [], "instances": {...}}}
+        status is one of "success", "partial" or "failed", instances is the response of the last successful batch
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be greater than 0, not {}.'.format(batch_size))
+        if retries < 0:
+            raise ValueError('retries must be 0 or greater, not {}.'.format(retries))
+
+        async def _add_batch(application_key, batch, report):
+            for attempt in range(retries + 1):
+                if attempt:
+                    await asyncio.sleep(retry_delay * 2 ** (attempt - 1))
+                report['attempts'] += 1
+                try:
+                    res = await self._post_instances(application_key, batch)
+                    if res.error_code == -1:
+                        report['instances'] = json.loads(res.msg)
+                        return None
+                except Exception as exception:
+                    return str(exception)
+                error = 'Error creating adding instances {} Error Code: {}'.format(res.msg, res.error_code)
+                if res.error_code not in UNPROCESSED_STATUS_CODES:
+                    return error
+            return error
+
+        async def _provision_app(job):
+            application_key, instances = job
+            report = {'status': 'success', 'added': 0, 'failed': 0, 'batches': 0, 'attempts': 0, 'errors': [], 'instances': None}
+            for batch in pydash.chunk(list(instances), batch_size):
+                report['batches'] += 1
+                error = await _add_batch(application_key, batch, report)
+                if error is None:
+                    report['added'] += len(batch)
+                else:
+                    report['failed'] += len(batch)
+                    report['errors'].append(error)
+
+            if report['failed']:
+                report['status'] = 'partial' if report['added'] else 'failed'
+            return application_key, report
+
+        results = await execute_with_concurrency(instances_by_app.items(), _provision_app, concurrency)
+        return dict(results)
+
+    async def sync_instances(self, application_key: str, instances: Iterable[InstanceConfig], prune: bool = False,
+                             dry_run: bool = False, batch_size: int = 100, concurrency: int = 5) -> dict:
+        """
+        Reconciles the instances of an app with a desired list of instances.
+        The current instances are fetched with get_instances and matched with the desired instances by
+        (network, ad unit, instance name). Missing instances are added and changed instances are updated in
+        batches of at most batch_size instances, instances that are not desired are deleted concurrently when prune is set.
+        :param application_key: Application key to sync instances for
+        :type application_key: str
+        :param instances: desired instances of the app
+        :type instances: Iterable[InstanceConfig]
+        :param prune: delete instances that are not in instances, defaults to False
+        :type prune: bool, optional
+        :param dry_run: only compute the plan without changing anything, defaults to False
+        :type dry_run: bool, optional
+        :param batch_size: maximum number of instances in a single add or update request - default 100
+        :type batch_size: int
+        :param concurrency: maximum number of delete requests in flight - default 5
+        :type concurrency: int
+        :return: the plan and the result of executing it
+        {"dryRun": false,
+         "add": [{"network": "Vungle", "adUnit": "rewardedVideo", "instanceName": "TEST", "instanceId": -1}],
+         "update": [...], "delete": [...], "unchanged": 12, "requests": 2, "errors": []}
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be greater than 0, not {}.'.format(batch_size))
+
+        current = parse_instances(await self.get_instances(application_key))
+        plan = plan_instance_sync(current, instances, prune)
+
+        def _describe(instance: InstanceConfig) -> dict:
+            network, ad_unit, instance_name = get_instance_key(instance)
+            return {'network': network, 'adUnit': ad_unit, 'instanceName': instance_name, 'instanceId': instance.get_instance_id()}
+
+        result = {'dryRun': dry_run, 'add': [_describe(instance) for instance in plan['add']],
+                  'update': [_describe(instance) for instance in plan['update']],
+                  'delete': [_describe(instance) for instance in plan['delete']],
+                  'unchanged': len(plan['unchanged']), 'requests': 0, 'errors': []}
+        if dry_run:
+            return result
+
+        for action, send in (('add', self.add_instances), ('update', self.update_instances)):
+            for batch in pydash.chunk(plan[action], batch_size):
+                result['requests'] += 1
+                try:
+                    await send(application_key, batch)
+                except Exception as exception:
+                    result['errors'].append({'action': action, 'instances': [_describe(instance) for instance in batch],
+                                             'error': str(exception)})
+
+        async def _delete(instance: InstanceConfig):
+            try:
+                await self.delete_instance(application_key, instance.get_instance_id())
+                return None
+            except Exception as exception:
+                return {'action': 'delete', 'instances': [_describe(instance)], 'error': str(exception)}
+
+        result['requests'] += len(plan['delete'])
+        result['errors'].extend(error for error in await execute_with_concurrency(plan['delete'], _delete, concurrency) if error)
+        return result
+
+    async def sync_mediation_groups(self, groups_by_app: Dict[str, Iterable[MediationGroup]], prune: bool = False,
+                                    dry_run: bool = False, concurrency: int = 5) -> dict:
+        """
+        Reconciles the mediation groups of many apps with desired groups.
+        The current groups of every app are fetched with get_mediation_groups and matched with the desired groups
+        by (ad unit, group name). Changed groups are updated, missing groups are created in the given order and
+        groups that are not desired are deleted when prune is set.
+        The changes of an app are applied one after the other since group positions depend on the order,
+        up to concurrency apps are synced at the same time.
+        :param groups_by_app: dict of application key and its desired mediation groups
+        :type groups_by_app: Dict[str, Iterable[MediationGroup]]
+        :param prune: delete groups that are not desired, defaults to False
+        :type prune: bool, optional
+        :param dry_run: only compute the changes without applying them, defaults to False
+        :type dry_run: bool, optional
+        :param concurrency: maximum number of apps synced at the same time - default 5
+        :type concurrency: int
+        :return: report per application key
+        {"appKey": {"create": [{"adUnit": "rewardedVideo", "groupName": "US"}], "update": [...], "delete": [...],
+                    "unchanged": 2, "errors": [{"action": "create", "adUnit": "rewardedVideo", "groupName": "US", "error": "..."}]}}
+        """
+        async def _sync_app(job):
+            application_key, groups = job
+            report = {'create': [], 'update': [], 'delete': [], 'unchanged': 0, 'errors': []}
+            try:
+                current = index_mediation_groups(await self.get_mediation_groups(application_key))
+            except Exception as exception:
+                report['errors'].append({'action': 'fetch', 'error': str(exception)})
+                return application_key, report
+
+            changes = []
+            desired_keys = set()
+            group: MediationGroup
+            for group in groups:
+                key = group.get_key()
+                desired_keys.add(key)
+                current_group = current.get(key)
+                if current_group is None:
+                    changes.append(('create', key, group, None))
+                elif group.is_changed(current_group):
+                    changes.append(('update', key, group, current_group.get('groupId')))
+                else:
+                    report['unchanged'] += 1
+            changes.sort(key=lambda change: change[0] != 'update')
+            if prune:
+                changes.extend(('delete', key, None, current_group.get('groupId'))
+                               for key, current_group in current.items() if key not in desired_keys)
+
+            for action, (ad_unit, group_name), group, group_id in changes:
+                report[action].append({'adUnit': ad_unit, 'groupName': group_name})
+                if dry_run:
+                    continue
+                try:
+                    if action == 'create':
+                        await self.create_mediation_group(application_key, group.get_ad_unit(), group_name,
+                                                          group.get_group_countries(), group.get_group_position(),
+                                                          group.get_group_segment(), group.get_ad_source_priority())
+                    elif action == 'update':
+                        await self.update_mediation_group(application_key, group_id, group_countries=group.get_group_countries(),
+                                                          group_segments=group.get_group_segment(),
+                                                          ad_source_priority=group.get_ad_source_priority())
+                    else:
+                        await self.delete_mediation_group(application_key, group_id)
+                except Exception as exception:
+                    report['errors'].append({'action': action, 'adUnit': ad_unit, 'groupName': group_name, 'error': str(exception)})
+            return application_key, report
+
+        return dict(await execute_with_concurrency(groups_by_app.items(), _sync_app, concurrency))
+
+    async def sync_placements(self, placements_by_app: Dict[str, Iterable[Placement]], prune: bool = False,
+                              dry_run: bool = False, batch_size: int = 100, concurrency: int = 5) -> dict:
+        """
+        Reconciles the placements of many apps with desired placements.
+        The current placements of every app are fetched with get_placements and matched with the desired placements
+        by (ad unit, name), capping and pacing included. Missing placements are added and changed placements are updated
+        in batches of at most batch_size placements, placements that are not desired are deleted concurrently when prune is set.
+        Apps are synced concurrently and all of their requests share a single limit of concurrency requests in flight.
+        :param placements_by_app: dict of application key and its desired placements, every placement must have a name
+        :type placements_by_app: Dict[str, Iterable[Placement]]
+        :param prune: delete placements that are not desired, defaults to False
+        :type prune: bool, optional
+        :param dry_run: only compute the changes without applying them, defaults to False
+        :type dry_run: bool, optional
+        :param batch_size: maximum number of placements in a single add or update request - default 100
+        :type batch_size: int
+        :param concurrency: maximum number of requests in flight across all apps - default 5
+        :type concurrency: int
+        :return: report per application key
+        {"appKey": {"add": [{"adUnit": "rewardedVideo", "name": "Main_Menu", "placementId": None}], "update": [...],
+                    "delete": [...], "unchanged": 2, "requests": 2,
+                    "errors": [{"action": "add", "placements": [...], "error": "..."}]}}
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be greater than 0, not {}.'.format(batch_size))
+
+        limiter = asyncio.Semaphore(concurrency)
+
+        async def _limited(call, *args):
+            async with limiter:
+                return await call(*args)
+
+        def _describe(placement: Union[Placement, dict]) -> dict:
+            if isinstance(placement, Placement):
+                return {'adUnit': placement.get_ad_unit(), 'name': placement.get_name(), 'placementId': placement.get_placement_id()}
+            return {'adUnit': placement.get('adUnit'), 'name': placement.get('name'), 'placementId': placement.get('id')}
+
+        async def _sync_app(job):
+            application_key, placements = job
+            report = {'add': [], 'update': [], 'delete': [], 'unchanged': 0, 'requests': 0, 'errors': []}
+            try:
+                current = index_placements(await _limited(self.get_placements, application_key))
+            except Exception as exception:
+                report['errors'].append({'action': 'fetch', 'error': str(exception)})
+                return application_key, report
+            try:
+                plan = plan_placement_sync(current, placements, prune)
+            except ValueError as exception:
+                report['errors'].append({'action': 'plan', 'error': str(exception)})
+                return application_key, report
+
+            for action in ('add', 'update', 'delete'):
+                report[action] = [_describe(placement) for placement in plan[action]]
+            report['unchanged'] = len(plan['unchanged'])
+            if dry_run:
+                return application_key, report
+
+            for action, send in (('add', self.add_placements), ('update', self.update_placements)):
+                for batch in pydash.chunk(plan[action], batch_size):
+                    report['requests'] += 1
+                    try:
+                        await _limited(send, application_key, batch)
+                    except Exception as exception:
+                        report['errors'].append({'action': action, 'placements': [_describe(placement) for placement in batch],
+                                                 'error': str(exception)})
+
+            async def _delete(placement: dict):
+                try:
+                    await _limited(self.delete_placements, application_key, AdUnits(placement.get('adUnit')), placement.get('id'))
+                    return None
+                except Exception as exception:
+                    return {'action': 'delete', 'placements': [_describe(placement)], 'error': str(exception)}
+
+            report['requests'] += len(plan['delete'])
+            report['errors'].extend(error for error in await execute_with_concurrency(plan['delete'], _delete, concurrency) if error)
+            return application_key, report
+
+        return dict(await execute_with_concurrency(placements_by_app.items(), _sync_app, concurrency))
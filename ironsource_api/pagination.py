@@ -0,0 +1,100 @@
+"""
+Paginated requests that are sent from threads and written to a pipe
+"""
+import json
+import os
+import time
+from urllib import parse
+
+import httpx
+
+from ironsource_api import __version__
+from .utils import get_concurrency_controller, get_rate_limiter
+
+
+def _send_blocking_request(client: httpx.Client, url: str, options: dict) -> httpx.Response:
+    """sends a single get request from a thread within the rate limit and the adaptive concurrency limit of its url"""
+    time.sleep(get_rate_limiter().reserve(url))
+    controller = get_concurrency_controller()
+    if not controller.is_enabled():
+        return client.request(method='get', url=url, **options)
+
+    started = controller.acquire_blocking(url)
+    res = exception = None
+    try:
+        res = client.request(method='get', url=url, **options)
+        return res
+    except Exception as error:
+        exception = error
+        raise
+    finally:
+        controller.release_blocking(url, started, res, exception)
+
+
+# pylint: disable= too-many-branches
+def execute_request_with_pagination(url: str, pipe_w: int, data_key: str, err_string: str, options: dict, as_bytes=False):
+    """
+    execute requests that it's response could have pagination and write the response to a pipe stream
+    if response is of json format `data_key` will be used to extract the data out of the json.
+    :param url: The url to execute request to
+    :param pipe_w: fd where the pipe exists
+    :param data_key: json key where the data should be extracted from
+    :param err_string: In case of exception use this string as well
+    :param options: http headers and query params
+    :return:
+    """
+    client = httpx.Client(timeout=60.0)
+    next_page: str = ''
+    try:
+        client.headers['user-agent'] = f"{client.headers['user-agent']} IronSource - Python API Library {__version__}"
+        res = _send_blocking_request(client, url, options)
+
+        if res.status_code >= 400:
+            raise Exception('{}: Error Code: {} Error: {}'.format(
+                err_string, res.status_code, res.text))
+        if 'format' not in options['params'] or options['params']['format'] == 'json':
+            if not res.text:
+                os.close(pipe_w)
+                return
+
+            res_json = json.loads(res.text)
+            data_to_write =  (json.dumps(res_json[data_key])+"\n").encode('utf-8')
+            data_to_write = bytes(data_to_write,'utf-8') if as_bytes is True else data_to_write
+            os.write(pipe_w, data_to_write)
+            if 'paging' in res_json and 'next' in res_json['paging']:
+                next_page = res_json['paging']['next']
+            else:
+                os.close(pipe_w)
+                return
+
+        elif options['params']['format'] == 'csv':
+            if res.status_code == 204 and not res.text:
+                os.close(pipe_w)
+                return
+            data_to_write = bytes(
+                res.text,'utf-8') if as_bytes is True else res.text.encode('utf-8')
+            os.write(pipe_w, data_to_write)
+
+            if 'link' in res.headers:
+                next_page = res.headers['link'].replace(
+                    '<', '').replace('>; rel="next"', '')
+            else:
+                os.close(pipe_w)
+                return
+
+        if next_page:
+            split_url = parse.urlsplit(next_page)
+            new_params = dict(parse.parse_qsl(split_url.query))
+            options['params'] = new_params
+            url = split_url.scheme + '://' + split_url.netloc + split_url.path
+            execute_request_with_pagination(
+                url, pipe_w, data_key, err_string, options, as_bytes)
+
+    except Exception as exception:
+        raise Exception('{}: {}'.format(
+            err_string, str(exception))) from exception
+    finally:
+        try:
+            os.close(pipe_w)
+        except OSError:
+            pass
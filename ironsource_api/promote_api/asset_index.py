@@ -0,0 +1,146 @@
+"""Module for content addressed index of uploaded assets"""
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, Optional, Set
+
+
+class AssetHashIndex:
+    """Local index of uploaded assets by content: (title id, SHA-256 of the file bytes) -> asset id.
+    Used by PromoteAPI.create_assets to skip uploading a file that was already uploaded for the title.
+    Changes are written to index_path right away, or once on exit of defer_save (used by create_assets_bulk).
+
+    :param index_path: JSON file to persist the index in, defaults to None (in memory only)
+    :type index_path: str, optional
+    """
+    _index_path: Optional[str]
+    _hashes: Dict[str, Dict[str, int]]
+    _title_assets: Dict[str, Set[int]]
+    _title_locks: Dict[str, asyncio.Lock]
+    _deferred: int
+    _dirty: bool
+
+    def __init__(self, index_path: str = None):
+        self._index_path = index_path
+        self._hashes = {}
+        self._title_assets = {}
+        self._title_locks = {}
+        self._deferred = 0
+        self._dirty = False
+        if index_path and os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as index_file:
+                self._hashes = json.load(index_file)
+
+    @staticmethod
+    def hash_file(file_path: str, chunk_size: int = 1048576) -> str:
+        """
+        Calculates SHA-256 of a file without reading it fully into memory
+        :param file_path: path to the file
+        :type file_path: str
+        :param chunk_size: read size in bytes, defaults to 1MB
+        :type chunk_size: int, optional
+        :return: hex digest of the file content
+        """
+        file_hash = hashlib.sha256()
+        with open(file_path, 'rb') as hashed_file:
+            for chunk in iter(lambda: hashed_file.read(chunk_size), b''):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def get(self, title_id: int, file_hash: str) -> Optional[int]:
+        """
+        :param title_id: title id of the asset
+        :param file_hash: SHA-256 hex digest of the asset file
+        :return: the asset id that was uploaded with that content or None
+        """
+        return self._hashes.get(str(title_id), {}).get(file_hash)
+
+    def add(self, title_id: int, file_hash: str, asset_id: int):
+        """
+        Adds an uploaded asset to the index
+        :param title_id: title id of the asset
+        :param file_hash: SHA-256 hex digest of the asset file
+        :param asset_id: id of the uploaded asset
+        """
+        self._hashes.setdefault(str(title_id), {})[file_hash] = asset_id
+        if str(title_id) in self._title_assets:
+            self._title_assets[str(title_id)].add(asset_id)
+        self._changed()
+
+    def remove(self, title_id: int, file_hash: str):
+        """
+        Removes an asset from the index
+        :param title_id: title id of the asset
+        :param file_hash: SHA-256 hex digest of the asset file
+        """
+        if self._hashes.get(str(title_id), {}).pop(file_hash, None) is not None:
+            self._changed()
+
+    def is_title_loaded(self, title_id: int) -> bool:
+        """
+        :param title_id: title id
+        :return: True if the existing assets of the title were already loaded with set_title_assets
+        """
+        return str(title_id) in self._title_assets
+
+    def set_title_assets(self, title_id: int, asset_ids: Iterable[int]):
+        """
+        Sets the asset ids that currently exist for a title (from PromoteAPI.get_assets)
+        :param title_id: title id
+        :param asset_ids: ids of the existing assets of the title
+        """
+        self._title_assets[str(title_id)] = set(asset_ids)
+
+    async def load_title_assets(self, title_id: int, loader: Callable[[], Awaitable[Iterable[int]]]):
+        """
+        Loads the existing asset ids of a title once, concurrent callers for the same title wait for the same load
+        :param title_id: title id
+        :param loader: coroutine function returning the ids of the existing assets of the title
+        """
+        lock = self._title_locks.setdefault(str(title_id), asyncio.Lock())
+        async with lock:
+            if not self.is_title_loaded(title_id):
+                self.set_title_assets(title_id, await loader())
+
+    def has_asset(self, title_id: int, asset_id: int) -> bool:
+        """
+        :param title_id: title id
+        :param asset_id: asset id
+        :return: True if the asset is known to exist for the title
+        """
+        return asset_id in self._title_assets.get(str(title_id), set())
+
+    @contextlib.contextmanager
+    def defer_save(self) -> Iterator['AssetHashIndex']:
+        """
+        Context manager that holds the writes of add and remove and saves the index once on exit
+        """
+        self._deferred += 1
+        try:
+            yield self
+        finally:
+            self._deferred -= 1
+            if not self._deferred:
+                self.flush()
+
+    def flush(self):
+        """Writes the index to index_path if it changed since the last save"""
+        if self._dirty:
+            self.save()
+
+    def _changed(self):
+        self._dirty = True
+        if not self._deferred:
+            self.save()
+
+    def save(self):
+        """Writes the index to index_path, if set"""
+        self._dirty = False
+        if not self._index_path:
+            return
+        tmp_path = self._index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as index_file:
+            json.dump(self._hashes, index_file)
+        os.replace(tmp_path, self._index_path)
@@ -0,0 +1,228 @@
+"""Module for local validation of asset files before upload (see PromoteAPI.create_assets)"""
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterable, List, Optional, Tuple
+
+IMAGE_FORMATS = ('png', 'jpeg', 'gif')
+VIDEO_FORMATS = ('mp4',)
+# asset types whose files are checked, other types (e.g. html, html_iec) are not validated locally
+VALIDATED_ASSET_TYPES = ('image', 'video')
+
+IMAGE_MAX_BYTES = 2 * 1024 * 1024
+IMAGE_MIN_DIMENSION = 320
+IMAGE_MAX_DIMENSION = 3840
+VIDEO_MAX_BYTES = 100 * 1024 * 1024
+VIDEO_MAX_DURATION_MS = 60000
+MIN_RATIO = 0.5
+MAX_RATIO = 2.0
+
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+_MP4_CONTAINER_BOXES = (b'moov', b'trak')
+
+
+def read_asset_info(file_path: str) -> dict:
+    """
+    Reads format, dimensions and duration of an asset file from its headers only.
+    Supports PNG, JPEG and GIF images and MP4 videos (from the `moov` box metadata).
+    :param file_path: path to the asset file
+    :type file_path: str
+    :return: dict with 'format', 'width', 'height' and 'durationMs' (None when unknown)
+    """
+    info = {'format': None, 'width': None, 'height': None, 'durationMs': None}
+    with open(file_path, 'rb') as asset_file:
+        header = asset_file.read(32)
+        if header.startswith(b'\x89PNG\r\n\x1a\n') and header[12:16] == b'IHDR':
+            info['format'] = 'png'
+            info['width'], info['height'] = struct.unpack('>II', header[16:24])
+        elif header[:6] in (b'GIF87a', b'GIF89a'):
+            info['format'] = 'gif'
+            info['width'], info['height'] = struct.unpack('<HH', header[6:10])
+        elif header.startswith(b'\xff\xd8'):
+            info['format'] = 'jpeg'
+            asset_file.seek(2)
+            dimensions = _read_jpeg_dimensions(asset_file)
+            if dimensions:
+                info['width'], info['height'] = dimensions
+        elif header[4:8] == b'ftyp':
+            info['format'] = 'mp4'
+            asset_file.seek(0)
+            info.update(_read_mp4_metadata(asset_file, os.fstat(asset_file.fileno()).st_size))
+    return info
+
+
+def validate_asset(file_path: str, asset_type: str = None) -> dict:
+    """
+    Validates an asset file against the create_assets requirements without uploading it
+    :param file_path: path to the asset file
+    :type file_path: str
+    :param asset_type: expected asset type 'image' or 'video', defaults to None (detected from the file).
+        Files of other asset types (see VALIDATED_ASSET_TYPES) are not checked and have no errors
+    :type asset_type: str, optional
+    :return: asset info with list of 'errors', empty when the file is valid
+
+        Example ::
+        `{
+            "filePath": "./video.mp4",
+            "type": "video",
+            "format": "mp4",
+            "bytes": 1048576,
+            "width": 1920,
+            "height": 1080,
+            "durationMs": 75000,
+            "errors": ["duration 75000ms is longer than 60000ms"]
+        }`
+    """
+    result = {'filePath': file_path, 'type': asset_type, 'format': None, 'bytes': None,
+              'width': None, 'height': None, 'durationMs': None, 'errors': []}
+    if asset_type and asset_type not in VALIDATED_ASSET_TYPES:
+        return result
+    try:
+        result['bytes'] = os.path.getsize(file_path)
+        result.update(read_asset_info(file_path))
+    except (OSError, struct.error) as exception:
+        result['errors'].append('could not read file: {}'.format(exception))
+        return result
+
+    detected_type = 'image' if result['format'] in IMAGE_FORMATS else 'video' if result['format'] in VIDEO_FORMATS else None
+    if not detected_type:
+        result['errors'].append('unsupported file format, must be one of {}'.format(list(IMAGE_FORMATS + VIDEO_FORMATS)))
+        return result
+    if asset_type and asset_type != detected_type:
+        result['errors'].append('file format {} does not match asset type {}'.format(result['format'], asset_type))
+    result['type'] = detected_type
+
+    max_bytes = IMAGE_MAX_BYTES if detected_type == 'image' else VIDEO_MAX_BYTES
+    if result['bytes'] > max_bytes:
+        result['errors'].append('file size {} bytes is larger than {} bytes'.format(result['bytes'], max_bytes))
+
+    width, height = result['width'], result['height']
+    if not width or not height:
+        result['errors'].append('could not read dimensions')
+    else:
+        if detected_type == 'image' and not (IMAGE_MIN_DIMENSION <= min(width, height) and max(width, height) <= IMAGE_MAX_DIMENSION):
+            result['errors'].append('dimensions {}x{} must be between {}px and {}px'.format(
+                width, height, IMAGE_MIN_DIMENSION, IMAGE_MAX_DIMENSION))
+        if not MIN_RATIO <= width / height <= MAX_RATIO:
+            result['errors'].append('ratio {}x{} must be between 1:2 and 2:1'.format(width, height))
+
+    if detected_type == 'video':
+        if result['durationMs'] is None:
+            result['errors'].append('could not read duration')
+        elif result['durationMs'] > VIDEO_MAX_DURATION_MS:
+            result['errors'].append('duration {}ms is longer than {}ms'.format(result['durationMs'], VIDEO_MAX_DURATION_MS))
+
+    return result
+
+
+def validate_assets(file_paths: Iterable[str], asset_type: str = None, max_workers: int = None) -> List[dict]:
+    """
+    Validates asset files in parallel, see validate_asset
+    :param file_paths: paths of the asset files
+    :type file_paths: Iterable[str]
+    :param asset_type: expected asset type 'image' or 'video', defaults to None (detected from each file)
+    :type asset_type: str, optional
+    :param max_workers: number of worker threads, defaults to None (ThreadPoolExecutor default)
+    :type max_workers: int, optional
+    :return: validation results in the order of file_paths
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda file_path: validate_asset(file_path, asset_type), file_paths))
+
+
+def validate_asset_directory(directory: str, recursive: bool = False, max_workers: int = None) -> List[dict]:
+    """
+    Validates all the files in a directory in parallel, see validate_asset
+    :param directory: directory of the asset files
+    :type directory: str
+    :param recursive: include files in sub directories, defaults to False
+    :type recursive: bool, optional
+    :param max_workers: number of worker threads, defaults to None (ThreadPoolExecutor default)
+    :type max_workers: int, optional
+    :return: validation results sorted by file path
+    """
+    if recursive:
+        file_paths = [os.path.join(root, file_name) for root, _, file_names in os.walk(directory) for file_name in file_names]
+    else:
+        file_paths = [entry.path for entry in os.scandir(directory) if entry.is_file()]
+    return validate_assets(sorted(file_paths), max_workers=max_workers)
+
+
+def _read_jpeg_dimensions(asset_file: BinaryIO) -> Optional[Tuple[int, int]]:
+    """scans jpeg markers until the start of frame marker and returns (width, height)"""
+    while True:
+        byte = asset_file.read(1)
+        while byte and byte != b'\xff':
+            byte = asset_file.read(1)
+        while byte == b'\xff':
+            byte = asset_file.read(1)
+        if not byte:
+            return None
+
+        marker = byte[0]
+        if marker in _JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == 0xD9:
+            return None
+        length_bytes = asset_file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in _JPEG_SOF_MARKERS:
+            frame_header = asset_file.read(5)
+            if len(frame_header) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame_header[1:5])
+            return width, height
+        asset_file.seek(length - 2, os.SEEK_CUR)
+
+
+def _iter_mp4_boxes(asset_file: BinaryIO, start: int, end: int):
+    """yields (box type, payload offset, payload size) of the boxes between start and end, seeking over payloads"""
+    offset = start
+    while offset + 8 <= end:
+        asset_file.seek(offset)
+        box_header = asset_file.read(8)
+        if len(box_header) < 8:
+            return
+        box_size, box_type = struct.unpack('>I4s', box_header)
+        header_size = 8
+        if box_size == 1:
+            box_size = struct.unpack('>Q', asset_file.read(8))[0]
+            header_size = 16
+        elif box_size == 0:
+            box_size = end - offset
+        if box_size < header_size:
+            return
+        yield box_type, offset + header_size, box_size - header_size
+        offset += box_size
+
+
+def _read_mp4_metadata(asset_file: BinaryIO, file_size: int) -> dict:
+    """reads duration from `mvhd` and the video track dimensions from `tkhd` inside the `moov` box"""
+    metadata = {}
+
+    def _walk(start, end):
+        for box_type, payload_offset, payload_size in _iter_mp4_boxes(asset_file, start, end):
+            if box_type in _MP4_CONTAINER_BOXES:
+                _walk(payload_offset, payload_offset + payload_size)
+            elif box_type == b'mvhd':
+                asset_file.seek(payload_offset)
+                payload = asset_file.read(min(payload_size, 32))
+                if len(payload) < 20 or (payload[0] == 1 and len(payload) < 32):
+                    continue
+                if payload[0] == 1:
+                    timescale, duration = struct.unpack('>IQ', payload[20:32])
+                else:
+                    timescale, duration = struct.unpack('>II', payload[12:20])
+                if timescale:
+                    metadata['durationMs'] = int(duration * 1000 / timescale)
+            elif box_type == b'tkhd' and not metadata.get('width') and payload_size >= 8:
+                asset_file.seek(payload_offset + payload_size - 8)
+                width, height = struct.unpack('>II', asset_file.read(8))
+                if width and height:
+                    metadata['width'], metadata['height'] = width >> 16, height >> 16
+
+    _walk(0, file_size)
+    return metadata
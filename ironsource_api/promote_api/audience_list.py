@@ -1,6 +1,8 @@
 """Module for Audience List"""
 import enum
-from typing import Iterable, Union
+import time
+from array import array
+from typing import Iterable, Iterator, List, Optional, Union
 
 from ironsource_api.promote_api import Platform
 
@@ -25,6 +27,7 @@ class AudienceListMeta:
         :param platform: platform for the audience list. See Platform., defaults to None
         :type platform: Platform, optional
         """
+    __slots__ = ('_name', '_type', '_description', '_bundle_id', '_platform')
     _name: str
     _type: AudienceListType
     _description: str
@@ -62,18 +65,205 @@ class AudienceListMeta:
         return obj
 
 
+class AudienceListCatalog:
+    """
+    Indexed, cached view of the audience lists of the account (see PromoteAPI.get_audience_catalog)
+
+    :param audience_lists: response of PromoteAPI.get_audience_lists
+    :type audience_lists: dict
+    :param ttl: seconds until the catalog is considered expired, defaults to 300
+    :type ttl: float, optional
+    """
+    _audiences: List[dict]
+    _expires_at: float
+
+    def __init__(self, audience_lists: dict, ttl: float = 300):
+        self._audiences = list(audience_lists.get('audiences', []))
+        self._expires_at = time.monotonic() + ttl
+        self._by_id = {}
+        self._by_name = {}
+        self._by_bundle_id = {}
+        self._by_platform = {}
+        for audience in self._audiences:
+            self._by_id[str(audience.get('id'))] = audience
+            self._by_name.setdefault(audience.get('name'), []).append(audience)
+            if audience.get('bundleId'):
+                self._by_bundle_id.setdefault(audience['bundleId'], []).append(audience)
+            if audience.get('platform'):
+                self._by_platform.setdefault(audience['platform'].lower(), []).append(audience)
+
+    def is_expired(self) -> bool:
+        """
+        :return: True if the catalog is older than its ttl
+        """
+        return time.monotonic() >= self._expires_at
+
+    def get_by_id(self, audience_list_id: Union[int, str]) -> Optional[dict]:
+        """
+        :param audience_list_id: audience list id
+        :return: the audience list or None if it does not exist
+        """
+        return self._by_id.get(str(audience_list_id))
+
+    def get_by_name(self, name: str) -> List[dict]:
+        """
+        :param name: audience list name
+        :return: list of audience lists with that name
+        """
+        return self._by_name.get(name, [])
+
+    def get_by_bundle_id(self, bundle_id: str, platform: Union[Platform, str] = None) -> List[dict]:
+        """
+        :param bundle_id: bundle id of the audience lists
+        :param platform: optional platform filter. See Platform.
+        :return: list of audience lists for the bundle id
+        """
+        audiences = self._by_bundle_id.get(bundle_id, [])
+        if platform:
+            platform_value = platform.value if isinstance(platform, Platform) else platform.lower()
+            audiences = [audience for audience in audiences if audience.get('platform', '').lower() == platform_value]
+        return audiences
+
+    def get_by_platform(self, platform: Union[Platform, str]) -> List[dict]:
+        """
+        :param platform: platform of the audience lists. See Platform.
+        :return: list of audience lists for the platform
+        """
+        platform_value = platform.value if isinstance(platform, Platform) else platform.lower()
+        return self._by_platform.get(platform_value, [])
+
+    def get_id(self, name: str) -> Optional[str]:
+        """
+        :param name: audience list name
+        :return: id of the first audience list with that name or None
+        """
+        audiences = self.get_by_name(name)
+        return str(audiences[0]['id']) if audiences else None
+
+    def __len__(self) -> int:
+        return len(self._audiences)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._audiences)
+
+
+class DeviceIdStore:
+    """
+    Compact, deduplicated set of device ids.
+    UUID formatted ids (IDFA, GAID) are normalized and kept as 16 bytes records in a bytearray
+    with an open addressing hash index, any other id is kept as is.
+    Ids are serialized back to their canonical string form only while iterating.
+
+    :param devices: initial device ids, defaults to None
+    :type devices: Iterable[str], optional
+    :param capacity: expected number of device ids, used to presize the index, defaults to 1024
+    :type capacity: int, optional
+    """
+    _UUID_SIZE = 16
+    _EMPTY_SLOT = -1
+
+    def __init__(self, devices: Iterable[str] = None, capacity: int = 1024):
+        slots = 1024
+        while slots * 2 < capacity * 3:
+            slots *= 2
+        self._records = bytearray()
+        self._slots = array('i', [self._EMPTY_SLOT]) * slots
+        self._records_count = 0
+        self._other_ids = set()
+        if devices:
+            self.update(devices)
+
+    def add(self, device_id: str) -> bool:
+        """
+        Adds a device id to the store
+        :param device_id: device id to add
+        :type device_id: str
+        :return: True if the device id was added, False if it already exists
+        """
+        raw_id = uuid_to_bytes(device_id)
+        if raw_id is None:
+            if device_id in self._other_ids:
+                return False
+            self._other_ids.add(device_id)
+            return True
+
+        slot = self._find_slot(raw_id)
+        if self._slots[slot] != self._EMPTY_SLOT:
+            return False
+
+        self._slots[slot] = self._records_count
+        self._records += raw_id
+        self._records_count += 1
+        if self._records_count * 3 > len(self._slots) * 2:
+            self._grow()
+        return True
+
+    def update(self, devices: Iterable[str]) -> int:
+        """
+        Adds device ids to the store
+        :param devices: device ids to add
+        :type devices: Iterable[str]
+        :return: number of device ids that were added
+        """
+        added = 0
+        for device_id in devices:
+            if self.add(device_id):
+                added += 1
+        return added
+
+    def __contains__(self, device_id: str) -> bool:
+        raw_id = uuid_to_bytes(device_id)
+        if raw_id is None:
+            return device_id in self._other_ids
+        return self._slots[self._find_slot(raw_id)] != self._EMPTY_SLOT
+
+    def __len__(self) -> int:
+        return self._records_count + len(self._other_ids)
+
+    def __iter__(self) -> Iterator[str]:
+        records = self._records
+        for offset in range(0, self._records_count * self._UUID_SIZE, self._UUID_SIZE):
+            yield bytes_to_uuid(records[offset:offset + self._UUID_SIZE])
+        yield from self._other_ids
+
+    def _find_slot(self, raw_id: bytes) -> int:
+        """returns the slot holding raw_id or the empty slot where it should be inserted"""
+        slots = self._slots
+        mask = len(slots) - 1
+        slot = hash(raw_id) & mask
+        while True:
+            record_index = slots[slot]
+            if record_index == self._EMPTY_SLOT:
+                return slot
+            offset = record_index * self._UUID_SIZE
+            if self._records[offset:offset + self._UUID_SIZE] == raw_id:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _grow(self):
+        self._slots = array('i', [self._EMPTY_SLOT]) * (len(self._slots) * 2)
+        for record_index in range(self._records_count):
+            offset = record_index * self._UUID_SIZE
+            slot = self._find_slot(bytes(self._records[offset:offset + self._UUID_SIZE]))
+            self._slots[slot] = record_index
+
+
 class AudienceListData:
     """
     Class representing Audience list data
+
+    :param compact: keep device ids in a deduplicated DeviceIdStore instead of a list, defaults to False
+    :type compact: bool, optional
     """
-    _ids_to_add: Iterable[str] = []
-    _ids_to_remove: Iterable[str] = []
-    _device_list: Iterable[str] = []
+    __slots__ = ('_ids_to_add', '_ids_to_remove', '_device_list')
+    _ids_to_add: List[str]
+    _ids_to_remove: List[str]
+    _device_list: Union[List[str], DeviceIdStore]
 
-    def __init__(self):
+    def __init__(self, compact: bool = False):
         self._ids_to_add = []
         self._ids_to_remove = []
-        self._device_list = []
+        self._device_list = DeviceIdStore() if compact else []
 
     def add_list_for_update(self, audience_list_id: str):
         """Add audience list id to the update list
@@ -99,19 +289,123 @@ class AudienceListData:
         :type devices: Union[str, list]
         :return:
         """
-        if isinstance(devices, str):
+        if isinstance(self._device_list, DeviceIdStore):
+            if isinstance(devices, str):
+                self._device_list.add(devices)
+            else:
+                self._device_list.update(devices)
+        elif isinstance(devices, str):
             self._device_list.append(devices)
         else:
-            self._device_list = self._device_list + devices
+            self._device_list.extend(devices)
 
     def to_object(self):
         """
         Returns dict for REST API
         :return:
         """
-        obj = {'deviceIds': self._device_list}
+        obj = {'deviceIds': list(self._device_list)}
         if self._ids_to_add:
             obj['addAudience'] = self._ids_to_add
         if self._ids_to_remove:
             obj['removeAudience'] = self._ids_to_remove
         return obj
+
+
+def uuid_to_bytes(device_id: str) -> Optional[bytes]:
+    """
+    Converts a UUID formatted device id (IDFA, GAID) to its 16 bytes form
+    :param device_id: device id in string
+    :type device_id: str
+    :return: 16 bytes of the id or None if the id is not UUID formatted
+    """
+    if len(device_id) != 36 or device_id[8] != '-' or device_id[13] != '-' or device_id[18] != '-' or device_id[23] != '-':
+        return None
+    try:
+        raw_id = bytes.fromhex(device_id.replace('-', ''))
+    except ValueError:
+        return None
+    return raw_id if len(raw_id) == 16 else None
+
+
+def bytes_to_uuid(raw_id: Union[bytes, bytearray]) -> str:
+    """
+    Converts 16 bytes device id back to its canonical lower case UUID form
+    :param raw_id: 16 bytes of the id
+    :type raw_id: bytes
+    :return: device id in string
+    """
+    hex_id = raw_id.hex()
+    return '{}-{}-{}-{}-{}'.format(hex_id[:8], hex_id[8:12], hex_id[12:16], hex_id[16:20], hex_id[20:])
+
+
+def normalize_device_id(device_id: str) -> str:
+    """
+    Returns the canonical form of a device id.
+    UUID formatted ids are lower cased, other ids are only stripped of whitespaces
+    :param device_id: device id in string
+    :type device_id: str
+    :return: normalized device id
+    """
+    device_id = device_id.strip()
+    raw_id = uuid_to_bytes(device_id)
+    return bytes_to_uuid(raw_id) if raw_id is not None else device_id
+
+
+def read_device_ids(file_path: str, encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Lazily reads device ids from a file, one id per line. Empty lines are skipped.
+    :param file_path: path to a text file with a device id in each line
+    :type file_path: str
+    :param encoding: file encoding, defaults to utf-8
+    :type encoding: str, optional
+    :return: iterator over the device ids in the file
+    """
+    with open(file_path, 'r', encoding=encoding) as device_file:
+        for line in device_file:
+            device_id = line.strip()
+            if device_id:
+                yield device_id
+
+
+def iter_device_batches(devices: Union[Iterable[str], DeviceIdStore], batch_size: int = 100000, max_batch_bytes: int = None,
+                        deduplicate: bool = True) -> Iterator[List[str]]:
+    """
+    Splits a stream of device ids into batches for update_audience_list
+    :param devices: iterable of device ids or a DeviceIdStore
+    :type devices: Union[Iterable[str], DeviceIdStore]
+    :param batch_size: maximum number of device ids in a batch, defaults to 100000
+    :type batch_size: int, optional
+    :param max_batch_bytes: maximum size of the serialized `deviceIds` list in bytes, defaults to None (no limit)
+    :type max_batch_bytes: int, optional
+    :param deduplicate: normalize device ids and skip the ones that were already seen in the stream, defaults to True.
+                        ignored for DeviceIdStore which is already deduplicated
+    :type deduplicate: bool, optional
+    :return: iterator over lists of device ids
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be greater than 0, not {}.'.format(batch_size))
+
+    if isinstance(devices, DeviceIdStore):
+        deduplicate = False
+
+    seen = DeviceIdStore() if deduplicate else None
+    batch = []
+    batch_bytes = 2
+    for device_id in devices:
+        if seen is not None:
+            device_id = normalize_device_id(device_id)
+            if not seen.add(device_id):
+                continue
+
+        # quotes and separator as the id will appear in the json body
+        device_bytes = len(device_id) + 4
+        if batch and (len(batch) >= batch_size or (max_batch_bytes and batch_bytes + device_bytes > max_batch_bytes)):
+            yield batch
+            batch = []
+            batch_bytes = 2
+        batch.append(device_id)
+        batch_bytes += device_bytes
+
+    if batch:
+        yield batch
@@ -0,0 +1,164 @@
+"""Module for Audience List local snapshots"""
+import os
+import re
+import sqlite3
+import threading
+from typing import Iterable, Iterator, List, Tuple
+
+from .audience_list import normalize_device_id
+
+SNAPSHOT_ADD = 'add'
+SNAPSHOT_REMOVE = 'remove'
+
+
+class AudienceSnapshot:
+    """Local SQLite snapshot of the device ids that were accepted by the API for an audience list.
+
+    The desired device ids are staged in a temporary table, compared with the snapshot by merging
+    both sorted id streams and only the differences are uploaded.
+    The snapshot itself is updated only after a batch was accepted by the API.
+    The methods may be called from any thread (e.g. through run_in_executor), the file is used by one call at a time.
+
+    :param audience_list_id: The audience list id that the snapshot belongs to
+    :type audience_list_id: str
+    :param snapshot_dir: Directory where the snapshot files are kept
+    :type snapshot_dir: str
+    """
+    _audience_list_id: str
+    _path: str
+    _connection: sqlite3.Connection
+    _lock: threading.Lock
+
+    def __init__(self, audience_list_id: str, snapshot_dir: str):
+        self._audience_list_id = str(audience_list_id)
+        file_name = 'audience_{}.sqlite'.format(re.sub(r'[^\w\-]', '_', self._audience_list_id))
+        self._path = os.path.join(snapshot_dir, file_name)
+        os.makedirs(snapshot_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self._path, check_same_thread=False)
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS device_ids (device_id TEXT PRIMARY KEY) WITHOUT ROWID;
+            CREATE TEMP TABLE IF NOT EXISTS desired (device_id TEXT PRIMARY KEY) WITHOUT ROWID;
+            CREATE TEMP TABLE IF NOT EXISTS pending_add (device_id TEXT PRIMARY KEY) WITHOUT ROWID;
+            CREATE TEMP TABLE IF NOT EXISTS pending_remove (device_id TEXT PRIMARY KEY) WITHOUT ROWID;
+        ''')
+
+    def get_audience_list_id(self) -> str:  # pylint: disable=missing-function-docstring
+        return self._audience_list_id
+
+    def get_path(self) -> str:  # pylint: disable=missing-function-docstring
+        return self._path
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM device_ids').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the snapshot file"""
+        with self._lock:
+            self._connection.close()
+
+    def stage(self, devices: Iterable[str]) -> int:
+        """
+        Replaces the staged desired state with the given device ids
+        :param devices: iterable of device ids that should be in the audience list
+        :type devices: Iterable[str]
+        :return: number of unique staged device ids
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute('DELETE FROM desired')
+                self._connection.executemany('INSERT OR IGNORE INTO desired VALUES (?)',
+                                             ((normalize_device_id(device_id),) for device_id in devices))
+            return self._connection.execute('SELECT COUNT(*) FROM desired').fetchone()[0]
+
+    def compute_delta(self) -> Tuple[int, int]:
+        """
+        Computes the device ids to add and to remove by merging the sorted snapshot with the sorted staged ids
+        :return: tuple of number of device ids to add and number of device ids to remove
+        """
+        with self._lock:
+            current = self._connection.execute('SELECT device_id FROM device_ids ORDER BY device_id')
+            desired = self._connection.execute('SELECT device_id FROM desired ORDER BY device_id')
+            with self._connection:
+                self._connection.execute('DELETE FROM pending_add')
+                self._connection.execute('DELETE FROM pending_remove')
+                for action, device_ids in _chunk_delta(_merge_sorted(current, desired), 10000):
+                    table = 'pending_add' if action == SNAPSHOT_ADD else 'pending_remove'
+                    self._connection.executemany('INSERT INTO {} VALUES (?)'.format(table),
+                                                 ((device_id,) for device_id in device_ids))
+
+            return (self._connection.execute('SELECT COUNT(*) FROM pending_add').fetchone()[0],
+                    self._connection.execute('SELECT COUNT(*) FROM pending_remove').fetchone()[0])
+
+    def iter_pending(self, action: str, batch_size: int) -> Iterator[List[str]]:
+        """
+        Returns batches of the pending device ids of the last compute_delta
+        :param action: SNAPSHOT_ADD or SNAPSHOT_REMOVE
+        :type action: str
+        :param batch_size: maximum number of device ids in a batch
+        :type batch_size: int
+        :return: iterator over lists of device ids
+        """
+        if action not in (SNAPSHOT_ADD, SNAPSHOT_REMOVE):
+            raise ValueError('action must be one of {}, not {}.'.format([SNAPSHOT_ADD, SNAPSHOT_REMOVE], action))
+        table = 'pending_add' if action == SNAPSHOT_ADD else 'pending_remove'
+        last_id = ''
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    'SELECT device_id FROM {} WHERE device_id > ? ORDER BY device_id LIMIT ?'.format(table),
+                    (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[0] for row in rows]
+
+    def commit_batch(self, action: str, device_ids: Iterable[str]):
+        """
+        Applies a batch that was accepted by the API to the snapshot
+        :param action: SNAPSHOT_ADD or SNAPSHOT_REMOVE
+        :type action: str
+        :param device_ids: device ids of the accepted batch
+        :type device_ids: Iterable[str]
+        """
+        statement = 'INSERT OR IGNORE INTO device_ids VALUES (?)' if action == SNAPSHOT_ADD \
+            else 'DELETE FROM device_ids WHERE device_id = ?'
+        with self._lock, self._connection:
+            self._connection.executemany(statement, ((device_id,) for device_id in device_ids))
+
+
+def _merge_sorted(current: Iterator[tuple], desired: Iterator[tuple]) -> Iterator[Tuple[str, str]]:
+    """merges two sorted device id cursors and yields the actions needed to turn current into desired"""
+    current_row = next(current, None)
+    desired_row = next(desired, None)
+    while current_row is not None or desired_row is not None:
+        if desired_row is None or (current_row is not None and current_row[0] < desired_row[0]):
+            yield SNAPSHOT_REMOVE, current_row[0]
+            current_row = next(current, None)
+        elif current_row is None or desired_row[0] < current_row[0]:
+            yield SNAPSHOT_ADD, desired_row[0]
+            desired_row = next(desired, None)
+        else:
+            current_row = next(current, None)
+            desired_row = next(desired, None)
+
+
+def _chunk_delta(delta: Iterator[Tuple[str, str]], chunk_size: int) -> Iterator[Tuple[str, List[str]]]:
+    """groups consecutive delta actions into chunks of device ids"""
+    chunk_action = None
+    chunk = []
+    for action, device_id in delta:
+        if chunk and (action != chunk_action or len(chunk) >= chunk_size):
+            yield chunk_action, chunk
+            chunk = []
+        chunk_action = action
+        chunk.append(device_id)
+    if chunk:
+        yield chunk_action, chunk
@@ -0,0 +1,355 @@
+"""Paginated iterators and bulk operations of the Promote API"""
+import asyncio
+import collections
+import contextlib
+import functools
+import itertools
+import math
+import os
+import time
+
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Tuple, Union
+
+import pydash
+
+from ironsource_api.promote_api import CreativeType, Platform
+from .asset_index import AssetHashIndex
+from .audience_list import AudienceListData, iter_device_batches
+from .audience_snapshot import AudienceSnapshot, SNAPSHOT_ADD, SNAPSHOT_REMOVE
+from .creatives import Creative
+from ..utils import execute_with_concurrency, shared_client
+
+
+class PromoteBulkMixin:
+    """Paginated iterators and bulk operations of PromoteAPI, built on its single request methods"""
+    get_titles: Callable[..., Awaitable[dict]]
+    get_assets: Callable[..., Awaitable[dict]]
+    get_creatives: Callable[..., Awaitable[dict]]
+    create_assets: Callable[..., Awaitable[dict]]
+    create_creatives: Callable[..., Awaitable[dict]]
+    update_audience_list: Callable[..., Awaitable[str]]
+
+    async def iter_titles(self, os_sys: Platform = None, search_term: str = None, results_bulk_size: int = 100,
+                          concurrency: int = 4) -> AsyncIterator[dict]:
+        """Iterates over all titles, fetching pages concurrently
+
+        :param os_sys: Filter titles of a specified os, defaults to None.
+        :type os_sys: Platform, optional
+        :param search_term: Filter by the name or partial name of the title, defaults to None
+        :type search_term: str, optional
+        :param results_bulk_size: Number of titles per page, defaults to 100
+        :type results_bulk_size: int, optional
+        :param concurrency: Maximum number of pages fetched at the same time, defaults to 4
+        :type concurrency: int, optional
+        :return: async iterator over the titles in order
+
+            Example ::
+            async for title in promote_api.iter_titles(os_sys=Platform.iOS):
+                print(title['id'], title['name'])
+        """
+        get_page = functools.partial(self.get_titles, os_sys=os_sys, search_term=search_term)
+        async for title in self._iter_pages(get_page, 'titles', results_bulk_size, concurrency):
+            yield title
+
+    async def iter_assets(self, asset_type: str = None, title_id: int = None, ids: Union[int, list] = None,
+                          results_bulk_size: int = 100, concurrency: int = 4) -> AsyncIterator[dict]:
+        """Iterates over all assets, fetching pages concurrently
+
+        :param asset_type: Filter assets of a specified type. (Options: image, video, html, html_iec), defaults to None
+        :type asset_type: str, optional
+        :param title_id: Title Id to filter by, defaults to None
+        :type title_id: int, optional
+        :param ids: Asset id to filter by, defaults to None
+        :type ids: Union[int, list], optional
+        :param results_bulk_size: Number of assets per page, defaults to 100
+        :type results_bulk_size: int, optional
+        :param concurrency: Maximum number of pages fetched at the same time, defaults to 4
+        :type concurrency: int, optional
+        :return: async iterator over the assets in order
+        """
+        get_page = functools.partial(self.get_assets, asset_type=asset_type, title_id=title_id, ids=ids)
+        async for asset in self._iter_pages(get_page, 'assets', results_bulk_size, concurrency):
+            yield asset
+
+    async def iter_creatives(self, creative_type: CreativeType = None, title_id: int = None, results_bulk_size: int = 100,
+                             concurrency: int = 4) -> AsyncIterator[dict]:
+        """Iterates over all creatives, fetching pages concurrently
+
+        :param creative_type: Filter creatives of a specified type, defaults to None
+        :type creative_type: CreativeType, optional
+        :param title_id: Filter creatives of a specific title, defaults to None
+        :type title_id: int, optional
+        :param results_bulk_size: Number of creatives per page, defaults to 100
+        :type results_bulk_size: int, optional
+        :param concurrency: Maximum number of pages fetched at the same time, defaults to 4
+        :type concurrency: int, optional
+        :return: async iterator over the creatives in order
+        """
+        get_page = functools.partial(self.get_creatives, creative_type=creative_type, title_id=title_id)
+        async for creative in self._iter_pages(get_page, 'creatives', results_bulk_size, concurrency):
+            yield creative
+
+    @staticmethod
+    async def _iter_pages(get_page: Callable[..., Awaitable[dict]], data_key: str, results_bulk_size: int,
+                          concurrency: int) -> AsyncIterator[dict]:
+        """
+        yields the items of a paginated API in order.
+        The first page is used to get the requestId and totalResultsCount of the request,
+        the rest of the pages are fetched ahead with at most `concurrency` pages in flight.
+        """
+        if results_bulk_size < 1 or concurrency < 1:
+            raise ValueError('results_bulk_size and concurrency must be greater than 0')
+
+        first_page = await get_page(results_bulk_size=results_bulk_size)
+        for item in first_page.get(data_key, []):
+            yield item
+
+        request_id = first_page.get('requestId')
+        pages_count = math.ceil(first_page.get('totalResultsCount', 0) / results_bulk_size)
+        if not request_id or pages_count <= 1:
+            return
+
+        page_numbers = iter(range(2, pages_count + 1))
+        pending_pages = collections.deque()
+
+        def _schedule_pages():
+            while len(pending_pages) < concurrency:
+                page_number = next(page_numbers, None)
+                if page_number is None:
+                    return
+                pending_pages.append(asyncio.ensure_future(get_page(
+                    request_id=request_id, page_number=page_number, results_bulk_size=results_bulk_size)))
+
+        try:
+            _schedule_pages()
+            while pending_pages:
+                page = await pending_pages.popleft()
+                _schedule_pages()
+                for item in page.get(data_key, []):
+                    yield item
+        finally:
+            for pending_page in pending_pages:
+                pending_page.cancel()
+
+    async def create_assets_bulk(self, uploads: Iterable[Tuple], concurrency: int = 4, timeout: float = 300.0,
+                                 asset_index: AssetHashIndex = None) -> dict:
+        """Upload many assets concurrently
+
+        All uploads share one connection pool, every file is streamed from disk in chunks
+        and closed as soon as its upload is done.
+
+        :param uploads: Iterable of (title_id, asset_type, file_path) or (title_id, asset_type, file_path, file_name) tuples.
+                        See create_assets.
+        :type uploads: Iterable[Tuple]
+        :param concurrency: Maximum number of uploads in flight, defaults to 4
+        :type concurrency: int, optional
+        :param timeout: Timeout in seconds for each upload request, defaults to 300
+        :type timeout: float, optional
+        :param asset_index: Content hash index used to skip duplicate uploads, see create_assets.
+                            The index is saved once after all uploads are done, defaults to None
+        :type asset_index: AssetHashIndex, optional
+        :return: per file results and total throughput
+        :rtype: dict
+
+            Example ::
+            `{
+                "results": [
+                    {"titleId": 1234, "type": "video", "filePath": "./video.mp4", "bytes": 1048576, "seconds": 1.2,
+                     "asset": {...}},
+                    {"titleId": 1234, "type": "image", "filePath": "./image.png", "bytes": 2048, "seconds": 0.1,
+                     "error": "Error creating Assets: ..."}
+                ],
+                "files": 2,
+                "failed": 1,
+                "bytes": 1050624,
+                "seconds": 1.2,
+                "bytesPerSecond": 875520.0
+            }`
+        """
+
+        async def _upload(upload):
+            title_id, asset_type, file_path = upload[:3]
+            file_name = upload[3] if len(upload) > 3 else None
+            result = {'titleId': title_id, 'type': asset_type, 'filePath': file_path, 'bytes': 0}
+            started = time.perf_counter()
+            try:
+                result['bytes'] = os.path.getsize(file_path)
+                result['asset'] = await self.create_assets(title_id, asset_type, file_path, file_name, asset_index)
+                if isinstance(result['asset'], dict) and result['asset'].get('duplicate'):
+                    result['bytes'] = 0
+            except Exception as exception:
+                result['error'] = str(exception)
+            result['seconds'] = time.perf_counter() - started
+            return result
+
+        started = time.perf_counter()
+        with asset_index.defer_save() if asset_index else contextlib.nullcontext():
+            async with shared_client(timeout=timeout):
+                results = await execute_with_concurrency(uploads, _upload, concurrency)
+        elapsed = time.perf_counter() - started
+
+        uploaded_bytes = sum(result['bytes'] for result in results if 'asset' in result)
+        return {
+            'results': results,
+            'files': len(results),
+            'failed': sum(1 for result in results if 'error' in result),
+            'bytes': uploaded_bytes,
+            'seconds': elapsed,
+            'bytesPerSecond': uploaded_bytes / elapsed if elapsed > 0 else 0.0
+        }
+
+    async def create_creatives_bulk(self, creatives_by_title: Dict[int, Iterable[Creative]], chunk_size: int = 50,
+                                    concurrency: int = 4) -> dict:
+        """
+        Creates many creatives for many titles.
+        Creatives are validated locally first, the valid ones are split into requests of at most chunk_size
+        creatives which are sent concurrently through create_creatives.
+        :param creatives_by_title: dict of title id and list of its creatives. Use class Creative.
+        :param chunk_size: maximum number of creatives in a single request - default 50
+        :param concurrency: maximum number of requests in flight - default 4
+        :returns dict: created creative ids per title and per creative failures
+        {"ids": {1234: [1,2,3]},
+         "created": 3,
+         "failures": [{"titleId": 1234, "name": "creative_name", "error": "Creative type ... is missing mandatory assets ..."}]}
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be greater than 0, not {}.'.format(chunk_size))
+
+        summary = {'ids': {}, 'created': 0, 'failures': []}
+        requests = []
+        for title_id, creatives in creatives_by_title.items():
+            valid_creatives = []
+            creative: Creative
+            for creative in creatives:
+                try:
+                    creative.is_validate()
+                    valid_creatives.append(creative)
+                except ValueError as exception:
+                    summary['failures'].append({'titleId': title_id, 'name': creative.get_name(), 'error': str(exception)})
+            requests.extend((title_id, chunk) for chunk in pydash.chunk(valid_creatives, chunk_size))
+
+        async def _create_chunk(request):
+            title_id, chunk = request
+            try:
+                res = await self.create_creatives(title_id=title_id, creatives=chunk)
+                return title_id, chunk, res.get('ids', []), None
+            except Exception as exception:
+                return title_id, chunk, [], str(exception)
+
+        for title_id, chunk, ids, error in await execute_with_concurrency(requests, _create_chunk, concurrency):
+            if error:
+                summary['failures'].extend({'titleId': title_id, 'name': creative.get_name(), 'error': error} for creative in chunk)
+                continue
+            summary['ids'].setdefault(title_id, []).extend(ids)
+            summary['created'] += len(ids)
+
+        return summary
+
+    async def upload_audience_devices(self, devices: Iterable[str], add_audience_ids: Iterable[str] = None,
+                                      remove_audience_ids: Iterable[str] = None, batch_size: int = 100000,
+                                      max_batch_bytes: int = 10485760, concurrency: int = 4,
+                                      progress_callback: Callable[[int, int], None] = None) -> list:
+        """
+        Streams device ids to audience lists in batches.
+        Device ids are read lazily, normalized, deduplicated and split into size limited update_audience_list requests
+        that are sent concurrently.
+        :param devices: iterable of device ids, e.g. read_device_ids('devices.txt'), or a DeviceIdStore
+        :param add_audience_ids: audience list ids to add the devices to
+        :param remove_audience_ids: audience list ids to remove the devices from
+        :param batch_size: maximum number of device ids per request - default 100000
+        :param max_batch_bytes: maximum size of device ids per request in bytes - default 10MB
+        :param concurrency: maximum number of requests in flight - default 4
+        :param progress_callback: called after each batch with the number of uploaded and failed device ids
+        :return: array of all batch requests and result message from the API.
+        response object example
+        ```js
+        {'batch': 0, 'deviceIds': 100000, 'msg': 'OK'}
+        ```
+        failed batches will contain 'error' instead of 'msg'
+        """
+        if not add_audience_ids and not remove_audience_ids:
+            raise ValueError('At least one of add_audience_ids or remove_audience_ids is required')
+
+        progress = {'uploaded': 0, 'failed': 0}
+
+        async def _upload_batch(indexed_batch):
+            batch_index, batch = indexed_batch
+            audience_list_data = AudienceListData()
+            for audience_list_id in add_audience_ids or []:
+                audience_list_data.add_list_for_update(audience_list_id)
+            for audience_list_id in remove_audience_ids or []:
+                audience_list_data.add_list_for_remove(audience_list_id)
+            audience_list_data.add_devices(batch)
+
+            batch_summary = {'batch': batch_index, 'deviceIds': len(batch)}
+            try:
+                batch_summary['msg'] = await self.update_audience_list(audience_list_data)
+                progress['uploaded'] += len(batch)
+            except Exception as exception:
+                batch_summary['error'] = str(exception)
+                progress['failed'] += len(batch)
+
+            if progress_callback:
+                progress_callback(progress['uploaded'], progress['failed'])
+            return batch_summary
+
+        batches = enumerate(iter_device_batches(devices, batch_size, max_batch_bytes))
+        return await execute_with_concurrency(batches, _upload_batch, concurrency)
+
+    async def sync_audience_list(self, audience_list_id: str, devices: Iterable[str], snapshot_dir: str,
+                                 batch_size: int = 100000, concurrency: int = 4,
+                                 progress_callback: Callable[[int, int], None] = None) -> dict:
+        """
+        Syncs an audience list to the given device ids by sending only the delta from the last sync.
+        A local snapshot (see AudienceSnapshot) of the accepted device ids is kept per audience list in snapshot_dir,
+        the snapshot is updated only after the API accepted each batch so failed batches are retried on the next sync.
+        Staging, comparing and updating the snapshot run in the default executor so they do not block the event loop.
+        :param audience_list_id: audience list id to sync
+        :param devices: iterable of all the device ids that should be in the list, e.g. read_device_ids('devices.txt')
+        :param snapshot_dir: directory for the local snapshot files
+        :param batch_size: maximum number of device ids per request - default 100000
+        :param concurrency: maximum number of requests in flight - default 4
+        :param progress_callback: called after each batch with the number of synced and failed device ids
+        :return: summary of the sync and all batch requests.
+        response object example
+        ```js
+        {'audienceListId': '1234', 'devices': 1000, 'added': 10, 'removed': 5,
+         'batches': [{'action': 'add', 'deviceIds': 10, 'msg': 'OK'}, {'action': 'remove', 'deviceIds': 5, 'msg': 'OK'}]}
+        ```
+        failed batches will contain 'error' instead of 'msg'
+        """
+        progress = {'synced': 0, 'failed': 0}
+        loop = asyncio.get_running_loop()
+
+        with AudienceSnapshot(audience_list_id, snapshot_dir) as snapshot:
+            devices_count = await loop.run_in_executor(None, snapshot.stage, devices)
+            to_add, to_remove = await loop.run_in_executor(None, snapshot.compute_delta)
+
+            async def _sync_batch(action_batch):
+                action, batch = action_batch
+                audience_list_data = AudienceListData()
+                if action == SNAPSHOT_ADD:
+                    audience_list_data.add_list_for_update(str(audience_list_id))
+                else:
+                    audience_list_data.add_list_for_remove(str(audience_list_id))
+                audience_list_data.add_devices(batch)
+
+                batch_summary = {'action': action, 'deviceIds': len(batch)}
+                try:
+                    batch_summary['msg'] = await self.update_audience_list(audience_list_data)
+                    await loop.run_in_executor(None, snapshot.commit_batch, action, batch)
+                    progress['synced'] += len(batch)
+                except Exception as exception:
+                    batch_summary['error'] = str(exception)
+                    progress['failed'] += len(batch)
+
+                if progress_callback:
+                    progress_callback(progress['synced'], progress['failed'])
+                return batch_summary
+
+            batches = itertools.chain(((SNAPSHOT_ADD, batch) for batch in snapshot.iter_pending(SNAPSHOT_ADD, batch_size)),
+                                      ((SNAPSHOT_REMOVE, batch) for batch in snapshot.iter_pending(SNAPSHOT_REMOVE, batch_size)))
+            batches_summary = await execute_with_concurrency(batches, _sync_batch, concurrency)
+
+        return {'audienceListId': str(audience_list_id), 'devices': devices_count, 'added': to_add,
+                'removed': to_remove, 'batches': batches_summary}
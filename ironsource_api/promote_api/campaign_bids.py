@@ -1,14 +1,15 @@
 """Module for Campaign Bids"""
 
 
-from typing import Iterable
+from typing import List
 
 
 class CampaignBid:
     """Class representing a bid"""
+    __slots__ = ('_bid', '_country', '_application_id')
     _bid: float
     _country: str
-    _application_id = -1
+    _application_id: int
 
     def __init__(self, bid: float, country: str, application_id: int = -1):
         """Campaign Bid Object that represents a campaign bid
@@ -45,8 +46,9 @@ class CampaignBidsList:
         :param campaign_id: campaign id of the bid
         :type campaign_id: int
     """
+    __slots__ = ('_campaign_id', '_bids')
     _campaign_id: int
-    _bids: Iterable[CampaignBid] = []
+    _bids: List[CampaignBid]
 
     def __init__(self, campaign_id: int):
         self._campaign_id = campaign_id
@@ -1,9 +1,27 @@
 """Module for Creatives"""
 
-from typing import Iterable
+from typing import Iterable, List
 from . import CreativeType, UsageType
 from ..utils import check_instance
 
+# precomputed usage type bitmasks per creative type, the CreativeType values themselves must never be mutated
+_USAGE_TYPE_BITS = {usage_type: 1 << index for index, usage_type in enumerate(UsageType)}
+
+
+def _usage_types_mask(usage_types: Iterable[UsageType]) -> int:
+    mask = 0
+    for usage_type in usage_types:
+        mask |= _USAGE_TYPE_BITS[usage_type]
+    return mask
+
+
+_MANDATORY_MASKS = {
+    creative_type: _usage_types_mask(creative_type.value['usage_types']['mandatory']) for creative_type in CreativeType
+}
+_ALLOWED_MASKS = {
+    creative_type: _MANDATORY_MASKS[creative_type] | _usage_types_mask(creative_type.value['usage_types'].get('optional', []))
+    for creative_type in CreativeType
+}
 
 class CreativeAsset():
     """Creative Asset for Creative usage
@@ -13,6 +31,7 @@ class CreativeAsset():
     :param usage_type: Usage type of the creative
     :type usage_type: UsageType
     """
+    __slots__ = ('_asset_id', '_usage_type')
     _asset_id: int
     _usage_type: UsageType
 
@@ -49,10 +68,11 @@ class Creative():
         :param assets: List of CreativeAsset, defaults to []
         :type assets: Iterable[CreativeAsset], optional
         """
+    __slots__ = ('_name', '_creative_type', '_language', '_assets')
     _name: str
     _creative_type: CreativeType
     _language: str
-    _assets: Iterable[CreativeAsset] = []
+    _assets: List[CreativeAsset]
      # pylint: disable=dangerous-default-value
     def __init__(self, name: str, creative_type: CreativeType, language: str, assets: Iterable[CreativeAsset] = []):
         if check_instance(name, str, 'name'):
@@ -67,12 +87,13 @@ class Creative():
             raise ValueError(
                 "language must be length 2, not {}.".format(len(language)))
 
+        self._assets = []
         if check_instance(assets, list, 'assets'):
             for creative_asset in assets:
                 if not self.check_asset_compatible(creative_asset):
                     raise ValueError(
                         f"Asset usage type {creative_asset.get_usage_type()} is not compatible with creative type {self.get_creative_type}")
-            self._assets = assets
+            self._assets = list(assets)
 
     def check_asset_compatible(self,asset:CreativeAsset)->bool:
         """_summary_
@@ -82,12 +103,7 @@ class Creative():
         :return: True is compatible else False
         :rtype: bool
         """
-        mandatory = self._creative_type.value['usage_types']['mandatory']
-        optionals = self._creative_type.value['usage_types']['optional'] if 'optional' in self._creative_type.value['usage_types'] else []
-
-        if asset.get_usage_type() in mandatory + optionals:
-            return True
-        return False
+        return bool(_USAGE_TYPE_BITS[asset.get_usage_type()] & _ALLOWED_MASKS[self._creative_type])
 
     def is_validate(self) -> bool:
         """Check if creative is valid
@@ -95,21 +111,21 @@ class Creative():
         :rtype: bool
         """
         asset: CreativeAsset
-        usage_types_used = []
-        mandatory = self._creative_type.value['usage_types']['mandatory']
+        used_mask = 0
+        mandatory_mask = _MANDATORY_MASKS[self._creative_type]
         for asset in self._assets:
-            # test if each asset is class CreativeAsset
-            if asset.get_usage_type() in mandatory:
-                usage_types_used.append(asset.get_usage_type())
-                mandatory.pop(mandatory.index(asset.get_usage_type()))
-            elif asset.get_usage_type() in usage_types_used:
+            usage_bit = _USAGE_TYPE_BITS[asset.get_usage_type()] & mandatory_mask
+            if usage_bit & used_mask:
                 raise ValueError("usage_type {} for creative_type {} has already been used.".format(
                     asset.get_usage_type(), self._creative_type))
+            used_mask |= usage_bit
 
-        if len(mandatory) == 0:
+        if used_mask == mandatory_mask:
             return True
+        missing = [usage_type for usage_type in self._creative_type.value['usage_types']['mandatory']
+                   if not _USAGE_TYPE_BITS[usage_type] & used_mask]
         raise ValueError("Creative type {} is missing mandatory assets with usage_types: {}".format(
-            self._creative_type.name, mandatory))
+            self._creative_type.name, missing))
     # pylint: disable=missing-function-docstring
     def get_name(self):
         return self._name
@@ -3,23 +3,29 @@ import io
 import json
 import os
 import asyncio
+import contextvars
 import threading
 
-from typing import Iterable, Union
+from typing import Iterable, Tuple, Union
 
 import pydash
 from ironsource_api.base_api import BaseAPI
 
 from ironsource_api.promote_api import SKAN_REPORTING_API, UNIVERSAL_SKAN_API, CreativeType, Metrics, Breakdowns, Platform, AdUnits, REPORTING_API, MULTI_BID_API, \
     AUDIENCE_API_SHOW, AUDIENCE_API_CREATE, AUDIENCE_API_DELETE, AUDIENCE_API_UPDATE, TITLE_API, ASSETS_API, CREATIVES_API
-from .audience_list import AudienceListMeta, AudienceListData
+from .audience_list import AudienceListMeta, AudienceListData, AudienceListCatalog
+from .asset_index import AssetHashIndex
+from .asset_validation import validate_asset
+from .bulk import PromoteBulkMixin
 from .campaign_bids import CampaignBidsList
 from .creatives import Creative
-from ..utils import execute_request_with_pagination, execute_request, check_instance
+from ..pagination import execute_request_with_pagination
+from ..utils import execute_request, check_instance, run_coroutine_sync
 
 
-class PromoteAPI(BaseAPI):
-    """IronSource Promote API"""
+class PromoteAPI(PromoteBulkMixin, BaseAPI):
+    """IronSource Promote API, the paginated iterators and bulk operations are defined in PromoteBulkMixin"""
+    _audience_catalog: AudienceListCatalog = None
 
 
     def get_skan_reporting(self, start_date: str, end_date: str, metrics: Iterable[Metrics],
@@ -216,13 +222,11 @@ class PromoteAPI(BaseAPI):
                             creative_ids: Iterable[int] = None, country: Iterable[str] = None, os_sys: Platform = None,
                             device_type: str = None, ad_unit: AdUnits = None,
                             order: Union[Metrics, Breakdowns] = None, direction: str = 'asc', as_bytes=False):
-        event_loop = asyncio.get_event_loop()
         pipe_r, pipe_w = os.pipe()
 
         open_as = 'rb' if as_bytes is True else 'r'
         bytes_io_r = io.open(pipe_r, open_as)
-        bearer_token = event_loop.run_until_complete(
-            self.get_bearer_auth())
+        bearer_token = run_coroutine_sync(self.get_bearer_auth())
 
         options = {
             'headers': {
@@ -264,8 +268,8 @@ class PromoteAPI(BaseAPI):
         if order:
             options['params']['order'] = order.value
 
-        bg_thread = threading.Thread(target=execute_request_with_pagination, name="_get_reporting_bg",
-                                     args=[api_url, pipe_w, 'data', err_msg, options, as_bytes])
+        bg_thread = threading.Thread(target=contextvars.copy_context().run, name="_get_reporting_bg",
+                                     args=[execute_request_with_pagination, api_url, pipe_w, 'data', err_msg, options, as_bytes])
         bg_thread.start()
 
         return bytes_io_r
@@ -305,13 +309,11 @@ class PromoteAPI(BaseAPI):
         :param max_records: maximum number of records per response
         :return: io.BytesIO stream that will contain the response
         """
-        event_loop = asyncio.get_event_loop()
         pipe_r, pipe_w = os.pipe()
         open_as = 'rb' if as_bytes is True else 'r'
         bytes_io_r = io.open(pipe_r, open_as)
 
-        bearer_token = event_loop.run_until_complete(
-            self.get_bearer_auth())
+        bearer_token = run_coroutine_sync(self.get_bearer_auth())
         options = {
             'headers': {
                 'Authorization': 'Bearer ' + bearer_token
@@ -322,8 +324,9 @@ class PromoteAPI(BaseAPI):
             }
         }
 
-        bg_thread = threading.Thread(target=execute_request_with_pagination, name="_get_bids_for_campaign",
-                                     args=[MULTI_BID_API, pipe_w, "bids", "Error getting bids for campaign", options, as_bytes])
+        bg_thread = threading.Thread(target=contextvars.copy_context().run, name="_get_bids_for_campaign",
+                                     args=[execute_request_with_pagination, MULTI_BID_API, pipe_w, "bids",
+                                           "Error getting bids for campaign", options, as_bytes])
         bg_thread.start()
 
         return bytes_io_r
@@ -423,6 +426,29 @@ class PromoteAPI(BaseAPI):
 
         return json.loads(res.msg)
 
+    async def get_audience_catalog(self, ttl: float = 300, refresh: bool = False) -> AudienceListCatalog:
+        """
+        returns a cached catalog of all audience lists, indexed by id, name, bundle id and platform.
+        The catalog is fetched with get_audience_lists once per ttl and invalidated
+        by create_audience_list and delete_audience_list.
+        :param ttl: seconds to keep the catalog - default 300
+        :param refresh: fetch the catalog even if the cached one did not expire
+        :return: AudienceListCatalog
+
+        example:
+        catalog = await promote_api.get_audience_catalog()
+        audience_list_id = catalog.get_id('my_suppression_list')
+        """
+        if refresh or self._audience_catalog is None or self._audience_catalog.is_expired():
+            self._audience_catalog = AudienceListCatalog(await self.get_audience_lists(), ttl)
+        return self._audience_catalog
+
+    def invalidate_audience_catalog(self):
+        """
+        drops the cached audience lists catalog, the next get_audience_catalog call will fetch it again
+        """
+        self._audience_catalog = None
+
     async def create_audience_list(self, audience_meta_data: AudienceListMeta):
         """
         Creates new Audience List
@@ -438,6 +464,7 @@ class PromoteAPI(BaseAPI):
             'json': audience_meta_data.to_object()
         }
         res = await execute_request('post', AUDIENCE_API_CREATE, False, **options)
+        self.invalidate_audience_catalog()
         if res.error_code != -1:
             raise Exception('Error creating Audience Lists: {} Error Code: {}'.format(
                 res.msg, res.error_code))
@@ -458,6 +485,7 @@ class PromoteAPI(BaseAPI):
             }
         }
         res = await execute_request('delete', AUDIENCE_API_DELETE.format(audience_list_id), **options)
+        self.invalidate_audience_catalog()
         if res.error_code != -1:
             raise Exception(
                 'Error deleting Audience List {} : {} Error Code: {}'.format(audience_list_id, res.msg, res.error_code))
@@ -679,7 +707,8 @@ class PromoteAPI(BaseAPI):
 
         return json.loads(res.msg)
 
-    async def create_assets(self, title_id: int, asset_type: str, file_path: str, file_name: str = None) -> dict:
+    async def create_assets(self, title_id: int, asset_type: str, file_path: str, file_name: str = None,
+                            asset_index: AssetHashIndex = None, validate: bool = False) -> dict:
         """Create Asset to be used with Creative
 
         :param title_id: Title id that the asset belongs to.
@@ -690,6 +719,13 @@ class PromoteAPI(BaseAPI):
         :type file_path: str
         :param file_name: Name to overwrite file's name, defaults to None
         :type file_name: str, optional
+        :param asset_index: Content hash index of uploaded assets. When the same file content was already uploaded
+                            for the title and the asset still exists, the upload is skipped and
+                            `{"id": <asset id>, "titleId": <title id>, "duplicate": true}` is returned, defaults to None
+        :type asset_index: AssetHashIndex, optional
+        :param validate: Check the file requirements locally before uploading (see asset_validation.validate_asset),
+                         defaults to False
+        :type validate: bool, optional
         :raises ValueError: _description_
         :raises Exception: _description_
         :return: json format with information on the uploaded asset
@@ -712,6 +748,10 @@ class PromoteAPI(BaseAPI):
         Note: Videos longer than 30sec will have limited traffic
         """
 
+        file_hash, duplicate = await self._check_asset_upload(title_id, asset_type, file_path, asset_index, validate)
+        if duplicate is not None:
+            return duplicate
+
         bearer_token = await self.get_bearer_auth()
 
         options = {
@@ -732,19 +772,56 @@ class PromoteAPI(BaseAPI):
         if check_instance(title_id, int, 'title_id'):
             options['data']['titleId'] = str(title_id)
 
+        # the file object is streamed by httpx in chunks and closed once the request is done
+        asset_file = None
         if file_path and file_name:
             if check_instance(file_name, str, 'file_name') and check_instance(file_path, str, 'file_path'):
-                options['files']['file'] = (file_name,
-                                            open(file_path, 'rb'))
+                asset_file = open(file_path, 'rb')  # pylint: disable=consider-using-with
+                options['files']['file'] = (file_name, asset_file)
         elif check_instance(file_path, str, 'file_path'):
-            options['files']['file'] = open(file_path, 'rb')
-
-        res = await execute_request('post', ASSETS_API, False, **options)
+            asset_file = open(file_path, 'rb')  # pylint: disable=consider-using-with
+            options['files']['file'] = asset_file
+
+        try:
+            res = await execute_request('post', ASSETS_API, False, **options)
+        finally:
+            if asset_file:
+                asset_file.close()
         if res.error_code != -1:
             raise Exception('Error creating Assets: {} Error Code: {}'.format(
                 res.msg, res.error_code))
 
-        return json.loads(res.msg)
+        asset = json.loads(res.msg)
+        if asset_index and isinstance(asset, dict) and asset.get('id') is not None:
+            asset_index.add(title_id, file_hash, asset['id'])
+        return asset
+
+    async def _check_asset_upload(self, title_id: int, asset_type: str, file_path: str,
+                                  asset_index: AssetHashIndex, validate: bool) -> Tuple[Union[str, None], Union[dict, None]]:
+        """Validates the asset file and looks it up in the asset index before uploading
+
+        :return: SHA-256 of the file (None without asset_index) and the duplicate asset result or None
+        """
+        if validate:
+            validation = validate_asset(file_path, asset_type)
+            if validation['errors']:
+                raise ValueError('Asset {} is not valid: {}'.format(file_path, ', '.join(validation['errors'])))
+
+        if not asset_index:
+            return None, None
+
+        file_hash = await asyncio.get_running_loop().run_in_executor(None, AssetHashIndex.hash_file, file_path)
+        asset_id = asset_index.get(title_id, file_hash)
+        if asset_id is None:
+            return file_hash, None
+
+        async def _load_title_assets():
+            return [asset['id'] async for asset in self.iter_assets(title_id=title_id)]
+        await asset_index.load_title_assets(title_id, _load_title_assets)
+        if asset_index.has_asset(title_id, asset_id):
+            return file_hash, {'id': asset_id, 'titleId': title_id, 'duplicate': True}
+        asset_index.remove(title_id, file_hash)
+        return file_hash, None
 
     async def get_creatives(self, creative_type: CreativeType = None, title_id: int = None, request_id: str = None, page_number: int = None,  results_bulk_size: int = None):
         """
@@ -3,10 +3,20 @@ Utils package
 """
 import sys
 import gzip
-import json
-import os
 import base64
-from typing import Union
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+import random
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from urllib import request, parse
 import io
 from dataclasses import dataclass
@@ -23,6 +33,26 @@ else:
 
 BARRIER_AUTH_URL = "https://platform.ironsrc.com/partners/publisher/auth"
 
+# httpx.AsyncClient shared by execute_request calls, see shared_client()
+_shared_client = ContextVar('ironsource_api_shared_client', default=None)
+# asyncio.Semaphore that limits the execute_request calls in flight, see request_limit()
+_request_limiter = ContextVar('ironsource_api_request_limiter', default=None)
+# RateLimiter that replaces the default rate limiter, see rate_limit()
+_rate_limiter = ContextVar('ironsource_api_rate_limiter', default=None)
+# AdaptiveConcurrency that replaces the default controller, see concurrency_control()
+_concurrency_controller = ContextVar('ironsource_api_concurrency_controller', default=None)
+# RetryPolicy that replaces the default retry policy, see retry_control()
+_retry_policy = ContextVar('ironsource_api_retry_policy', default=None)
+
+# responses that mean the server is overloaded, see AdaptiveConcurrency
+CONGESTION_STATUS_CODES = frozenset((429, 502, 503, 504))
+# responses of failures that may succeed when retried, see RetryPolicy
+RETRY_STATUS_CODES = CONGESTION_STATUS_CODES | {500}
+# responses of requests that the server rejected without processing them, safe to retry with any method
+UNPROCESSED_STATUS_CODES = frozenset((429, 503))
+# methods that are retried by default, repeating them does not change the result
+IDEMPOTENT_METHODS = frozenset(('get', 'head', 'options', 'put', 'delete'))
+
 @dataclass
 class ResponseInterface:
     """interface for http response"""
@@ -62,34 +92,731 @@ async def get_bearer_auth(secret: str, token: str) -> str:
     return res.msg.lstrip("\"").rstrip("\"")
 
 
+def _create_async_client(timeout: Union[float, httpx.Timeout] = 60.0) -> httpx.AsyncClient:
+    """creates httpx.AsyncClient with the library user agent"""
+    client = httpx.AsyncClient(timeout=timeout)
+    client.headers['user-agent'] = f"{client.headers['user-agent']} IronSource - Python API Library {__version__}"
+    return client
+
+
+@contextlib.asynccontextmanager
+async def shared_client(timeout: Union[float, httpx.Timeout] = 60.0) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    reuse a single httpx.AsyncClient, and its connection pool, for all execute_request calls made inside the block
+    (including tasks created inside it). Nested blocks reuse the outer client.
+    :param timeout: timeout for the shared client
+    :return: the shared client
+
+    example:
+    async with shared_client():
+        await asyncio.gather(*[promote_api.create_assets(...) for ...])
+    """
+    client = _shared_client.get()
+    if client is not None and not client.is_closed:
+        yield client
+        return
+
+    client = _create_async_client(timeout)
+    token = _shared_client.set(client)
+    try:
+        yield client
+    finally:
+        _shared_client.reset(token)
+        await client.aclose()
+
+
+class TokenBucket:
+    """Token bucket that allows rate requests per second with bursts of up to burst requests.
+    A request reserves its token in advance, so requests that wait are spaced evenly instead of retrying together.
+    Thread safe, shared by coroutines and the pagination threads.
+
+    :param rate: requests per second
+    :type rate: float
+    :param burst: maximum number of requests sent at once, defaults to None (max of rate and 1)
+    :type burst: float, optional
+    """
+    _rate: float
+    _burst: float
+    _tokens: float
+    _updated: float
+    _lock: threading.Lock
+
+    def __init__(self, rate: float, burst: float = None):
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0, not {}.'.format(rate))
+        if burst is not None and burst < 1:
+            raise ValueError('burst must be at least 1, not {}.'.format(burst))
+        self._rate = rate
+        self._burst = burst or max(rate, 1.0)
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get_rate(self) -> float:  # pylint: disable=missing-function-docstring
+        return self._rate
+
+    def get_burst(self) -> float:  # pylint: disable=missing-function-docstring
+        return self._burst
+
+    def reserve(self) -> float:
+        """
+        takes a token from the bucket
+        :return: seconds to wait before the token can be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    async def acquire(self):
+        """waits until a token is available and takes it"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """Client side rate limits of endpoints, a request takes a token from the bucket of the most specific limit of its url.
+    Limits are set either for a url prefix (e.g. REPORT_URL) or for a host name (e.g. 'api.ironsrc.com').
+
+    :param default_rate: requests per second of every host that has no limit, defaults to None (unlimited)
+    :type default_rate: float, optional
+    :param default_burst: burst of the default host limits, defaults to None
+    :type default_burst: float, optional
+
+    example:
+    get_rate_limiter().set_limit(MULTI_BID_API, rate=5)
+    get_rate_limiter().set_limit('platform.ironsrc.com', rate=20, burst=40)
+    """
+    _default_rate: Optional[float]
+    _default_burst: Optional[float]
+    # (url prefix, bucket) sorted from the longest prefix
+    _prefixes: List[Tuple[str, TokenBucket]]
+    _hosts: Dict[str, TokenBucket]
+    _default_hosts: Dict[str, TokenBucket]
+
+    def __init__(self, default_rate: float = None, default_burst: float = None):
+        self._default_rate = default_rate
+        self._default_burst = default_burst
+        self._prefixes = []
+        self._hosts = {}
+        self._default_hosts = {}
+
+    def set_limit(self, endpoint: str, rate: float, burst: float = None):
+        """
+        sets the rate limit of an endpoint, replaces its previous limit
+        :param endpoint: url prefix ('https://host/path') or host name ('host')
+        :type endpoint: str
+        :param rate: requests per second
+        :type rate: float
+        :param burst: maximum number of requests sent at once, defaults to None (max of rate and 1)
+        :type burst: float, optional
+        """
+        bucket = TokenBucket(rate, burst)
+        self.remove_limit(endpoint)
+        if '://' in endpoint:
+            self._prefixes.append((endpoint, bucket))
+            self._prefixes.sort(key=lambda prefix: len(prefix[0]), reverse=True)
+        else:
+            self._hosts[endpoint.lower()] = bucket
+
+    def remove_limit(self, endpoint: str):
+        """
+        removes the rate limit of an endpoint
+        :param endpoint: url prefix or host name that was passed to set_limit
+        """
+        self._prefixes = [prefix for prefix in self._prefixes if prefix[0] != endpoint]
+        self._hosts.pop(endpoint.lower(), None)
+
+    def get_bucket(self, url: str) -> Optional[TokenBucket]:
+        """
+        :param url: request url
+        :return: the bucket that limits requests to url, None when they are not limited
+        """
+        for prefix, bucket in self._prefixes:
+            if url.startswith(prefix):
+                return bucket
+        host = (parse.urlsplit(url).hostname or '').lower()
+        bucket = self._hosts.get(host)
+        if bucket is None and self._default_rate:
+            bucket = self._default_hosts.get(host)
+            if bucket is None:
+                bucket = self._default_hosts.setdefault(host, TokenBucket(self._default_rate, self._default_burst))
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        """
+        takes a token for a request to url
+        :return: seconds to wait before sending the request
+        """
+        bucket = self.get_bucket(url)
+        return bucket.reserve() if bucket else 0.0
+
+    async def acquire(self, url: str):
+        """waits until a request to url is allowed"""
+        bucket = self.get_bucket(url)
+        if bucket:
+            await bucket.acquire()
+
+
+_default_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    :return: the rate limiter of execute_request calls, the one set by rate_limit() or the default rate limiter
+        that is shared by all the clients of the process
+    """
+    return _rate_limiter.get() or _default_rate_limiter
+
+
+@contextlib.contextmanager
+def rate_limit(limiter: RateLimiter):
+    """
+    use limiter instead of the default rate limiter for the execute_request calls made inside the block
+    (including tasks and pagination threads started inside it).
+    :param limiter: rate limiter to use
+    """
+    token = _rate_limiter.set(limiter)
+    try:
+        yield limiter
+    finally:
+        _rate_limiter.reset(token)
+
+
+def get_retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    :param response: http response
+    :return: seconds to wait according to the Retry-After header of the response (seconds or http date),
+        None when the header is missing or invalid
+    """
+    value = response.headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class _HostQueue:
+    """requests in flight and waiting requests of a host in an event loop"""
+    __slots__ = ('in_flight', 'waiters')
+
+    def __init__(self):
+        self.in_flight = 0
+        self.waiters = collections.deque()
+
+
+class AdaptiveConcurrency:  # pylint: disable=too-many-instance-attributes
+    """Adaptive (AIMD) limit of the requests in flight per host.
+    The limit of a host grows by one request per round of requests while all of its slots are used and the latency
+    stays within latency_tolerance times the average latency, it is cut by decrease_factor when a request times out
+    or gets a 429/502/503/504 response, at most once per round. Requests to a host wait for its Retry-After.
+    The limits are shared by all the event loops and threads, requests in flight are counted per event loop
+    and once for all the threads (see acquire_blocking).
+    The default controller of the process starts at 100 requests in flight per host, above the callers' own limits
+    (e.g. request_limit), so it only throttles a host that is overloaded. Use a controller for a block of code with
+    concurrency_control(AdaptiveConcurrency()), or turn the default one off with set_enabled(False).
+
+    :param initial_limit: limit of a host before any response, defaults to 10
+    :type initial_limit: int, optional
+    :param min_limit: lowest limit, defaults to 1
+    :type min_limit: int, optional
+    :param max_limit: highest limit, defaults to 100
+    :type max_limit: int, optional
+    :param decrease_factor: factor of the limit after an overloaded response, defaults to 0.5
+    :type decrease_factor: float, optional
+    :param latency_tolerance: latency above this multiple of the average latency stops the growth, defaults to 2.0
+    :type latency_tolerance: float, optional
+    :param max_retry_after: longest Retry-After in seconds that is honoured, defaults to 120
+    :type max_retry_after: float, optional
+    :param enabled: limit requests from the start, see set_enabled, defaults to True
+    :type enabled: bool, optional
+    """
+    _initial_limit: int
+    _min_limit: int
+    _max_limit: int
+    _decrease_factor: float
+    _latency_tolerance: float
+    _max_retry_after: float
+    _enabled: bool
+    _limits: Dict[str, float]
+    _latency: Dict[str, float]
+    _last_decrease: Dict[str, float]
+    _blocked_until: Dict[str, float]
+    _queues: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _HostQueue]]'
+    _thread_in_flight: Dict[str, int]
+    _thread_slots: threading.Condition
+
+    def __init__(self, initial_limit: int = 10, min_limit: int = 1, max_limit: int = 100, decrease_factor: float = 0.5,  # pylint: disable=too-many-arguments
+                 latency_tolerance: float = 2.0, max_retry_after: float = 120, enabled: bool = True):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('limits must be 1 <= min_limit <= initial_limit <= max_limit, not {} <= {} <= {}.'.format(
+                min_limit, initial_limit, max_limit))
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor must be between 0 and 1, not {}.'.format(decrease_factor))
+        self._initial_limit = initial_limit
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._decrease_factor = decrease_factor
+        self._latency_tolerance = latency_tolerance
+        self._max_retry_after = max_retry_after
+        self._enabled = enabled
+        self._limits = {}
+        self._latency = {}
+        self._last_decrease = {}
+        self._blocked_until = {}
+        self._queues = weakref.WeakKeyDictionary()
+        self._thread_in_flight = {}
+        self._thread_slots = threading.Condition()
+
+    def is_enabled(self) -> bool:  # pylint: disable=missing-function-docstring
+        return self._enabled
+
+    def set_enabled(self, enabled: bool):
+        """
+        turns the controller on or off, requests are not limited while it is off
+        :param enabled: True to limit requests
+        """
+        self._enabled = enabled
+
+    def get_limit(self, url: str) -> int:
+        """
+        :param url: request url
+        :return: current limit of requests in flight to the host of url
+        """
+        return max(self._min_limit, int(self._limits.get(_get_host(url), self._initial_limit)))
+
+    def get_in_flight(self, url: str) -> int:
+        """
+        :param url: request url
+        :return: requests in flight to the host of url in the running event loop
+        """
+        return self._get_queue(_get_host(url)).in_flight
+
+    def reset(self):
+        """forgets the learned limits, latencies and Retry-After of all the hosts"""
+        self._limits.clear()
+        self._latency.clear()
+        self._last_decrease.clear()
+        self._blocked_until.clear()
+
+    def _get_queue(self, host: str) -> _HostQueue:
+        """returns the queue of host in the running event loop"""
+        queues = self._queues.setdefault(asyncio.get_event_loop(), {})
+        queue = queues.get(host)
+        if queue is None:
+            queue = queues[host] = _HostQueue()
+        return queue
+
+    def _wake(self, host: str, queue: _HostQueue):
+        """hands free slots of host to the waiting requests in their order"""
+        limit = self.get_limit(host)
+        while queue.waiters and queue.in_flight < limit:
+            waiter = queue.waiters.popleft()
+            if not waiter.done():
+                queue.in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self, url: str) -> float:
+        """
+        waits for the Retry-After of the host of url and for a free slot, every acquire must be followed by release
+        :param url: request url
+        :return: start time of the request, pass it to release
+        """
+        host = _get_host(url)
+        delay = self._blocked_until.get(host, 0.0) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        queue = self._get_queue(host)
+        if queue.waiters or queue.in_flight >= self.get_limit(host):
+            waiter = asyncio.get_event_loop().create_future()
+            queue.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    queue.in_flight -= 1
+                    self._wake(host, queue)
+                raise
+        else:
+            queue.in_flight += 1
+        return time.monotonic()
+
+    def release(self, url: str, started: float, response: httpx.Response = None, exception: Exception = None):
+        """
+        frees the slot of a request and adapts the limit of its host to the result
+        :param url: request url
+        :param started: start time that acquire returned
+        :param response: http response, None when there was none
+        :param exception: exception raised by the request, None when there was none
+        """
+        host = _get_host(url)
+        queue = self._get_queue(host)
+        queue.in_flight -= 1
+        self._adapt(host, queue.in_flight, started, response, exception)
+        self._wake(host, queue)
+
+    def acquire_blocking(self, url: str) -> float:
+        """
+        blocking acquire for requests sent from threads (e.g. execute_request_with_pagination),
+        every acquire_blocking must be followed by release_blocking
+        :param url: request url
+        :return: start time of the request, pass it to release_blocking
+        """
+        host = _get_host(url)
+        delay = self._blocked_until.get(host, 0.0) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._thread_slots:
+            while self._thread_in_flight.get(host, 0) >= self.get_limit(host):
+                self._thread_slots.wait()
+            self._thread_in_flight[host] = self._thread_in_flight.get(host, 0) + 1
+        return time.monotonic()
+
+    def release_blocking(self, url: str, started: float, response: httpx.Response = None, exception: Exception = None):
+        """
+        frees the slot of a request that acquire_blocking returned and adapts the limit of its host to the result
+        :param url: request url
+        :param started: start time that acquire_blocking returned
+        :param response: http response, None when there was none
+        :param exception: exception raised by the request, None when there was none
+        """
+        host = _get_host(url)
+        with self._thread_slots:
+            self._thread_in_flight[host] -= 1
+            self._adapt(host, self._thread_in_flight[host], started, response, exception)
+            self._thread_slots.notify_all()
+
+    def _adapt(self, host: str, in_flight: int, started: float, response: Optional[httpx.Response],  # pylint: disable=too-many-arguments
+               exception: Optional[Exception]):
+        """adapts the limit of host to the result of a request, in_flight are the other requests in flight"""
+        now = time.monotonic()
+        status_code = response.status_code if response is not None else None
+        limit = self._limits.get(host, self._initial_limit)
+
+        if isinstance(exception, httpx.TimeoutException) or status_code in CONGESTION_STATUS_CODES:
+            retry_after = get_retry_after(response) if response is not None else None
+            if retry_after:
+                self._blocked_until[host] = max(self._blocked_until.get(host, 0.0),
+                                                now + min(retry_after, self._max_retry_after))
+            if started >= self._last_decrease.get(host, 0.0):
+                self._limits[host] = max(float(self._min_limit), limit * self._decrease_factor)
+                self._last_decrease[host] = now
+        elif exception is None and status_code is not None and status_code < 500:
+            latency = now - started
+            average = self._latency.get(host)
+            self._latency[host] = latency if average is None else average + (latency - average) * 0.1
+            saturated = in_flight + 1 >= int(limit)
+            if saturated and (average is None or latency <= average * self._latency_tolerance):
+                self._limits[host] = min(float(self._max_limit), limit + 1 / limit)
+
+
+def _get_host(url: str) -> str:
+    """returns the host name of url, url itself when it is already a host name"""
+    return (parse.urlsplit(url).hostname or url).lower() if '://' in url else url.lower()
+
+
+# starts above the limits of the callers, so it only cuts the requests to a host after the host reports overload
+_default_concurrency_controller = AdaptiveConcurrency(initial_limit=100, max_limit=1000)
+
+
+def get_concurrency_controller() -> AdaptiveConcurrency:
+    """
+    :return: the adaptive concurrency controller of execute_request calls, the one set by concurrency_control()
+        or the default controller that is shared by all the clients of the process
+    """
+    return _concurrency_controller.get() or _default_concurrency_controller
+
+
+@contextlib.contextmanager
+def concurrency_control(controller: AdaptiveConcurrency):
+    """
+    use controller instead of the default adaptive concurrency controller for the execute_request calls made inside
+    the block (including tasks and pagination threads started inside it).
+    :param controller: adaptive concurrency controller to use
+    """
+    token = _concurrency_controller.set(controller)
+    try:
+        yield controller
+    finally:
+        _concurrency_controller.reset(token)
+
+
+class RetryPolicy:  # pylint: disable=too-many-instance-attributes
+    """Retries of failed requests with exponential backoff and full jitter.
+    Requests are retried after transport errors (connection errors, timeouts) and RETRY_STATUS_CODES responses,
+    only for IDEMPOTENT_METHODS unless an endpoint allows other methods with set_endpoint.
+    Retries are limited by a budget: every request adds budget_ratio to it up to budget_max and every retry takes one,
+    so a failing service does not get a storm of retries.
+    Request bodies are sent again as they are, file uploads can only be retried if their files can be read again.
+
+    :param max_retries: retries of a request, defaults to 3
+    :type max_retries: int, optional
+    :param backoff: delay before the first retry in seconds, doubled for every retry, defaults to 0.5
+    :type backoff: float, optional
+    :param max_backoff: longest delay in seconds, also caps Retry-After, defaults to 30
+    :type max_backoff: float, optional
+    :param budget_ratio: retries added to the budget by every request, defaults to 0.2
+    :type budget_ratio: float, optional
+    :param budget_max: largest retry budget, defaults to 20
+    :type budget_max: float, optional
+    """
+    _max_retries: int
+    _backoff: float
+    _max_backoff: float
+    _budget_ratio: float
+    _budget_max: float
+    _budget: float
+    # (url prefix, methods, max retries) sorted from the longest prefix
+    _endpoints: List[Tuple[str, Optional[frozenset], Optional[int]]]
+    _metrics: dict
+
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 30,
+                 budget_ratio: float = 0.2, budget_max: float = 20):
+        if max_retries < 0:
+            raise ValueError('max_retries must be 0 or greater, not {}.'.format(max_retries))
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._budget_ratio = budget_ratio
+        self._budget_max = budget_max
+        self._budget = budget_max
+        self._endpoints = []
+        self.reset_metrics()
+
+    def set_endpoint(self, endpoint: str, methods: Iterable[str] = None, max_retries: int = None):
+        """
+        overrides the retries of requests to an endpoint, replaces its previous override
+        :param endpoint: url prefix of the endpoint
+        :type endpoint: str
+        :param methods: methods that are retried, defaults to None (IDEMPOTENT_METHODS)
+        :type methods: Iterable[str], optional
+        :param max_retries: retries of a request, defaults to None (max_retries of the policy)
+        :type max_retries: int, optional
+        """
+        self.remove_endpoint(endpoint)
+        self._endpoints.append((endpoint, frozenset(method.lower() for method in methods) if methods is not None else None,
+                                max_retries))
+        self._endpoints.sort(key=lambda override: len(override[0]), reverse=True)
+
+    def remove_endpoint(self, endpoint: str):
+        """
+        removes the override of an endpoint
+        :param endpoint: url prefix that was passed to set_endpoint
+        """
+        self._endpoints = [override for override in self._endpoints if override[0] != endpoint]
+
+    def get_max_retries(self, method: str, url: str) -> int:
+        """
+        :param method: http method
+        :param url: request url
+        :return: retries of a failed request, 0 when the request is not retried
+        """
+        methods, max_retries = IDEMPOTENT_METHODS, self._max_retries
+        for prefix, endpoint_methods, endpoint_max_retries in self._endpoints:
+            if url.startswith(prefix):
+                methods = endpoint_methods if endpoint_methods is not None else methods
+                max_retries = endpoint_max_retries if endpoint_max_retries is not None else max_retries
+                break
+        return max_retries if method.lower() in methods else 0
+
+    def next_delay(self, method: str, url: str, attempt: int, response: httpx.Response = None,
+                   exception: Exception = None) -> Optional[float]:
+        """
+        decides whether a request is retried and counts it in the metrics
+        :param method: http method
+        :param url: request url
+        :param attempt: number of the attempt that ended, starting from 0
+        :param response: http response of the attempt, None when there was none
+        :param exception: exception raised by the attempt, None when there was none
+        :return: seconds to wait before the next attempt, None when the request is not retried
+        """
+        if attempt == 0:
+            self._metrics['requests'] += 1
+            self._budget = min(self._budget_max, self._budget + self._budget_ratio)
+
+        reason = _get_retry_reason(response, exception)
+        if reason is None:
+            if attempt:
+                self._metrics['recovered'] += 1
+            return None
+        max_retries = self.get_max_retries(method, url)
+        if not max_retries:
+            return None
+        if attempt >= max_retries:
+            self._metrics['exhausted'] += 1
+            return None
+        if self._budget < 1:
+            self._metrics['budgetExhausted'] += 1
+            return None
+
+        self._budget -= 1
+        self._metrics['retries'] += 1
+        self._metrics['reasons'][reason] = self._metrics['reasons'].get(reason, 0) + 1
+        delay = random.uniform(0, min(self._max_backoff, self._backoff * 2 ** attempt))
+        retry_after = get_retry_after(response) if response is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._max_backoff))
+        return delay
+
+    def get_metrics(self) -> dict:
+        """
+        :return: counters of the requests and retries since the last reset_metrics
+
+            Example ::
+            `{
+                "requests": 120,
+                "retries": 7,
+                "recovered": 5,
+                "exhausted": 1,
+                "budgetExhausted": 0,
+                "reasons": {"503": 4, "ConnectError": 3}
+            }`
+        """
+        return dict(self._metrics, reasons=dict(self._metrics['reasons']))
+
+    def reset_metrics(self):
+        """sets all the metrics to 0"""
+        self._metrics = {'requests': 0, 'retries': 0, 'recovered': 0, 'exhausted': 0, 'budgetExhausted': 0, 'reasons': {}}
+
+
+def _get_retry_reason(response: Optional[httpx.Response], exception: Optional[Exception]) -> Optional[str]:
+    """returns why a request should be retried, None when it should not"""
+    if exception is not None:
+        return type(exception).__name__ if isinstance(exception, httpx.TransportError) else None
+    if response is not None and response.status_code in RETRY_STATUS_CODES:
+        return str(response.status_code)
+    return None
+
+
+_default_retry_policy = RetryPolicy()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    :return: the retry policy of execute_request calls, the one set by retry_control() or the default policy
+        that is shared by all the clients of the process
+    """
+    return _retry_policy.get() or _default_retry_policy
+
+
+@contextlib.contextmanager
+def retry_control(policy: RetryPolicy):
+    """
+    use policy instead of the default retry policy for the execute_request calls made inside the block
+    (including tasks created inside it), RetryPolicy(max_retries=0) turns retries off.
+    :param policy: retry policy to use
+    """
+    token = _retry_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _retry_policy.reset(token)
+
+
+@contextlib.contextmanager
+def request_limit(limiter: asyncio.Semaphore):
+    """
+    limit the execute_request calls made inside the block (including tasks created inside it) to the
+    number of requests allowed by limiter, replaces the limit of an outer block.
+    :param limiter: semaphore that every request holds while it is in flight
+    """
+    token = _request_limiter.set(limiter)
+    try:
+        yield limiter
+    finally:
+        _request_limiter.reset(token)
+
+
 async def execute_request(method: str, url: str, is_gzip=False, **kwargs) -> ResponseInterface:
     """
-    execute http request
+    execute http request, every attempt waits for the rate limit (see get_rate_limiter), the request limit
+    (see request_limit) and the adaptive concurrency limit (see get_concurrency_controller) of its url
+    and failed attempts are retried according to the retry policy (see get_retry_policy)
     :param method: http method type ('get','post','del','put'..)
     :param url: http request url
     :param is_gzip: is response is gzipped
     :param kwargs: args that defined by httpx
     :return ResponseInterface: ResponseInterface with err_code if exists, else -1 and msg as response body
     """
+    policy = get_retry_policy()
+    attempt = 0
+    while True:
+        response_obj, res, exception = await _execute_attempt(method, url, is_gzip, **kwargs)
+        delay = policy.next_delay(method, url, attempt, res, exception)
+        if delay is None:
+            return response_obj
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def _execute_attempt(method: str, url: str, is_gzip=False,
+                           **kwargs) -> Tuple[ResponseInterface, Optional[httpx.Response], Optional[Exception]]:
+    """sends a single http request within the rate limit and the request limit, see _send_request"""
+    await get_rate_limiter().acquire(url)
+    limiter = _request_limiter.get()
+    if limiter is None:
+        return await _send_controlled_request(method, url, is_gzip, **kwargs)
+    async with limiter:
+        return await _send_controlled_request(method, url, is_gzip, **kwargs)
+
+
+async def _send_controlled_request(method: str, url: str, is_gzip=False,
+                                   **kwargs) -> Tuple[ResponseInterface, Optional[httpx.Response], Optional[Exception]]:
+    """sends a single http request within the adaptive concurrency limit of its host, see _send_request"""
+    controller = get_concurrency_controller()
+    if not controller.is_enabled():
+        return await _send_request(method, url, is_gzip, **kwargs)
+
+    started = await controller.acquire(url)
+    res = exception = None
+    try:
+        response_obj, res, exception = await _send_request(method, url, is_gzip, **kwargs)
+        return response_obj, res, exception
+    finally:
+        controller.release(url, started, res, exception)
+
+
+async def _send_request(method: str, url: str, is_gzip=False,
+                        **kwargs) -> Tuple[ResponseInterface, Optional[httpx.Response], Optional[Exception]]:
+    """sends a single http request, see execute_request
+    :return: the ResponseInterface, the http response if there was one and the exception if one was raised
+    """
     response_obj = ResponseInterface()
+    client = _shared_client.get()
+    owns_client = client is None or client.is_closed
+    res = None
     try:
-        client = httpx.AsyncClient(timeout=60.0)
-        client.headers['user-agent'] = f"{client.headers['user-agent']} IronSource - Python API Library {__version__}"
+        if owns_client:
+            client = _create_async_client()
         res = await client.request(method=method, url=url, **kwargs)
         if res.status_code >= 400:
             response_obj.msg = res.text
             response_obj.error_code = res.status_code
-            return response_obj
+            return response_obj, res, None
         response_obj.msg = res.text if not is_gzip else gzip.decompress(
             res.content)
-        return response_obj
+        return response_obj, res, None
 
     except Exception as exception:
         response_obj.msg = str(exception)
         response_obj.error_code = 500
-        return response_obj
+        return response_obj, res, exception
     finally:
-        if client and not client.is_closed:
+        if owns_client and client and not client.is_closed:
             await client.aclose()
 
 
@@ -112,73 +839,62 @@ def execute_request_as_stream(url: str, is_gzip: bool) -> io.BytesIO:
         raise exception
 
 
-# pylint: disable= too-many-branches
-def execute_request_with_pagination(url: str, pipe_w: int, data_key: str, err_string: str, options: dict, as_bytes=False):
+async def execute_with_concurrency(jobs: Iterable[Any], worker: Callable[[Any], Awaitable[Any]], concurrency: int = 5) -> list:
+    """
+    run `worker` on every job with at most `concurrency` workers in flight.
+    jobs are pulled lazily from the iterable so large generators are never fully materialized.
+    :param jobs: iterable of jobs to pass to the worker
+    :param worker: coroutine function that receives a single job
+    :param concurrency: maximum number of jobs running at the same time
+    :return list: worker results in the same order as the jobs
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be greater than 0, not {}.'.format(concurrency))
+
+    jobs_iter = enumerate(jobs)
+    results = {}
+
+    async def _run_jobs():
+        for index, job in jobs_iter:
+            results[index] = await worker(job)
+
+    await asyncio.gather(*[_run_jobs() for _ in range(concurrency)])
+    return [results[index] for index in range(len(results))]
+
+
+def run_coroutine_sync(coroutine: Awaitable[Any]) -> Any:
     """
-    execute requests that it's response could have pagination and write the response to a pipe stream
-    if response is of json format `data_key` will be used to extract the data out of the json.
-    :param url: The url to execute request to
-    :param pipe_w: fd where the pipe exists
-    :param data_key: json key where the data should be extracted from
-    :param err_string: In case of exception use this string as well
-    :param options: http headers and query params
-    :return:
+    run a coroutine to completion from sync code, in the event loop of the current thread or in a new event loop
+    when the thread has none (e.g. a thread started with run_in_thread). The shared client and request limit of the
+    caller are bound to its own event loop, so they are not used in a new event loop.
+    :param coroutine: coroutine to run
+    :return: the result of the coroutine
     """
-    client = httpx.Client(timeout=60.0)
-    next_page: str = ''
     try:
-        client.headers['user-agent'] = f"{client.headers['user-agent']} IronSource - Python API Library {__version__}"
-        res = client.request(method='get', url=url, **options)
+        event_loop = asyncio.get_event_loop()
+    except RuntimeError:
+        event_loop = None
+    if event_loop is not None:
+        return event_loop.run_until_complete(coroutine)
 
-        if res.status_code >= 400:
-            raise Exception('{}: Error Code: {} Error: {}'.format(
-                err_string, res.status_code, res.text))
-        if 'format' not in options['params'] or options['params']['format'] == 'json':
-            if not res.text:
-                os.close(pipe_w)
-                return
-
-            res_json = json.loads(res.text)
-            data_to_write =  (json.dumps(res_json[data_key])+"\n").encode('utf-8')
-            data_to_write = bytes(data_to_write,'utf-8') if as_bytes is True else data_to_write
-            os.write(pipe_w, data_to_write)
-            if 'paging' in res_json and 'next' in res_json['paging']:
-                next_page = res_json['paging']['next']
-            else:
-                os.close(pipe_w)
-                return
-
-        elif options['params']['format'] == 'csv':
-            if res.status_code == 204 and not res.text:
-                os.close(pipe_w)
-                return
-            data_to_write = bytes(
-                res.text,'utf-8') if as_bytes is True else res.text.encode('utf-8')
-            os.write(pipe_w, data_to_write)
-
-            if 'link' in res.headers:
-                next_page = res.headers['link'].replace(
-                    '<', '').replace('>; rel="next"', '')
-            else:
-                os.close(pipe_w)
-                return
-
-        if next_page:
-            split_url = parse.urlsplit(next_page)
-            new_params = dict(parse.parse_qsl(split_url.query))
-            options['params'] = new_params
-            url = split_url.scheme + '://' + split_url.netloc + split_url.path
-            execute_request_with_pagination(
-                url, pipe_w, data_key, err_string, options, as_bytes)
+    async def _run_unbound():
+        _shared_client.set(None)
+        _request_limiter.set(None)
+        return await coroutine
 
-    except Exception as exception:
-        raise Exception('{}: {}'.format(
-            err_string, str(exception))) from exception
-    finally:
-        try:
-            os.close(pipe_w)
-        except OSError:
-            pass
+    return asyncio.run(_run_unbound())
+
+
+async def run_in_thread(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    run a sync function, such as the paginated PromoteAPI methods, in a worker thread with a copy of the caller's
+    context, so the rate limiter and concurrency controller set by the caller still apply.
+    :param func: function to run
+    :return: the result of the function
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_event_loop().run_in_executor(None, call)
 
 
 def check_instance(value, value_type, key):
@@ -0,0 +1,93 @@
+# pylint: disable=missing-module-docstring
+import asyncio
+import json
+import unittest
+
+from pytest_mock import MockerFixture
+
+import pytest
+
+from ironsource_api.ironsource_api import IronSourceAccountPool
+from ironsource_api.utils import get_rate_limiter, run_in_thread
+
+
+# pylint: disable=missing-function-docstring,missing-class-docstring
+@pytest.mark.asyncio
+class UnitIronSourceAPITest(unittest.IsolatedAsyncioTestCase):
+
+    @pytest.fixture(autouse=True)
+    def before_after_tests(self, mocker: MockerFixture):
+        self.mocker = mocker
+        yield
+
+    @pytest.mark.asyncio
+    async def test_unit_account_pool(self):
+        pool = IronSourceAccountPool(max_concurrency_per_account=3)
+        account_a = pool.add_account('USER_A', 'TOKEN_A', 'SECRET_A', max_concurrency=1)
+        account_b = pool.add_account('USER_B', 'TOKEN_B', 'SECRET_B')
+        rate_limiter_a = pool.get_rate_limiter('USER_A', 'TOKEN_A')
+        self.assertIs(pool.add_account('USER_A', 'TOKEN_A', 'SECRET_A', max_concurrency=1), account_a)
+        self.assertIs(pool.get_rate_limiter('USER_A', 'TOKEN_A'), rate_limiter_a)
+        self.assertIsNot(pool.get_rate_limiter('USER_B', 'TOKEN_B'), rate_limiter_a)
+        self.assertEqual(len(pool), 2)
+
+        async def _auth(api):
+            return 'A' if api is account_a.monetize_api() else 'B'
+        self.mocker.patch('ironsource_api.base_api.BaseAPI.get_bearer_auth', new=_auth)
+
+        in_flight = {}
+        peak = {}
+        clients = set()
+
+        async def _request(client, method, url, **kwargs):
+            auth = kwargs['headers']['Authorization']
+            clients.add(client)
+            in_flight[auth] = in_flight.get(auth, 0) + 1
+            peak[auth] = max(peak.get(auth, 0), in_flight[auth])
+            await asyncio.sleep(0.01)
+            in_flight[auth] -= 1
+            return self.mocker.MagicMock(status_code=200, text='[]')
+        self.mocker.patch('ironsource_api.utils.httpx.AsyncClient.request', new=_request)
+
+        async def _get_apps(api):
+            if api is account_b:
+                raise Exception('failed')
+            return await asyncio.gather(*[api.monetize_api().get_apps() for _ in range(4)])
+
+        results = await pool.fan_out(_get_apps)
+        self.assertEqual(results[('USER_A', 'TOKEN_A')], {'result': [[], [], [], []], 'error': None})
+        self.assertEqual(results[('USER_B', 'TOKEN_B')], {'result': None, 'error': 'failed'})
+
+        results = await pool.fan_out(lambda api: asyncio.gather(*[api.monetize_api().get_apps() for _ in range(6)]))
+        self.assertEqual(peak, {'Bearer A': 1, 'Bearer B': 3})
+        self.assertEqual(len(clients), 2)
+
+        async def _current_rate_limiter(api):
+            return get_rate_limiter()
+        results = await pool.fan_out(_current_rate_limiter)
+        self.assertIs(results[('USER_A', 'TOKEN_A')]['result'], rate_limiter_a)
+        self.assertIs(results[('USER_B', 'TOKEN_B')]['result'], pool.get_rate_limiter('USER_B', 'TOKEN_B'))
+
+        with self.assertRaises(KeyError):
+            await pool.fan_out(_get_apps, accounts=[('USER_C', 'TOKEN_C')])
+
+    @pytest.mark.asyncio
+    async def test_unit_account_pool_pagination(self):
+        pool = IronSourceAccountPool()
+        pool.add_account('USER_A', 'TOKEN_A', 'SECRET_A')
+        pool.add_account('USER_B', 'TOKEN_B', 'SECRET_B')
+        self.mocker.patch('ironsource_api.base_api.BaseAPI.get_bearer_auth', return_value='TOKEN')
+        self.mocker.patch('ironsource_api.pagination.httpx.Client.request',
+                          return_value=self.mocker.MagicMock(status_code=200, text=json.dumps({'bids': []})))
+        account_reserves = {key: self.mocker.spy(pool.get_rate_limiter(*key), 'reserve') for key in pool.get_accounts()}
+        default_reserve = self.mocker.spy(get_rate_limiter(), 'reserve')
+
+        def _read_bids(api):
+            with api.promote_api().get_bids_for_campaign(1234) as bids:
+                return json.loads(bids.read())
+
+        results = await pool.fan_out(lambda api: run_in_thread(_read_bids, api))
+        self.assertEqual(results, {key: {'result': [], 'error': None} for key in pool.get_accounts()})
+        for reserve in account_reserves.values():
+            reserve.assert_called_once_with('https://api.ironsrc.com/advertisers/v2/multibid')
+        default_reserve.assert_not_called()
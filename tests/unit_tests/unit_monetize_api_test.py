@@ -1,5 +1,9 @@
 # pylint: disable=missing-module-docstring
+import asyncio
 from io import BytesIO
+import json
+import time
+import tracemalloc
 import unittest
 from typing import Dict, List
 from unittest.mock import call
@@ -11,9 +15,11 @@ import pytest
 from ironsource_api.ironsource_api import IronSourceAPI
 
 from ironsource_api.monetize_api import AdUnitStatus, AdUnitStatusMap, AdUnits, Platform, Networks, Breakdowns, Metrics
-from ironsource_api.monetize_api.instance_config import IronSourceInstance, VungleInstance
-from ironsource_api.monetize_api.mediation_group_priority import MediationGroupPriority, MediationGroupTier, TierType
+from ironsource_api.monetize_api.instance_config import IronSourceInstance, VungleInstance, GenericInstance, \
+    get_instance_class, parse_instances
+from ironsource_api.monetize_api.mediation_group_priority import MediationGroup, MediationGroupPriority, MediationGroupTier, TierType
 from ironsource_api.monetize_api.placement_config import Placement, Pacing, Capping
+from ironsource_api.cache import PayloadCache
 from ironsource_api.utils import ResponseInterface
 
 
@@ -202,6 +208,143 @@ class Test_UnitTestsMonetizeAPI(unittest.IsolatedAsyncioTestCase):
             method='post', url="https://platform.ironsrc.com/partners/publisher/instances/v3", **options)
 
 
+    @pytest.mark.asyncio
+    async def test_unit_add_instances_bulk(self):
+        calls = []
+
+        async def _add(method, url, **options):
+            res = ResponseInterface()
+            app_key = options['json']['appKey']
+            calls.append(app_key)
+            if app_key == 'app_fail':
+                res.msg = 'Timeout'
+                res.error_code = 500
+            elif app_key == 'app_retry' and calls.count(app_key) == 1:
+                res.msg = 'Service Unavailable'
+                res.error_code = 503
+            else:
+                res.msg = '{\"TEST\":\"TEST\"}'
+                res.error_code = -1
+            return res
+        self.mocker.patch('ironsource_api.monetize_api.monetize_api.execute_request', side_effect=_add)
+
+        def _instances(count):
+            return [VungleInstance(instance_name='TEST_{}'.format(i), ad_unit=AdUnits.RewardedVideo, app_id='TEST',
+                                   reporting_api_id='TEST', placement_id='TEST_{}'.format(i), status=True) for i in range(count)]
+
+        report = await ironsrc_api.monetize_api().add_instances_bulk(
+            {'app_ok': _instances(3), 'app_retry': _instances(1), 'app_fail': _instances(1)},
+            batch_size=2, concurrency=2, retries=1, retry_delay=0)
+
+        self.assertEqual(report['app_ok']['status'], 'success')
+        self.assertEqual((report['app_ok']['added'], report['app_ok']['batches']), (3, 2))
+        self.assertEqual(report['app_retry']['status'], 'success')
+        self.assertEqual(report['app_retry']['attempts'], 2)
+        self.assertEqual(report['app_fail']['status'], 'failed')
+        self.assertEqual(report['app_fail']['failed'], 1)
+        self.assertEqual(len(report['app_fail']['errors']), 1)
+        self.assertEqual(calls.count('app_fail'), 1)
+
+    @pytest.mark.asyncio
+    async def test_unit_sync_instances(self):
+        current = {
+            'rewardedVideo': {
+                'ironSource': [
+                    {'id': 0, 'name': 'Default', 'status': 'active', 'pricing': []},
+                    {'id': 5, 'name': 'TEST', 'status': 'inactive',
+                     'pricing': [{'eCPM': 10, 'Countries': ['US', 'CA']}, {'eCPM': 5, 'Countries': ['IL']}]}
+                ],
+                'Vungle': [
+                    {'id': 1, 'name': 'same', 'status': 'active', 'PlacementId': 'P1', 'AppID': 'TEST', 'reportingAPIId': 'TEST'},
+                    {'id': 2, 'name': 'changed', 'status': 'active', 'PlacementId': 'P2', 'AppID': 'TEST', 'reportingAPIId': 'TEST'},
+                    {'id': 3, 'name': 'extra', 'status': 'active', 'PlacementId': 'P3', 'AppID': 'TEST', 'reportingAPIId': 'TEST'}
+                ],
+                'unknownNetwork': [{'id': 4, 'name': 'other', 'status': 'active'}]
+            }
+        }
+        requests = []
+
+        async def _request(method, url, **options):
+            requests.append((method, options))
+            res = ResponseInterface()
+            res.msg = json.dumps(current)
+            res.error_code = -1
+            return res
+        self.mocker.patch('ironsource_api.monetize_api.monetize_api.execute_request', side_effect=_request)
+
+        desired = [VungleInstance(instance_name=name, ad_unit=AdUnits.RewardedVideo, app_id='TEST', reporting_api_id='TEST',
+                                  placement_id=placement_id, status=True)
+                   for name, placement_id in (('same', 'P1'), ('changed', 'P2_NEW'), ('new', 'P4'))]
+        desired += [IronSourceInstance(instance_name='Default', ad_unit=AdUnits.RewardedVideo, application_key=self.TEST_APP_KEY),
+                    IronSourceInstance(instance_name='TEST', ad_unit=AdUnits.RewardedVideo, application_key=self.TEST_APP_KEY,
+                                       status=False, pricing={5: ['IL'], 10: ['CA', 'US']})]
+
+        plan = await ironsrc_api.monetize_api().sync_instances(self.TEST_APP_KEY, desired, prune=True, dry_run=True)
+        self.assertEqual(len(requests), 1)
+        self.assertEqual([instance['instanceName'] for instance in plan['add']], ['new'])
+        self.assertEqual([(instance['instanceName'], instance['instanceId']) for instance in plan['update']], [('changed', 2)])
+        self.assertEqual([instance['instanceId'] for instance in plan['delete']], [3])
+        self.assertEqual(plan['unchanged'], 3)
+
+        requests.clear()
+        result = await ironsrc_api.monetize_api().sync_instances(self.TEST_APP_KEY, desired, prune=True)
+        self.assertEqual(result['requests'], 3)
+        self.assertEqual(result['errors'], [])
+        self.assertEqual([method for method, _ in requests], ['get', 'post', 'put', 'delete'])
+        update = requests[2][1]['json']['configurations']['Vungle']['rewardedVideo'][0]
+        self.assertEqual((update['instanceId'], update['PlacementId']), (2, 'P2_NEW'))
+        self.assertEqual(requests[3][1]['params']['instanceId'], 3)
+        self.assertEqual(desired[1].get_instance_id(), -1)
+
+    def test_unit_parse_instances(self):
+        response = {
+            'rewardedVideo': {
+                'ironSource': [{'id': 0, 'name': 'Default', 'status': 'active',
+                                'pricing': [{'eCPM': 7, 'Countries': ['US']}]}],
+                'unknownNetwork': [{'id': 9, 'name': 'other', 'status': 'active'}]
+            },
+            'interstitial': {
+                'Vungle': [{'id': 1, 'name': 'typed', 'status': 'inactive', 'PlacementId': 'P1',
+                            'AppID': 'APP', 'reportingAPIId': 'REPORTING'},
+                           {'id': 2, 'name': 'missing_field', 'status': 'active'}]
+            },
+            'unknownAdUnit': {'ironSource': [{'id': 3, 'name': 'other', 'status': 'active'}]}
+        }
+        ironsource_instance, vungle_instance, generic_instance = parse_instances(response)
+
+        self.assertIsInstance(ironsource_instance, IronSourceInstance)
+        self.assertEqual(ironsource_instance.get_object()['pricing'], [{'eCPM': 7, 'country': ['US']}])
+        self.assertIsInstance(vungle_instance, VungleInstance)
+        self.assertFalse(hasattr(vungle_instance, '__dict__'))
+        self.assertEqual((vungle_instance.get_instance_id(), vungle_instance.get_status(), vungle_instance.get_placement_id()),
+                         (1, False, 'P1'))
+        self.assertEqual(vungle_instance.get_app_data_obj(), {'AppID': 'APP', 'reportingAPIId': 'REPORTING'})
+        self.assertIsInstance(generic_instance, GenericInstance)
+        self.assertTrue(all(isinstance(instance, GenericInstance) for instance in parse_instances(response, typed=False)))
+        self.assertTrue(all(get_instance_class(network) is not GenericInstance for network in Networks))
+
+    def test_unit_instance_from_api(self):
+        ironsource_instance = IronSourceInstance.from_api(
+            Networks.IronSource, AdUnits.RewardedVideo,
+            {'id': 5, 'name': 'TEST', 'status': 'inactive',
+             'pricing': [{'eCPM': 10, 'Countries': ['US']}, {'eCPM': 5, 'Countries': ['IL']}]})
+        self.assertEqual((ironsource_instance.get_instance_id(), ironsource_instance.get_instance_name(),
+                          ironsource_instance.get_status()), (5, 'TEST', False))
+        self.assertEqual(ironsource_instance.get_object()['pricing'],
+                         [{'eCPM': 10, 'country': ['US']}, {'eCPM': 5, 'country': ['IL']}])
+
+        vungle_instance = VungleInstance.from_api(
+            Networks.Vungle, AdUnits.RewardedVideo,
+            {'id': 7, 'name': 'TEST', 'status': 'active', 'PlacementId': 'TEST', 'AppID': 'APP', 'reportingAPIId': 'REPORTING'})
+        self.assertEqual((vungle_instance.get_instance_id(), vungle_instance.get_instance_name(), vungle_instance.get_status(),
+                          vungle_instance.get_placement_id()), (7, 'TEST', True, 'TEST'))
+        self.assertEqual(vungle_instance.get_app_data_obj(), {'AppID': 'APP', 'reportingAPIId': 'REPORTING'})
+
+        generic_instance = GenericInstance.from_api(Networks.Vungle, AdUnits.RewardedVideo,
+                                                    {'id': 8, 'name': 'TEST2', 'status': 'active', 'PlacementId': 'TEST2'})
+        self.assertEqual(generic_instance.get_object(), {'instanceName': 'TEST2', 'status': 'active', 'PlacementId': 'TEST2'})
+        self.assertEqual(generic_instance.get_instance_id(), 8)
+
     @pytest.mark.asyncio
     async def test_unit_update_instances(self):
         mocked_req = self.get_mock_exec_req('{\"TEST\":\"TEST\"}')
@@ -356,6 +499,82 @@ class Test_UnitTestsMonetizeAPI(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             method='post', url='https://platform.ironsrc.com/partners/publisher/mediation/management/v2', **options)
 
+    def test_unit_mediation_group_tier_index(self):
+        tier = MediationGroupTier(TierType.MANUAL)
+        for instance_id in range(300):
+            tier.add_instances(network=Networks.Vungle, instance_id=instance_id)
+        tier.add_instances(network=Networks.IronSource, instance_id=1, position=1)
+        tier.add_instances(network=Networks.IronSource, instance_id=2, position=2, rate=5)
+
+        self.assertEqual(len(tier.get_instance_list()), 302)
+        self.assertTrue(tier.has_instance(Networks.Vungle, 299))
+        self.assertEqual(tier.get_instance_list()[:3], [{'providerName': 'ironSource', 'instanceId': 1},
+                                                        {'providerName': 'ironSource', 'instanceId': 2, 'rate': 5},
+                                                        {'providerName': 'Vungle', 'instanceId': 0}])
+
+        tier.add_instances(network=Networks.Vungle, instance_id=0)
+        self.assertEqual(len(tier.get_instance_list()), 302)
+        tier.add_instances(network=Networks.Vungle, instance_id=299, position=1)
+        self.assertEqual(tier.get_position(Networks.Vungle, 299), 1)
+        self.assertEqual(len(tier.get_instance_list()), 302)
+
+        tier.remove_instance(Networks.IronSource, 1)
+        tier.remove_instance(Networks.IronSource, 1)
+        self.assertFalse(tier.has_instance(Networks.IronSource, 1))
+        self.assertEqual(tier.get_position(Networks.IronSource, 2), 2)
+
+        sort_tier = MediationGroupTier(TierType.SORT_BY_CPM)
+        sort_tier.add_instances(network=Networks.Vungle, instance_id=0)
+        sort_tier.add_instances(network=Networks.Vungle, instance_id=0, position=1)
+        self.assertEqual(len(sort_tier.get_instance_list()), 1)
+
+    def test_unit_mediation_group_priority_object(self):
+        priority = MediationGroupPriority()
+        tier = MediationGroupTier(TierType.MANUAL)
+        tier.add_instances(network=Networks.Vungle, instance_id=1)
+        priority.set_mediation_group_tier(group_tier=tier, position=2)
+
+        first = priority.get_object()
+        self.assertEqual(first, {'tier1': {'instances': [{'providerName': 'Vungle', 'instanceId': 1}], 'tierType': 'manual'}})
+        self.assertIs(priority.get_object(), first)
+        self.assertEqual(priority.get_tiers(), [None, None, tier])
+
+        tier.add_instances(network=Networks.Vungle, instance_id=2)
+        self.assertEqual(len(priority.get_object()['tier1']['instances']), 2)
+
+        sort_tier = MediationGroupTier(TierType.SORT_BY_CPM)
+        sort_tier.add_instances(network=Networks.AdColony, instance_id=3)
+        priority.set_mediation_group_tier(group_tier=sort_tier, position=0)
+        self.assertEqual(list(priority.get_object()), ['tier1', 'tier2'])
+        self.assertEqual(priority.get_object()['tier2']['tierType'], 'manual')
+
+    def test_unit_mediation_group_overlap_benchmark(self):
+        start = time.perf_counter()
+        priority = MediationGroupPriority()
+        for position in range(3):
+            tier = MediationGroupTier(TierType.MANUAL if position == 0 else TierType.SORT_BY_CPM)
+            for instance_id in range(500):
+                tier.add_instances(network=Networks.Vungle, instance_id=position * 500 + instance_id)
+            priority.set_mediation_group_tier(group_tier=tier, position=position)
+        bidders = MediationGroupTier(TierType.BIDDERS)
+        for instance_id in range(500):
+            bidders.add_instances(network=Networks.IronSourceBidding, instance_id=instance_id)
+        priority.set_mediation_group_tier(group_tier=bidders, position=0)
+        self.assertLess(time.perf_counter() - start, 5)
+
+        overlapping = MediationGroupTier(TierType.SORT_BY_CPM)
+        overlapping.add_instances(network=Networks.Vungle, instance_id=10)
+        overlapping.add_instances(network=Networks.Vungle, instance_id=1499)
+        overlapping.add_instances(network=Networks.IronSourceBidding, instance_id=7)
+        overlapping.add_instances(network=Networks.IronSource, instance_id=10)
+        overlaps = priority._validate_tier(overlapping, 1)  # pylint: disable=protected-access
+        self.assertEqual(overlaps, [
+            {'tier': 'tier1', 'position': 0, 'instances': [{'providerName': 'Vungle', 'instanceId': 10}]},
+            {'tier': 'tier3', 'position': 2, 'instances': [{'providerName': 'Vungle', 'instanceId': 1499}]},
+            {'tier': 'bidding', 'position': None, 'instances': [{'providerName': 'ironSourceBidding', 'instanceId': 7}]}])
+        with self.assertRaisesRegex(Exception, 'tier1 with instances'):
+            priority.set_mediation_group_tier(group_tier=overlapping, position=1)
+
     @pytest.mark.asyncio
     async def test_unit_update_mediation_group(self):
 
@@ -426,6 +645,66 @@ class Test_UnitTestsMonetizeAPI(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             method='put', url='https://platform.ironsrc.com/partners/publisher/mediation/management/v2', **options)
 
+    @pytest.mark.asyncio
+    async def test_unit_sync_mediation_groups(self):
+        def _priority(instance_id, capping=None):
+            priority = MediationGroupPriority()
+            tier = MediationGroupTier(TierType.MANUAL)
+            tier.add_instances(network=Networks.IronSource, instance_id=instance_id, rate=10, capping=capping)
+            priority.set_mediation_group_tier(group_tier=tier, position=0)
+            return priority
+
+        current = {
+            'adUnits': {
+                'rewardedVideo': [
+                    {'groupId': 1, 'groupName': 'same', 'groupCountries': ['IL', 'US'], 'groupPosition': 1,
+                     'adSourcePriority': {
+                         'tier1': {'tierType': 'manual',
+                                   'instances': [{'instanceId': 1, 'providerName': 'ironSource', 'rate': 10,
+                                                  'capping': {'value': 2, 'interval': 'session'}}]},
+                         'tier2': {'tierType': 'sortByCpm', 'instances': []}}},
+                    {'groupId': 2, 'groupName': 'changed', 'groupCountries': ['DE'], 'groupPosition': 2,
+                     'adSourcePriority': {
+                         'tier1': {'tierType': 'manual',
+                                   'instances': [{'instanceId': 2, 'providerName': 'ironSource', 'rate': 10}]}}},
+                    {'groupId': 3, 'groupName': 'extra', 'groupCountries': ['FR'], 'groupPosition': 3, 'adSourcePriority': {}}
+                ]
+            }
+        }
+        requests = []
+
+        async def _request(method, url, **options):
+            requests.append((options['params']['appKey'] if 'params' in options else options['json']['appKey'], method, options))
+            res = ResponseInterface()
+            res.msg = json.dumps(current)
+            res.error_code = -1
+            return res
+        self.mocker.patch('ironsource_api.monetize_api.monetize_api.execute_request', side_effect=_request)
+
+        groups = [MediationGroup(AdUnits.RewardedVideo, 'new_1', ['GB'], group_position=1),
+                  MediationGroup(AdUnits.RewardedVideo, 'same', ['US', 'IL'], ad_source_priority=_priority(1, capping=2)),
+                  MediationGroup(AdUnits.RewardedVideo, 'changed', ['DE'], ad_source_priority=_priority(2, capping=3)),
+                  MediationGroup(AdUnits.RewardedVideo, 'new_2', ['CA'], group_position=2)]
+
+        report = await ironsrc_api.monetize_api().sync_mediation_groups({'app1': groups, 'app2': groups[1:2]},
+                                                                         prune=True, concurrency=2)
+
+        self.assertEqual([group['groupName'] for group in report['app1']['create']], ['new_1', 'new_2'])
+        self.assertEqual([group['groupName'] for group in report['app1']['update']], ['changed'])
+        self.assertEqual([group['groupName'] for group in report['app1']['delete']], ['extra'])
+        self.assertEqual(report['app1']['unchanged'], 1)
+        self.assertEqual(report['app1']['errors'], [])
+        self.assertEqual([method for app_key, method, _ in requests if app_key == 'app1'],
+                         ['get', 'put', 'post', 'post', 'delete'])
+        self.assertEqual([options['json']['groupName'] for app_key, method, options in requests if method == 'post'],
+                         ['new_1', 'new_2'])
+        self.assertEqual(len(report['app2']['delete']), 2)
+
+        requests.clear()
+        report = await ironsrc_api.monetize_api().sync_mediation_groups({'app1': groups}, dry_run=True)
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(report['app1']['delete'], [])
+
     @pytest.mark.asyncio
     async def test_unit_delete_mediation_group(self):
 
@@ -542,6 +821,43 @@ class Test_UnitTestsMonetizeAPI(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             method='post', url="https://platform.ironsrc.com/partners/publisher/placements/v1", **options)
 
+    def test_unit_payload_cache(self):
+        instance = VungleInstance(instance_name='TEST', ad_unit=AdUnits.RewardedVideo, app_id='APP',
+                                  reporting_api_id='REPORTING', placement_id='P1', status=True)
+        payload = instance.get_payload()
+        self.assertIs(instance.get_payload(), payload)
+        self.assertIs(instance.get_app_payload(), instance.get_app_payload())
+
+        instance._placement_id = 'P2'  # pylint: disable=protected-access
+        self.assertIsNot(instance.get_payload(), payload)
+        self.assertEqual(instance.get_payload()['PlacementId'], 'P2')
+
+        placement = Placement(ad_unit=AdUnits.Banner, ad_delivery=True, name='TEST', capping=Capping(3, 'h', True))
+        payload = placement.get_payload()
+        self.assertIs(placement.get_payload(), payload)
+        placement._name = 'OTHER'  # pylint: disable=protected-access
+        self.assertEqual(placement.get_payload()['name'], 'OTHER')
+        self.assertRaises(TypeError, PayloadCache)
+
+    def test_unit_model_memory_benchmark(self):
+        def _measure(factory, count=10000):
+            tracemalloc.start()
+            try:
+                start = tracemalloc.get_traced_memory()[0]
+                objects = [factory() for _ in range(count)]
+                used = tracemalloc.get_traced_memory()[0] - start
+            finally:
+                tracemalloc.stop()
+            self.assertFalse(hasattr(objects[0], '__dict__'))
+            return used / count
+
+        instance_bytes = _measure(lambda: VungleInstance(instance_name='TEST', ad_unit=AdUnits.RewardedVideo, app_id='APP',
+                                                         reporting_api_id='REPORTING', placement_id='P1'))
+        placement_bytes = _measure(lambda: Placement(ad_unit=AdUnits.Banner, ad_delivery=True, name='TEST',
+                                                     capping=Capping(3, 'h', True), pacing=Pacing(5, True)))
+        self.assertLess(instance_bytes, 200)
+        self.assertLess(placement_bytes, 300)
+
     @pytest.mark.asyncio
     async def test_unit_get_placements(self):
         mocked_req = self.get_mock_exec_req('{\"TEST\":\"TEST\"}')
@@ -558,6 +874,104 @@ class Test_UnitTestsMonetizeAPI(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             'get', url="https://platform.ironsrc.com/partners/publisher/placements/v1", **options)
 
+    @pytest.mark.asyncio
+    async def test_unit_catalog_cache(self):
+        mocked_req = self.get_mock_exec_req('{\"TEST\":\"TEST\"}')
+        monetize_api = ironsrc_api.monetize_api()
+        monetize_api.enable_catalog_cache(ttl=60)
+        try:
+            first, second = await asyncio.gather(monetize_api.get_placements(self.TEST_APP_KEY),
+                                                 monetize_api.get_placements(self.TEST_APP_KEY))
+            self.assertIs(first, second)
+            self.assertEqual(mocked_req.call_count, 1)
+
+            await monetize_api.delete_placements(self.TEST_APP_KEY, AdUnits.Interstitial, self.placement_id)
+            await monetize_api.get_placements(self.TEST_APP_KEY)
+            self.assertEqual(mocked_req.call_count, 3)
+
+            mocked_req.reset_mock()
+            res = await monetize_api.warm_catalog_cache([self.TEST_APP_KEY, 'other_app'])
+            self.assertEqual(res, {'loaded': 6, 'errors': []})
+            self.assertEqual(mocked_req.call_count, 5)
+            await monetize_api.get_mediation_groups('other_app')
+            self.assertEqual(mocked_req.call_count, 5)
+        finally:
+            monetize_api.disable_catalog_cache()
+
+        with self.assertRaises(ValueError):
+            await monetize_api.warm_catalog_cache([self.TEST_APP_KEY])
+
+    @pytest.mark.asyncio
+    async def test_unit_catalog_cache_errors(self):
+        error_res = ResponseInterface()
+        error_res.msg = 'Internal Server Error'
+        error_res.error_code = 500
+        ok_res = ResponseInterface()
+        ok_res.msg = '{\"TEST\":\"TEST\"}'
+        mocked_req = self.mocker.patch('ironsource_api.monetize_api.monetize_api.execute_request',
+                                       side_effect=[error_res, ok_res])
+        monetize_api = ironsrc_api.monetize_api()
+        monetize_api.enable_catalog_cache(ttl=60)
+        try:
+            with self.assertRaisesRegex(Exception, 'Error getting instances'):
+                await monetize_api.get_instances(self.TEST_APP_KEY)
+            self.assertEqual(await monetize_api.get_instances(self.TEST_APP_KEY), {'TEST': 'TEST'})
+            self.assertEqual(mocked_req.call_count, 2)
+        finally:
+            monetize_api.disable_catalog_cache()
+
+    @pytest.mark.asyncio
+    async def test_unit_sync_placements(self):
+        current = [
+            {'id': 1, 'adUnit': 'interstitial', 'name': 'same', 'adDelivery': 1,
+             'capping': {'enabled': True, 'cappingLimit': 3, 'cappingInterval': 'h'}},
+            {'id': 2, 'adUnit': 'interstitial', 'name': 'changed', 'adDelivery': 1,
+             'pacing': {'enabled': 1, 'pacingMinutes': 5}},
+            {'id': 3, 'adUnit': 'banner', 'name': 'extra', 'adDelivery': 1}
+        ]
+        requests = []
+        in_flight = {'now': 0, 'peak': 0}
+
+        async def _request(method, url, **options):
+            requests.append((options['params']['appKey'] if 'params' in options else options['json']['appKey'], method, options))
+            in_flight['now'] += 1
+            in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+            await asyncio.sleep(0.01)
+            in_flight['now'] -= 1
+            res = ResponseInterface()
+            res.msg = json.dumps(current)
+            res.error_code = -1
+            return res
+        self.mocker.patch('ironsource_api.monetize_api.monetize_api.execute_request', side_effect=_request)
+
+        placements = [Placement(AdUnits.Interstitial, True, 'same', capping=Capping(3, 'h', True)),
+                      Placement(AdUnits.Interstitial, True, 'changed', pacing=Pacing(10, True)),
+                      Placement(AdUnits.Interstitial, True, 'new_1'),
+                      Placement(AdUnits.Banner, False, 'new_2')]
+
+        report = await ironsrc_api.monetize_api().sync_placements({'app1': placements, 'app2': placements[:1]},
+                                                                  prune=True, batch_size=1, concurrency=2)
+        self.assertEqual(in_flight['peak'], 2)
+
+        self.assertEqual([placement['name'] for placement in report['app1']['add']], ['new_1', 'new_2'])
+        self.assertEqual(report['app1']['update'], [{'adUnit': 'interstitial', 'name': 'changed', 'placementId': 2}])
+        self.assertEqual(report['app1']['delete'], [{'adUnit': 'banner', 'name': 'extra', 'placementId': 3}])
+        self.assertEqual(report['app1']['unchanged'], 1)
+        self.assertEqual(report['app1']['requests'], 4)
+        self.assertEqual(report['app1']['errors'], [])
+        self.assertEqual([method for app_key, method, _ in requests if app_key == 'app1'],
+                         ['get', 'post', 'post', 'put', 'delete'])
+        update = [options['json'] for app_key, method, options in requests if method == 'put'][0]
+        self.assertEqual(update['placements'], [{'adUnit': 'interstitial', 'adDelivery': 1, 'id': 2, 'name': 'changed',
+                                                 'pacing': {'enabled': 1, 'pacingMinutes': 10}}])
+        self.assertEqual(len(report['app2']['delete']), 2)
+        self.assertIsNone(placements[1].get_placement_id())
+
+        requests.clear()
+        report = await ironsrc_api.monetize_api().sync_placements({'app1': [Placement(AdUnits.Banner, True)]})
+        self.assertEqual(report['app1']['errors'][0]['action'], 'plan')
+        self.assertEqual(len(requests), 1)
+
     @pytest.mark.asyncio
     async def test_unit_update_placements(self):
         mocked_req = self.get_mock_exec_req('{\"TEST\":\"TEST\"}')
@@ -0,0 +1,69 @@
+# pylint: disable=missing-module-docstring
+import contextvars
+import json
+import os
+import threading
+import time
+import unittest
+
+from pytest_mock import MockerFixture
+
+import pytest
+
+from ironsource_api.pagination import execute_request_with_pagination
+from ironsource_api.utils import AdaptiveConcurrency, concurrency_control
+
+
+# pylint: disable=missing-function-docstring,missing-class-docstring
+class UnitPaginationTest(unittest.TestCase):
+
+    url = 'https://api.ironsrc.com/advertisers/v2/multibid'
+
+    @pytest.fixture(autouse=True)
+    def before_after_tests(self, mocker: MockerFixture):
+        self.mocker = mocker
+        yield
+
+    def _paginate(self, options: dict) -> str:
+        pipe_r, pipe_w = os.pipe()
+        with open(pipe_r, 'r', encoding='utf-8') as stream:
+            try:
+                execute_request_with_pagination(self.url, pipe_w, 'bids', 'Error getting bids', options)
+            finally:
+                data = stream.read()
+        return data
+
+    def test_unit_pagination_concurrency_control(self):
+        state = {'in_flight': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def _request(method, url, **kwargs):
+            with lock:
+                state['in_flight'] += 1
+                state['peak'] = max(state['peak'], state['in_flight'])
+            time.sleep(0.02)
+            with lock:
+                state['in_flight'] -= 1
+            if kwargs['params'].get('page') == 'throttled':
+                return self.mocker.MagicMock(status_code=429, text='Too Many Requests', headers={})
+            if kwargs['params'].get('page') == '2':
+                return self.mocker.MagicMock(status_code=200, text=json.dumps({'bids': [2]}), headers={})
+            return self.mocker.MagicMock(status_code=200, text=json.dumps({'bids': [1], 'paging': {'next': self.url + '?page=2'}}),
+                                         headers={})
+        self.mocker.patch('ironsource_api.pagination.httpx.Client.request', side_effect=_request)
+
+        controller = AdaptiveConcurrency(initial_limit=2, max_limit=2)
+        results = []
+        with concurrency_control(controller):
+            threads = [threading.Thread(target=contextvars.copy_context().run,
+                                        args=[lambda: results.append(self._paginate({'params': {}}))]) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(results, ['[1]\n[2]\n'] * 6)
+            self.assertLessEqual(state['peak'], 2)
+
+            with self.assertRaisesRegex(Exception, 'Error Code: 429'):
+                self._paginate({'params': {'page': 'throttled'}})
+        self.assertEqual(controller.get_limit(self.url), 1)
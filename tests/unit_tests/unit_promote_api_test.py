@@ -1,7 +1,12 @@
 # pylint: disable=missing-module-docstring
+import asyncio
 from io import BytesIO, FileIO
 from itertools import count
 import json
+import os
+import struct
+import tempfile
+import threading
 import unittest
 import time
 
@@ -11,10 +16,13 @@ import pytest
 
 from ironsource_api.ironsource_api import IronSourceAPI
 from ironsource_api.promote_api.promote_api import AdUnits, Breakdowns, Metrics, Platform, CreativeType
-from ironsource_api.promote_api.audience_list import AudienceListMeta, AudienceListType, AudienceListData
+from ironsource_api.promote_api.asset_index import AssetHashIndex
+from ironsource_api.promote_api.asset_validation import validate_asset, validate_asset_directory
+from ironsource_api.promote_api.audience_list import AudienceListMeta, AudienceListType, AudienceListData, DeviceIdStore, \
+    iter_device_batches
 from ironsource_api.promote_api.campaign_bids import CampaignBidsList, CampaignBid
 from ironsource_api.promote_api.creatives import Creative, CreativeAsset, UsageType
-from ironsource_api.utils import ResponseInterface
+from ironsource_api.utils import RateLimiter, ResponseInterface, get_rate_limiter, rate_limit
 
 
 ironsrc_api = IronSourceAPI()
@@ -193,6 +201,93 @@ class UnitPromoteAPITest(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             'post', 'https://platform-api.supersonic.com/audience/api', False, **options)
 
+    @pytest.mark.asyncio
+    async def test_unit_upload_audience_devices(self):
+        self.mocker.patch(
+            'ironsource_api.promote_api.promote_api.BaseAPI.get_basic_auth', return_value='TOKEN')
+        mocked_req = self.get_mock_exec_req('OK')
+        progress = []
+        devices = ['bb602f59-0cf6-4d25-8ba5-19eb6e1c68f0', '3075ac27-1718-44f2-a0a7-072bc565777e',
+                   'bb602f59-0cf6-4d25-8ba5-19eb6e1c68f0', 'a1b2c3d4-0000-1111-2222-333344445555']
+
+        summary = await ironsrc_api.promote_api().upload_audience_devices(
+            iter(devices), add_audience_ids=[self.audience_list_trgt_id], batch_size=2,
+            progress_callback=lambda uploaded, failed: progress.append((uploaded, failed)))
+
+        self.assertEqual(mocked_req.call_count, 2)
+        self.assertEqual(summary, [{'batch': 0, 'deviceIds': 2, 'msg': 'OK'},
+                                   {'batch': 1, 'deviceIds': 1, 'msg': 'OK'}])
+        self.assertEqual(progress[-1], (3, 0))
+        sent_devices = [call.kwargs['json']['deviceIds'] for call in mocked_req.call_args_list]
+        self.assertEqual(sorted(sum(sent_devices, [])), sorted(set(devices)))
+        self.assertEqual(mocked_req.call_args_list[0].kwargs['json']['addAudience'], [self.audience_list_trgt_id])
+
+    def test_unit_iter_device_batches_size_limit(self):
+        devices = ['{:036d}'.format(i) for i in range(10)]
+        batches = list(iter_device_batches(devices, batch_size=100, max_batch_bytes=100))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 2, 2, 2])
+        self.assertEqual(sum(batches, []), devices)
+
+    def test_unit_device_id_store(self):
+        store = DeviceIdStore(capacity=10)
+        self.assertTrue(store.add('BB602F59-0CF6-4D25-8BA5-19EB6E1C68F0'))
+        self.assertFalse(store.add('bb602f59-0cf6-4d25-8ba5-19eb6e1c68f0'))
+        self.assertTrue(store.add('not-a-uuid'))
+        self.assertFalse(store.add('not-a-uuid'))
+        self.assertEqual(store.update('{:08x}-0000-4000-8000-000000000000'.format(i) for i in range(2000)), 2000)
+
+        self.assertEqual(len(store), 2002)
+        self.assertIn('bb602f59-0cf6-4d25-8ba5-19eb6e1c68f0', store)
+        self.assertIn('000007CF-0000-4000-8000-000000000000', store)
+        self.assertNotIn('000007d0-0000-4000-8000-000000000000', store)
+        self.assertEqual(list(store)[:2], ['bb602f59-0cf6-4d25-8ba5-19eb6e1c68f0', '00000000-0000-4000-8000-000000000000'])
+
+        audience_list_data = AudienceListData(compact=True)
+        audience_list_data.add_devices(['3075AC27-1718-44F2-A0A7-072BC565777E', '3075ac27-1718-44f2-a0a7-072bc565777e'])
+        audience_list_data.add_devices('3075ac27-1718-44f2-a0a7-072bc565777e')
+        self.assertEqual(audience_list_data.to_object(), {'deviceIds': ['3075ac27-1718-44f2-a0a7-072bc565777e']})
+
+    @pytest.mark.asyncio
+    async def test_unit_sync_audience_list_delta(self):
+        self.mocker.patch(
+            'ironsource_api.promote_api.promote_api.BaseAPI.get_basic_auth', return_value='TOKEN')
+        mocked_req = self.get_mock_exec_req('OK')
+        devices = ['bb602f59-0cf6-4d25-8ba5-19eb6e1c68f0', '3075ac27-1718-44f2-a0a7-072bc565777e',
+                   'a1b2c3d4-0000-1111-2222-333344445555']
+
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            summary = await ironsrc_api.promote_api().sync_audience_list(self.audience_list_trgt_id, devices, snapshot_dir)
+            self.assertEqual((summary['devices'], summary['added'], summary['removed']), (3, 3, 0))
+            self.assertEqual(mocked_req.call_count, 1)
+
+            mocked_req.reset_mock()
+            summary = await ironsrc_api.promote_api().sync_audience_list(
+                self.audience_list_trgt_id, devices[1:] + ['FFFFFFFF-0000-1111-2222-333344445555'], snapshot_dir)
+            self.assertEqual((summary['added'], summary['removed']), (1, 1))
+            sent = [(call.kwargs['json'].get('addAudience'), call.kwargs['json'].get('removeAudience'), call.kwargs['json']['deviceIds'])
+                    for call in mocked_req.call_args_list]
+            self.assertEqual(sent, [([self.audience_list_trgt_id], None, ['ffffffff-0000-1111-2222-333344445555']),
+                                    (None, [self.audience_list_trgt_id], ['bb602f59-0cf6-4d25-8ba5-19eb6e1c68f0'])])
+
+            failed_res = ResponseInterface()
+            failed_res.msg = 'Server Error'
+            failed_res.error_code = 500
+            mocked_req.return_value = failed_res
+            summary = await ironsrc_api.promote_api().sync_audience_list(self.audience_list_trgt_id, devices, snapshot_dir)
+            self.assertIn('error', summary['batches'][0])
+
+            mocked_req.return_value = ResponseInterface()
+            summary = await ironsrc_api.promote_api().sync_audience_list(self.audience_list_trgt_id, devices, snapshot_dir)
+            self.assertEqual((summary['added'], summary['removed']), (1, 1))
+
+            staging_threads = []
+
+            def _devices():
+                staging_threads.append(threading.current_thread())
+                yield from devices
+            await ironsrc_api.promote_api().sync_audience_list(self.audience_list_trgt_id, _devices(), snapshot_dir)
+            self.assertIsNot(staging_threads[0], threading.main_thread())
+
     @pytest.mark.asyncio
     async def test_unit_get_audience_lists(self):
         self.mocker.patch(
@@ -208,6 +303,44 @@ class UnitPromoteAPITest(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             method='get', url='https://platform-api.supersonic.com/audience/api/show', **options)
 
+    @pytest.mark.asyncio
+    async def test_unit_audience_catalog(self):
+        self.mocker.patch(
+            'ironsource_api.promote_api.promote_api.BaseAPI.get_basic_auth', return_value='TOKEN')
+        audience_lists = {'count': 2, 'audiences': [
+            {'id': 1, 'type': 'targeting', 'name': 'batz', 'bundleId': 'com.adsd.sdf', 'platform': 'android'},
+            {'id': 2, 'type': 'suppression_static', 'name': 'supp', 'bundleId': 'com.adsd.sdf', 'platform': 'ios'}]}
+        mocked_req = self.get_mock_exec_req(json.dumps(audience_lists))
+
+        promote_api = ironsrc_api.promote_api()
+        promote_api.invalidate_audience_catalog()
+        catalog = await promote_api.get_audience_catalog()
+        self.assertIs(await promote_api.get_audience_catalog(), catalog)
+        self.assertEqual(mocked_req.call_count, 1)
+
+        self.assertEqual(catalog.get_by_id(2)['name'], 'supp')
+        self.assertEqual(catalog.get_id('batz'), '1')
+        self.assertEqual(len(catalog.get_by_bundle_id('com.adsd.sdf')), 2)
+        self.assertEqual(catalog.get_by_bundle_id('com.adsd.sdf', Platform.iOS)[0]['id'], 2)
+        self.assertEqual(catalog.get_by_platform(Platform.Android)[0]['id'], 1)
+        self.assertIsNone(catalog.get_by_id(3))
+
+        await promote_api.delete_audience_list('1')
+        await promote_api.get_audience_catalog()
+        self.assertEqual(mocked_req.call_count, 3)
+        promote_api.invalidate_audience_catalog()
+        await promote_api.get_audience_catalog(ttl=0)
+        await promote_api.get_audience_catalog()
+        self.assertEqual(mocked_req.call_count, 5)
+        promote_api.invalidate_audience_catalog()
+
+        mocked_req.return_value.msg = json.dumps({'count': 0, 'audiences': []})
+        empty_catalog = await promote_api.get_audience_catalog()
+        self.assertEqual(len(empty_catalog), 0)
+        self.assertIs(await promote_api.get_audience_catalog(), empty_catalog)
+        self.assertEqual(mocked_req.call_count, 6)
+        promote_api.invalidate_audience_catalog()
+
     @pytest.mark.asyncio
     async def test_unit_delete_all_audience_lists(self):
         self.mocker.patch(
@@ -272,6 +405,21 @@ class UnitPromoteAPITest(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             'https://api.ironsrc.com/advertisers/v2/multibid', 123, "bids", "Error getting bids for campaign", options, False)
 
+    def test_unit_get_bids_for_campaign_rate_limit(self):
+        self.mocker.patch('ironsource_api.pagination.httpx.Client.request',
+                          return_value=self.mocker.MagicMock(status_code=200, text=json.dumps({'bids': self.bids_array_test})))
+        limiter = RateLimiter()
+        limiter.set_limit('https://api.ironsrc.com/advertisers/v2/multibid', rate=1000)
+        scoped_reserve = self.mocker.spy(limiter, 'reserve')
+        default_reserve = self.mocker.spy(get_rate_limiter(), 'reserve')
+
+        with rate_limit(limiter):
+            bids = ironsrc_api.promote_api().get_bids_for_campaign(campaign_id=self.__class__.test_campaign_id)
+        with bids:
+            self.assertEqual(json.loads(bids.read()), self.bids_array_test)
+        scoped_reserve.assert_called_once_with('https://api.ironsrc.com/advertisers/v2/multibid')
+        default_reserve.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_unit_delete_campaign_bids(self):
         mocked_req = self.get_mock_exec_req('{\"TEST\":\"TEST\"}')
@@ -412,6 +560,27 @@ class UnitPromoteAPITest(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             method='get', url='https://api.ironsrc.com/advertisers/v2/titles', **options)
 
+    @pytest.mark.asyncio
+    async def test_unit_iter_titles(self):
+        titles = [{'id': i, 'name': 'title_{}'.format(i)} for i in range(7)]
+
+        async def _get_page(method, url, **options):
+            page_number = options['params'].get('pageNumber', 1)
+            bulk_size = options['params']['resultsBulkSize']
+            res = ResponseInterface()
+            res.msg = json.dumps({'titles': titles[(page_number - 1) * bulk_size:page_number * bulk_size],
+                                  'totalResultsCount': len(titles), 'requestId': self.request_id})
+            return res
+        mocked_req = self.mocker.patch(
+            'ironsource_api.promote_api.promote_api.execute_request', side_effect=_get_page)
+
+        res = [title async for title in ironsrc_api.promote_api().iter_titles(os_sys=Platform.iOS, results_bulk_size=2, concurrency=2)]
+
+        self.assertEqual(res, titles)
+        self.assertEqual(mocked_req.call_count, 4)
+        self.assertEqual(mocked_req.call_args_list[-1].kwargs['params'],
+                         {'os': 'ios', 'requestId': self.request_id, 'resultsBulkSize': 2, 'pageNumber': 4})
+
     @pytest.mark.asyncio
     async def test_unit_get_assets(self):
         mocked_req = self.get_mock_exec_req('{\"TEST\":\"TEST\"}')
@@ -449,6 +618,129 @@ class UnitPromoteAPITest(unittest.IsolatedAsyncioTestCase):
         mocked_req.assert_called_once_with(
             'post', 'https://api.ironsrc.com/advertisers/v2/assets', False, **options)
 
+    @pytest.mark.asyncio
+    async def test_unit_create_assets_bulk(self):
+        sent_files = []
+
+        async def _upload(method, url, is_gzip, **options):
+            res = ResponseInterface()
+            sent_files.append(options['files']['file'])
+            if options['data']['type'] == 'video':
+                res.msg = 'Bad Request'
+                res.error_code = 400
+            else:
+                res.msg = json.dumps({'id': len(sent_files)})
+            return res
+        self.mocker.patch(
+            'ironsource_api.promote_api.promote_api.execute_request', side_effect=_upload)
+
+        with tempfile.TemporaryDirectory() as assets_dir:
+            uploads = []
+            for i, asset_type in enumerate(['image', 'image', 'video']):
+                file_path = os.path.join(assets_dir, 'asset_{}'.format(i))
+                with open(file_path, 'wb') as asset_file:
+                    asset_file.write(b'0' * 100)
+                uploads.append((1234, asset_type, file_path))
+            summary = await ironsrc_api.promote_api().create_assets_bulk(uploads, concurrency=2)
+
+        self.assertEqual((summary['files'], summary['failed'], summary['bytes']), (3, 1, 200))
+        self.assertEqual([result['filePath'] for result in summary['results']], [upload[2] for upload in uploads])
+        self.assertIn('error', summary['results'][2])
+        self.assertTrue(all(sent_file.closed for sent_file in sent_files))
+
+    @pytest.mark.asyncio
+    async def test_unit_create_assets_with_hash_index(self):
+        async def _request(method, url, is_gzip=False, **options):
+            res = ResponseInterface()
+            if method == 'post':
+                res.msg = json.dumps({'id': 555})
+            else:
+                res.msg = json.dumps({'assets': [{'id': 555}], 'totalResultsCount': 1, 'requestId': self.request_id})
+            return res
+        mocked_req = self.mocker.patch(
+            'ironsource_api.promote_api.promote_api.execute_request', side_effect=_request)
+
+        with tempfile.TemporaryDirectory() as assets_dir:
+            index_path = os.path.join(assets_dir, 'index.json')
+            file_path = os.path.join(assets_dir, 'asset.png')
+            with open(file_path, 'wb') as asset_file:
+                asset_file.write(b'image bytes')
+
+            asset_index = AssetHashIndex(index_path)
+            first = await ironsrc_api.promote_api().create_assets(1234, 'image', file_path, asset_index=asset_index)
+            second = await ironsrc_api.promote_api().create_assets(1234, 'image', file_path, asset_index=AssetHashIndex(index_path))
+            other_title = await ironsrc_api.promote_api().create_assets(4321, 'image', file_path, asset_index=asset_index)
+
+        self.assertEqual(first, {'id': 555})
+        self.assertEqual(second, {'id': 555, 'titleId': 1234, 'duplicate': True})
+        self.assertEqual(other_title, {'id': 555})
+        self.assertEqual([call.args[0] if call.args else call.kwargs['method'] for call in mocked_req.call_args_list],
+                         ['post', 'get', 'post'])
+
+    @pytest.mark.asyncio
+    async def test_unit_create_assets_bulk_with_hash_index(self):
+        async def _request(method, url, is_gzip=False, **options):
+            res = ResponseInterface()
+            await asyncio.sleep(0.01)
+            if method == 'post':
+                res.msg = json.dumps({'id': 556})
+            else:
+                res.msg = json.dumps({'assets': [{'id': 555}], 'totalResultsCount': 1, 'requestId': self.request_id})
+            return res
+        mocked_req = self.mocker.patch(
+            'ironsource_api.promote_api.promote_api.execute_request', side_effect=_request)
+
+        with tempfile.TemporaryDirectory() as assets_dir:
+            index_path = os.path.join(assets_dir, 'index.json')
+            file_path = os.path.join(assets_dir, 'asset.png')
+            with open(file_path, 'wb') as asset_file:
+                asset_file.write(b'image bytes')
+            asset_index = AssetHashIndex(index_path)
+            asset_index.add(1234, AssetHashIndex.hash_file(file_path), 555)
+            mocked_save = self.mocker.spy(asset_index, 'save')
+
+            summary = await ironsrc_api.promote_api().create_assets_bulk(
+                [(1234, 'image', file_path) for _ in range(4)] + [(4321, 'image', file_path)], concurrency=5,
+                asset_index=asset_index)
+
+            self.assertEqual(AssetHashIndex(index_path).get(4321, AssetHashIndex.hash_file(file_path)), 556)
+
+        self.assertEqual(summary['failed'], 0)
+        self.assertTrue(all(result['asset']['duplicate'] for result in summary['results'][:4]))
+        self.assertEqual(mocked_save.call_count, 1)
+        self.assertCountEqual([call.args[0] if call.args else call.kwargs['method'] for call in mocked_req.call_args_list],
+                              ['get', 'post'])
+
+    def test_unit_validate_assets(self):
+        def _box(box_type, payload):
+            return struct.pack('>I4s', len(payload) + 8, box_type) + payload
+
+        mvhd = _box(b'mvhd', b'\x00' * 12 + struct.pack('>II', 1000, 75000) + b'\x00' * 80)
+        tkhd = _box(b'tkhd', b'\x00' * 76 + struct.pack('>II', 1920 << 16, 1080 << 16))
+        mp4 = _box(b'ftyp', b'isom') + _box(b'mdat', b'\x00' * 1000) + _box(b'moov', mvhd + _box(b'trak', tkhd))
+        png = b'\x89PNG\r\n\x1a\n' + _box(b'IHDR', struct.pack('>II', 4000, 500))
+        gif = b'GIF89a' + struct.pack('<HH', 640, 480) + b'\x00' * 20
+        empty_mvhd = _box(b'ftyp', b'isom') + _box(b'moov', _box(b'mvhd', b'') + _box(b'trak', tkhd))
+
+        with tempfile.TemporaryDirectory() as assets_dir:
+            for file_name, content in [('video.mp4', mp4), ('image.png', png), ('image.gif', gif), ('empty.mp4', empty_mvhd)]:
+                with open(os.path.join(assets_dir, file_name), 'wb') as asset_file:
+                    asset_file.write(content)
+
+            results = {os.path.basename(result['filePath']): result for result in validate_asset_directory(assets_dir, max_workers=2)}
+            image_as_video = validate_asset(os.path.join(assets_dir, 'image.gif'), 'video')
+            jpeg = validate_asset('./tests/test_asset_python.jpeg', 'image')
+            playable = validate_asset(os.path.join(assets_dir, 'image.gif'), 'html')
+
+        self.assertEqual((results['video.mp4']['width'], results['video.mp4']['height'], results['video.mp4']['durationMs']), (1920, 1080, 75000))
+        self.assertEqual(results['video.mp4']['errors'], ['duration 75000ms is longer than 60000ms'])
+        self.assertEqual(len(results['image.png']['errors']), 2)
+        self.assertEqual(results['image.gif']['errors'], [])
+        self.assertEqual(len(image_as_video['errors']), 1)
+        self.assertEqual((jpeg['format'], jpeg['width'], jpeg['height'], jpeg['errors']), ('jpeg', 320, 512, []))
+        self.assertEqual((results['empty.mp4']['width'], results['empty.mp4']['durationMs']), (1920, None))
+        self.assertEqual(playable['errors'], [])
+
     @pytest.mark.asyncio
     async def test_unit_get_creatives(self):
         mocked_req = self.get_mock_exec_req('{\"TEST\":\"TEST\"}')
@@ -522,6 +814,68 @@ class UnitPromoteAPITest(unittest.IsolatedAsyncioTestCase):
             new_creative.add_asset(CreativeAsset(123, UsageType.RIGHT))
             creative_res = await ironsrc_api.promote_api().create_creatives(title_id=530297, creatives=[new_creative])
 
+    @pytest.mark.asyncio
+    async def test_unit_create_creatives_bulk(self):
+        async def _create(method, url, **options):
+            res = ResponseInterface()
+            res.msg = json.dumps({'success': True, 'ids': list(range(len(options['json']['creatives'])))})
+            return res
+        mocked_req = self.mocker.patch(
+            'ironsource_api.promote_api.promote_api.execute_request', side_effect=_create)
+
+        creatives = []
+        for i in range(4):
+            creative = Creative(name='creative_{}'.format(i), creative_type=CreativeType.VIDEO_INTERACTIVE_ENDCARD, language='EN')
+            creative.add_asset(CreativeAsset(i + 1, UsageType.VIDEO))
+            if i != 2:
+                creative.add_asset(CreativeAsset(i + 1, UsageType.INTERACTIVE_ENDCARD))
+            creatives.append(creative)
+
+        summary = await ironsrc_api.promote_api().create_creatives_bulk({1234: creatives}, chunk_size=2)
+
+        self.assertEqual(mocked_req.call_count, 2)
+        self.assertEqual(summary['created'], 3)
+        self.assertEqual(len(summary['ids'][1234]), 3)
+        self.assertEqual([failure['name'] for failure in summary['failures']], ['creative_2'])
+        self.assertEqual(CreativeType.VIDEO_INTERACTIVE_ENDCARD.value['usage_types']['mandatory'],
+                         [UsageType.VIDEO, UsageType.INTERACTIVE_ENDCARD])
+
+    def test_unit_creative_validation(self):
+        for creative_type in CreativeType:
+            mandatory = creative_type.value['usage_types']['mandatory']
+            allowed = set(mandatory) | set(creative_type.value['usage_types'].get('optional', []))
+            creative = Creative(name='creative', creative_type=creative_type, language='EN')
+            for usage_type in UsageType:
+                self.assertEqual(creative.check_asset_compatible(CreativeAsset(1, usage_type)), usage_type in allowed)
+
+            assets = [CreativeAsset(asset_id, usage_type) for asset_id, usage_type in enumerate(mandatory)]
+            self.assertTrue(Creative(name='creative', creative_type=creative_type, language='EN', assets=assets).is_validate())
+            for missing in range(len(assets)):
+                partial = Creative(name='creative', creative_type=creative_type, language='EN',
+                                   assets=assets[:missing] + assets[missing + 1:])
+                with self.assertRaisesRegex(ValueError, 'missing mandatory'):
+                    partial.is_validate()
+
+        creative = Creative(name='creative', creative_type=CreativeType.VIDEO_CAROUSEL, language='EN')
+        self.assertFalse(creative.check_asset_compatible(CreativeAsset(1, UsageType.INTERACTIVE_ENDCARD)))
+        creative.add_asset(CreativeAsset(1, UsageType.VIDEO))
+        with self.assertRaisesRegex(ValueError, 'missing mandatory'):
+            creative.is_validate()
+        creative.add_asset(CreativeAsset(2, UsageType.VIDEO))
+        with self.assertRaisesRegex(ValueError, 'already been used'):
+            creative.is_validate()
+
+    def test_unit_model_slots(self):
+        creative = Creative(name='creative', creative_type=CreativeType.VIDEO_CAROUSEL, language='EN', assets=None)
+        self.assertEqual(creative.get_assets(), [])
+        self.assertEqual(creative.get_object()['assets'], [])
+        creative.add_asset(CreativeAsset(1, UsageType.VIDEO))
+        self.assertEqual(len(creative.get_assets()), 1)
+
+        for model in (creative, CreativeAsset(1, UsageType.VIDEO), CampaignBid(1.5, 'US'), CampaignBidsList(1234),
+                      AudienceListData()):
+            self.assertFalse(hasattr(model, '__dict__'))
+
     def test_unit_reporting_api(self):
         mocked_req = self.get_mock_exec_req_with_pagination(msg='Test')
         r_steam = BytesIO()
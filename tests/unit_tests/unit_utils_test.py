@@ -0,0 +1,129 @@
+# pylint: disable=missing-module-docstring
+import asyncio
+import time
+import unittest
+
+from pytest_mock import MockerFixture
+
+import httpx
+import pytest
+
+from ironsource_api.utils import AdaptiveConcurrency, RateLimiter, RetryPolicy, concurrency_control, execute_request, \
+    get_concurrency_controller, get_rate_limiter, rate_limit, retry_control, shared_client
+
+
+# pylint: disable=missing-function-docstring,missing-class-docstring
+@pytest.mark.asyncio
+class UnitUtilsTest(unittest.IsolatedAsyncioTestCase):
+
+    @pytest.fixture(autouse=True)
+    def before_after_tests(self, mocker: MockerFixture):
+        self.mocker = mocker
+        yield
+
+    @pytest.mark.asyncio
+    async def test_unit_shared_client(self):
+        mocked_res = self.mocker.MagicMock(status_code=200, text='OK')
+        mocked_client_req = self.mocker.patch(
+            'ironsource_api.utils.httpx.AsyncClient.request', return_value=mocked_res)
+
+        async with shared_client() as client:
+            await execute_request('get', 'https://api.ironsrc.com/advertisers/v2/titles')
+            await execute_request('get', 'https://api.ironsrc.com/advertisers/v2/assets')
+            self.assertFalse(client.is_closed)
+        self.assertTrue(client.is_closed)
+        self.assertEqual(mocked_client_req.call_count, 2)
+
+    @pytest.mark.asyncio
+    async def test_unit_rate_limiter(self):
+        mocked_res = self.mocker.MagicMock(status_code=200, text='OK')
+        mocked_client_req = self.mocker.patch(
+            'ironsource_api.utils.httpx.AsyncClient.request', return_value=mocked_res)
+
+        limiter = RateLimiter()
+        limiter.set_limit('https://api.ironsrc.com/advertisers/v2/multibid', rate=20, burst=2)
+        limiter.set_limit('api.ironsrc.com', rate=1000)
+        self.assertEqual(limiter.get_bucket('https://api.ironsrc.com/advertisers/v2/multibid/1234').get_rate(), 20)
+        self.assertEqual(limiter.get_bucket('https://api.ironsrc.com/advertisers/v2/titles').get_rate(), 1000)
+        self.assertIsNone(limiter.get_bucket('https://platform.ironsrc.com/partners/publisher/auth'))
+
+        start = time.perf_counter()
+        with rate_limit(limiter):
+            async with shared_client():
+                await asyncio.gather(*[execute_request('get', 'https://api.ironsrc.com/advertisers/v2/multibid')
+                                       for _ in range(6)])
+        self.assertGreaterEqual(time.perf_counter() - start, 0.19)
+        self.assertEqual(mocked_client_req.call_count, 6)
+        self.assertIsNot(get_rate_limiter(), limiter)
+
+    @pytest.mark.asyncio
+    async def test_unit_adaptive_concurrency(self):
+        url = 'https://api.ironsrc.com/advertisers/v2/multibid'
+        state = {'in_flight': 0, 'peak': 0, 'throttled': 1}
+
+        async def _request(client, method, url, **kwargs):
+            state['in_flight'] += 1
+            state['peak'] = max(state['peak'], state['in_flight'])
+            await asyncio.sleep(0.01)
+            state['in_flight'] -= 1
+            if state['throttled']:
+                state['throttled'] -= 1
+                return self.mocker.MagicMock(status_code=429, text='Too Many Requests', headers={'retry-after': '0.1'})
+            return self.mocker.MagicMock(status_code=200, text='OK', headers={})
+        self.mocker.patch('ironsource_api.utils.httpx.AsyncClient.request', new=_request)
+
+        controller = AdaptiveConcurrency(initial_limit=4, max_limit=8)
+        with concurrency_control(controller), retry_control(RetryPolicy(max_retries=0)):
+            async with shared_client():
+                first = await execute_request('get', url)
+                self.assertEqual(first.error_code, 429)
+                self.assertEqual(controller.get_limit(url), 2)
+
+                start = time.perf_counter()
+                responses = await asyncio.gather(*[execute_request('get', url) for _ in range(20)])
+                self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+
+        self.assertTrue(all(response.error_code == -1 for response in responses))
+        self.assertLessEqual(state['peak'], 8)
+        self.assertGreater(controller.get_limit(url), 2)
+        self.assertEqual(controller.get_in_flight(url), 0)
+        self.assertIsNot(get_concurrency_controller(), controller)
+        self.assertTrue(get_concurrency_controller().is_enabled())
+        self.assertEqual(get_concurrency_controller().get_limit('https://example.com'), 100)
+
+    @pytest.mark.asyncio
+    async def test_unit_retry_policy(self):
+        failures = {}
+
+        async def _request(client, method, url, **kwargs):
+            if failures.get(url):
+                failures[url] -= 1
+                if url.endswith('titles'):
+                    raise httpx.ConnectError('connection reset')
+                return self.mocker.MagicMock(status_code=503, text='Service Unavailable', headers={})
+            return self.mocker.MagicMock(status_code=200, text='OK', headers={})
+        mocked_client_req = self.mocker.patch('ironsource_api.utils.httpx.AsyncClient.request', side_effect=_request,
+                                              autospec=True)
+
+        titles_url = 'https://api.ironsrc.com/advertisers/v2/titles'
+        assets_url = 'https://api.ironsrc.com/advertisers/v2/assets'
+        policy = RetryPolicy(max_retries=3, backoff=0.001)
+        policy.set_endpoint(assets_url, methods=['post'], max_retries=1)
+        with retry_control(policy):
+            async with shared_client():
+                failures[titles_url] = 2
+                self.assertEqual((await execute_request('get', titles_url)).error_code, -1)
+                failures[titles_url] = 1
+                self.assertEqual((await execute_request('post', titles_url)).error_code, 500)
+                failures[assets_url] = 2
+                self.assertEqual((await execute_request(method='post', url=assets_url)).error_code, 503)
+
+        self.assertEqual(mocked_client_req.call_count, 6)
+        self.assertEqual(policy.get_metrics(), {'requests': 3, 'retries': 3, 'recovered': 1, 'exhausted': 1,
+                                                'budgetExhausted': 0, 'reasons': {'ConnectError': 2, '503': 1}})
+
+        policy = RetryPolicy(backoff=0.001, budget_ratio=0, budget_max=1)
+        with retry_control(policy):
+            failures[titles_url] = 3
+            self.assertEqual((await execute_request('get', titles_url)).error_code, 500)
+        self.assertEqual((policy.get_metrics()['retries'], policy.get_metrics()['budgetExhausted']), (1, 1))